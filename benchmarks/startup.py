@@ -0,0 +1,70 @@
+"""
+Benchmark of collector startup per configured plugin type.
+
+Every plugin type is loaded in a fresh interpreter the same way the collector loads
+adapters, import time, peak RSS and heavy dependencies which were imported are reported.
+
+Usage:
+    python -m benchmarks.startup [plugin types...]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+HEAVY_MODULES = ["boto3", "pyarrow", "deltalake", "lark", "requests"]
+
+LOAD_ADAPTER = """
+import json, resource, sys, time
+
+started = time.perf_counter()
+from odd_collector_sdk.load_adapter import load_package
+
+load_package(f"odd_collector_aws.adapters.{sys.argv[1]}")
+elapsed = time.perf_counter() - started
+
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": [name for name in sys.argv[2:] if name in sys.modules],
+}))
+"""
+
+
+def measure(plugin_type: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", LOAD_ADAPTER, plugin_type, *HEAVY_MODULES],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        error = result.stderr.strip().splitlines()[-1]
+        return {"error": error}
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    from odd_collector_aws.domain.plugin import PLUGIN_FACTORY
+
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("plugin_types", nargs="*", default=list(PLUGIN_FACTORY))
+    args = arguments.parse_args()
+
+    for plugin_type in args.plugin_types:
+        result = measure(plugin_type)
+        if "error" in result:
+            print(f"{plugin_type:>24}: failed, {result['error']}")
+            continue
+
+        print(
+            f"{plugin_type:>24}: {result['seconds']:.2f}s,"
+            f" rss={result['rss_mb']:.0f}MB, imports={','.join(result['modules'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
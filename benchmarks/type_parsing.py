@@ -0,0 +1,91 @@
+"""
+Benchmark of column type parsing on a synthetic catalog,
+parse with fast paths and memoization is compared with the grammar only.
+
+Catalog has --columns columns with --distinct distinct type strings, which is close
+to real Glue and Athena catalogs, where a few hundred types repeat across all tables.
+
+Usage:
+    python -m benchmarks.type_parsing --columns 1000000
+"""
+import argparse
+import random
+import time
+from typing import Callable
+
+from odd_collector_aws.adapters.glue.mappers.columns import parser
+
+PRIMITIVES = ["string", "int", "bigint", "double", "boolean", "date", "timestamp"]
+
+
+def random_type(rnd: random.Random, depth: int = 0) -> str:
+    kind = rnd.choice(["primitive"] * 4 + ["varchar", "decimal"] + ["nested"] * 2)
+    if kind == "varchar":
+        return f"varchar({rnd.randint(1, 1024)})"
+    if kind == "decimal":
+        return f"decimal({rnd.randint(1, 38)},{rnd.randint(0, 10)})"
+    if kind == "nested" and depth < 2:
+        fields = ",".join(
+            f"f{i}:{random_type(rnd, depth + 1)}" for i in range(rnd.randint(1, 5))
+        )
+        return rnd.choice(
+            [
+                f"struct<{fields}>",
+                f"array<{random_type(rnd, depth + 1)}>",
+                f"map<string,{random_type(rnd, depth + 1)}>",
+            ]
+        )
+
+    return rnd.choice(PRIMITIVES)
+
+
+def catalog(columns: int, distinct: int, seed: int) -> list[str]:
+    rnd = random.Random(seed)
+    types = list({random_type(rnd) for _ in range(distinct * 10)})[:distinct]
+    # Few types are much more frequent than others, as in real catalogs,
+    # where the most frequent are primitives
+    types.sort(key=len)
+    weights = [1 / (rank + 1) for rank in range(len(types))]
+    return rnd.choices(types, weights=weights, k=columns)
+
+
+def measure(name: str, parse: Callable, column_types: list[str]) -> float:
+    started = time.perf_counter()
+    for column_type in column_types:
+        parse(column_type)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:>10}: {elapsed:.2f}s, "
+        f"{elapsed / len(column_types) * 1e6:.1f}us per column"
+    )
+    return elapsed
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--columns", type=int, default=1_000_000)
+    arguments.add_argument("--distinct", type=int, default=300)
+    arguments.add_argument("--seed", type=int, default=0)
+    args = arguments.parse_args()
+
+    column_types = catalog(args.columns, args.distinct, args.seed)
+    print(
+        f"{len(column_types)} columns, {len(set(column_types))} distinct type strings"
+    )
+
+    grammar = measure("grammar", parser.parse_with_grammar, column_types)
+    parser.cache_clear()
+    parsed = measure("parse", parser.parse, column_types)
+
+    primitives = sum(
+        column_type.lower() in parser.primitives for column_type in column_types
+    )
+    print(
+        f"speedup: {grammar / parsed:.0f}x, primitives={primitives},"
+        f" {parser.cache_info()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,17 @@
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from time import perf_counter
 from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
-import boto3
-from more_itertools import flatten
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import DataEntity, DataEntityList
 from oddrn_generator import AthenaGenerator
 
+from odd_collector_aws.aws.aws_client import Aws
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
 from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import AthenaPlugin
+from odd_collector_aws.logger import logger
 
 from .mappers.tables import map_athena_table
 
@@ -17,36 +20,67 @@ SDK_DATASET_COL_STATS_MAX_RESULTS = 100
 SDK_DATA_TRANSFORMERS_MAX_RESULTS = 100
 
 
+@dataclass
+class CatalogProgress:
+    started_at: float = field(default_factory=perf_counter)
+    databases: int = 0
+    finished: int = 0
+    tables: int = 0
+
+    def report(self, catalog_name: str) -> None:
+        logger.info(
+            f"Athena catalog {catalog_name}: databases={self.databases}, "
+            f"tables={self.tables}, {perf_counter() - self.started_at:.3f}s"
+        )
+
+
 class Adapter(AbstractAdapter):
     def __init__(self, config: AthenaPlugin) -> None:
-        account_id = boto3.client(
-            "sts",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            aws_session_token=config.aws_session_token,
-        ).get_caller_identity()["Account"]
-        self._athena_client = boto3.client(
-            "athena",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            aws_session_token=config.aws_session_token,
-            region_name=config.aws_region,
-        )
+        aws = Aws(config)
+        account_id = aws.get_account_id()
+        self._athena_client = aws.get_client("athena")
         self._oddrn_generator = AthenaGenerator(
             cloud_settings={"region": config.aws_region, "account": account_id}
         )
+        self._max_concurrency = config.max_concurrency
 
     def get_data_source_oddrn(self) -> str:
         return self._oddrn_generator.get_data_source_oddrn()
 
     def get_data_entities(self) -> Iterable[DataEntity]:
-        return flatten(
-            [
-                self.__get_table_metadata(cn, dn)
-                for cn in self.__get_catalog_names()
-                for dn in self.__get_database_names(cn)
-            ]
-        )
+        """
+        Fetch tables metadata of all (catalog, database) pairs concurrently.
+        Tables are mapped in the caller thread as soon as their database is fetched,
+        because oddrn generator is not thread-safe.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="athena"
+        ) as executor:
+            catalogs: Dict[str, CatalogProgress] = {}
+            futures = {}
+
+            for cn in self.__get_catalog_names():
+                catalogs[cn] = CatalogProgress()
+                for dn in self.__get_database_names(cn):
+                    future = executor.submit(self.__get_raw_tables, cn, dn)
+                    futures[future] = cn, dn
+                    catalogs[cn].databases += 1
+
+                if not catalogs[cn].databases:
+                    catalogs[cn].report(cn)
+
+            for future in as_completed(futures):
+                cn, dn = futures[future]
+                raw_tables = future.result()
+
+                for rt in raw_tables:
+                    yield self.__process_table_raw_data(rt, cn, dn)
+
+                progress = catalogs[cn]
+                progress.tables += len(raw_tables)
+                progress.finished += 1
+                if progress.finished == progress.databases:
+                    progress.report(cn)
 
     def get_data_entity_list(self) -> DataEntityList:
         return DataEntityList(
@@ -82,44 +116,28 @@ class Adapter(AbstractAdapter):
             )
         )
 
-    def __get_table_metadata(
+    def __get_raw_tables(
         self, catalog_name: str, database_name: str
-    ) -> Iterable[DataEntity]:
-        raw_tables: Iterable[Dict[str, Any]] = self.__fetch_paginator(
-            PaginatorConfig(
-                op_name="list_table_metadata",
-                parameters={"CatalogName": catalog_name, "DatabaseName": database_name},
-                page_size=SDK_DATASET_MAX_RESULTS,
-                list_fetch_key="TableMetadataList",
+    ) -> List[Dict[str, Any]]:
+        return list(
+            self.__fetch_paginator(
+                PaginatorConfig(
+                    op_name="list_table_metadata",
+                    parameters={
+                        "CatalogName": catalog_name,
+                        "DatabaseName": database_name,
+                    },
+                    page_size=SDK_DATASET_MAX_RESULTS,
+                    list_fetch_key="TableMetadataList",
+                ),
+                prefetch=True,
             )
         )
 
-        return [
-            self.__process_table_raw_data(rt, catalog_name, database_name)
-            for rt in raw_tables
-        ]
-
-    def __fetch_paginator(self, conf: PaginatorConfig) -> Iterable:
-        paginator = self._athena_client.get_paginator(operation_name=conf.op_name)
-
-        token = None
-        while True:
-            sdk_response = paginator.paginate(
-                **conf.parameters,
-                PaginationConfig={"MaxItems": conf.page_size, "StartingToken": token},
-            )
-
-            for entity in sdk_response.build_full_result()[conf.list_fetch_key]:
-                yield (
-                    entity
-                    if conf.mapper is None
-                    else conf.mapper(entity, conf.mapper_args)
-                )
-
-            if sdk_response.resume_token is None:
-                break
-
-            token = sdk_response.resume_token
+    def __fetch_paginator(
+        self, conf: PaginatorConfig, prefetch: bool = False
+    ) -> Iterable:
+        return fetch_paginator(conf, self._athena_client, prefetch)
 
     def __process_table_raw_data(
         self, raw_table_data: Dict[str, Any], catalog_name: str, database_name: str
@@ -1,18 +1,38 @@
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping
 
-from lark import Lark, LarkError
+from lark import LarkError
 from odd_models.models import DataSetField, DataSetFieldType
 from oddrn_generator import AthenaGenerator
 
+from odd_collector_aws.utils.type_parser import TypeParser
+
 from .athena_field_type_transformer import AthenaFieldTypeTransformer
 
-athena_field_type_transformer = AthenaFieldTypeTransformer()
-parser = Lark.open(
+# SIMPLE_TYPE of the grammar, parameterized varchar and decimal are not supported by it
+PRIMITIVE_TYPES = [
+    "int",
+    "string",
+    "bigint",
+    "binary",
+    "boolean",
+    "char",
+    "date",
+    "decimal",
+    "double",
+    "float",
+    "interval",
+    "smallint",
+    "timestamp",
+    "tinyint",
+    "varchar",
+]
+
+parser = TypeParser(
     "grammar/athena_field_type_grammar.lark",
-    rel_to=__file__,
-    parser="lalr",
-    start="type",
+    __file__,
+    AthenaFieldTypeTransformer(),
+    primitives=PRIMITIVE_TYPES,
 )
 
 TYPES_ATHENA_TO_ODD = {
@@ -38,14 +58,13 @@ TYPES_ATHENA_TO_ODD = {
 }
 
 
-def __parse(field_type: str) -> Dict[str, Any]:
-    column_tree = parser.parse(field_type)
-    return athena_field_type_transformer.transform(column_tree)
+def __parse(field_type: str) -> Mapping[str, Any]:
+    return parser.parse(field_type)
 
 
 def __map_column(
     oddrn_generator: AthenaGenerator,
-    type_parsed: Dict[str, Any],
+    type_parsed: Mapping[str, Any],
     parent_oddrn: str = None,
     parent_oddrn_path: str = "tables",
     column_name: str = None,
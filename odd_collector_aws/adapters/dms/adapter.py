@@ -1,5 +1,6 @@
 from typing import Any, Dict, Iterable
 
+import requests
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import DataEntityList
 from oddrn_generator.generators import DmsGenerator
@@ -9,7 +10,8 @@ from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import DmsPlugin
 
 from .client import DMSClient
-from .mappers.tasks import map_dms_task
+from .mappers.tables import DegResolver
+from .mappers.tasks import get_platform_host_url, map_dms_task
 
 MAX_RESULTS_FOR_PAGE = 100
 
@@ -23,6 +25,7 @@ class Adapter(AbstractAdapter):
                 "account": self._dms_client.account_id,
             }
         )
+        self._http_session = requests.Session()
 
     def get_data_source_oddrn(self) -> str:
         return self._oddrn_generator.get_data_source_oddrn()
@@ -30,12 +33,16 @@ class Adapter(AbstractAdapter):
     def get_data_entity_list(self) -> DataEntityList:
         endpoints_nodes = self._get_endpoints_nodes_arn_dict()
         tasks = list(self._get_tasks())
+        # platform lineage is resolved once per run and shared by all tasks,
+        # platform host url is read only when the first task needs it
+        deg_resolver = DegResolver(get_platform_host_url, self._http_session)
         tasks_entities = [
             map_dms_task(
                 task,
                 {
                     "oddrn_generator": self._oddrn_generator,
                     "endpoints_arn_dict": endpoints_nodes,
+                    "deg_resolver": deg_resolver,
                 },
             )
             for task in tasks
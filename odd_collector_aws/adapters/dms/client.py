@@ -6,5 +6,6 @@ class DMSClient:
     def __init__(self, config: AwsPlugin):
         self._config = config
 
-        self.dms = AwsClient(config).get_client("dms")
-        self.account_id = AwsClient(config).get_account_id()
+        aws_client = AwsClient(config)
+        self.dms = aws_client.get_client("dms")
+        self.account_id = aws_client.get_account_id()
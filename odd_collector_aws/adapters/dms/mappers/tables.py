@@ -1,6 +1,6 @@
 import copy
 from json import loads
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
 import requests
 
@@ -26,42 +26,82 @@ class SelectionMappingRule:
         self.include: bool = False if rules_node["rule-action"] == "exclude" else True
 
 
-class EntitiesExtractor:
+class DegResolver:
+    """
+    Resolves platform data entity groups to their tables for one collector run.
+    Responses are memoized, so tasks and selection rules referring to the same
+    database or schema share one request.
+
+    Platform host url may be given as a callable, it is then resolved on the first request,
+    so runs without DMS tasks do not read it at all.
+    """
+
     def __init__(
         self,
-        rules_nodes: List[Dict[str, Any]],
-        platform_host_url: str,
-        endpoint_engine: EndpointEngine,
+        platform_host_url: Union[str, Callable[[], str]],
+        session: Optional[requests.Session] = None,
     ):
-        self.endpoint_engine = endpoint_engine
-        self.platform_host_url = platform_host_url
-        self.rules_nodes = rules_nodes
+        self._platform_host_url = platform_host_url
+        self.session = session or requests.Session()
+        self._children: Dict[str, List[Dict[str, str]]] = {}
+        self._tables: Dict[str, List[str]] = {}
+        self._tables_sets: Dict[str, Set[str]] = {}
+
+    @property
+    def platform_host_url(self) -> str:
+        if callable(self._platform_host_url):
+            self._platform_host_url = self._platform_host_url()
+        return self._platform_host_url
+
+    def get_children(self, deg_oddrn: str) -> List[Dict[str, str]]:
+        if deg_oddrn not in self._children:
+            resp = self.session.get(
+                url=f"{self.platform_host_url}/ingestion/entities/degs/children",
+                params={"oddrn": deg_oddrn},
+            )
+            self._children[deg_oddrn] = loads(resp.content)["items"]
 
-    def __request_items_by_deg(self, oddrn: str) -> List[Dict[str, str]]:
-        url = f"{self.platform_host_url}/ingestion/entities/degs/children"
-        params = {"oddrn": oddrn}
-        resp = requests.get(url=url, params=params)
-        return loads(resp.content)["items"]
+        return self._children[deg_oddrn]
 
-    def __extract_tables_oddrns_from_items(
-        self, deg_oddrn: str, accum_list: List[str]
-    ) -> List[str]:
-        items_from_request = self.__request_items_by_deg(deg_oddrn)
-        if len(items_from_request) == 0:
-            return []
-        for item in items_from_request:
-            entity_type = item["type"]
-            if entity_type == "TABLE":
-                accum_list.append(item["oddrn"])
-            else:
-                if entity_type == "DATABASE_SERVICE":
-                    self.__extract_tables_oddrns_from_items(
-                        deg_oddrn=item["oddrn"], accum_list=accum_list
-                    )
+    def get_tables(self, deg_oddrn: str) -> List[str]:
+        """
+        Get tables oddrns of the group, nested DATABASE_SERVICE groups are resolved recursively.
+        """
+        if deg_oddrn not in self._tables:
+            tables = []
+            for item in self.get_children(deg_oddrn):
+                entity_type = item["type"]
+                if entity_type == "TABLE":
+                    tables.append(item["oddrn"])
+                elif entity_type == "DATABASE_SERVICE":
+                    tables.extend(self.get_tables(item["oddrn"]))
                 else:
                     raise NotImplementedError("not implemented entity type yet")
 
-        return accum_list
+            self._tables[deg_oddrn] = tables
+
+        return self._tables[deg_oddrn]
+
+    def get_tables_set(self, deg_oddrn: str) -> Set[str]:
+        """
+        Same as get_tables, but as a set for membership checks.
+        """
+        if deg_oddrn not in self._tables_sets:
+            self._tables_sets[deg_oddrn] = set(self.get_tables(deg_oddrn))
+
+        return self._tables_sets[deg_oddrn]
+
+
+class EntitiesExtractor:
+    def __init__(
+        self,
+        rules_nodes: List[Dict[str, Any]],
+        deg_resolver: DegResolver,
+        endpoint_engine: EndpointEngine,
+    ):
+        self.endpoint_engine = endpoint_engine
+        self.deg_resolver = deg_resolver
+        self.rules_nodes = rules_nodes
 
     def __create_selection_rules_list(self) -> List[SelectionMappingRule]:
         return [
@@ -81,11 +121,7 @@ class EntitiesExtractor:
             gen, schema_name, table_name
         )
         schema_oddrn = self.endpoint_engine.get_oddrn_for_schema_name(gen, schema_name)
-        accum = []
-        tables_oddrns_in_platform = self.__extract_tables_oddrns_from_items(
-            schema_oddrn, accum
-        )
-        if table_oddrn in tables_oddrns_in_platform:
+        if table_oddrn in self.deg_resolver.get_tables_set(schema_oddrn):
             return [table_oddrn]
         return []
 
@@ -97,20 +133,16 @@ class EntitiesExtractor:
         gen = copy.copy(self.endpoint_engine.get_generator())
         gen.set_oddrn_paths(**{self.endpoint_engine.schemas_path_name: schema_name})
         schema_oddrn = self.endpoint_engine.get_oddrn_for_schema_name(gen, schema_name)
-        accum = []
-        tables_oddrns_in_platform = self.__extract_tables_oddrns_from_items(
-            schema_oddrn, accum
-        )
-        return tables_oddrns_in_platform
+        return self.deg_resolver.get_tables(schema_oddrn)
 
     def __all_schemas_one_table_strategy(self, table_name: str) -> List[str]:
         """
         returns one table with equal name from all schemas
         """
-        tables_in_platform = self.__all_strategy()
         gen = copy.copy(self.endpoint_engine.get_generator())
         db_deg_oddrn = gen.get_data_source_oddrn()
-        items = self.__request_items_by_deg(db_deg_oddrn)
+        tables_in_platform = self.deg_resolver.get_tables_set(db_deg_oddrn)
+        items = self.deg_resolver.get_children(db_deg_oddrn)
         schemas_oddrns_in_platform: List[str] = []
         for item in items:
             if item["type"] == "DATABASE_SERVICE":
@@ -135,11 +167,7 @@ class EntitiesExtractor:
         """
         gen = copy.copy(self.endpoint_engine.get_generator())
         db_deg_oddrn = gen.get_data_source_oddrn()
-        accum = []
-        tables_oddrns_in_platform = self.__extract_tables_oddrns_from_items(
-            db_deg_oddrn, accum
-        )
-        return tables_oddrns_in_platform
+        return self.deg_resolver.get_tables(db_deg_oddrn)
 
     def __get_oddrns_based_on_rule(self, rule: SelectionMappingRule) -> List[str]:
         if rule.schema_name is not None:
@@ -158,18 +186,20 @@ class EntitiesExtractor:
     def get_oddrns_list(self):
         all_tables_oddrns = self.__all_strategy()
         include_oddrns: List[str] = []
-        exclude_oddrns: List[str] = []
+        exclude_oddrns: Set[str] = set()
         rules_list = self.__create_selection_rules_list()
         for rule in rules_list:
             oddrns = self.__get_oddrns_based_on_rule(rule)
             if rule.include:
                 include_oddrns += oddrns
             else:
-                exclude_oddrns += oddrns
+                exclude_oddrns.update(oddrns)
 
         oddrns_after_exclusion = [
             oddrn for oddrn in all_tables_oddrns if oddrn not in exclude_oddrns
         ]
         if len(include_oddrns) == 0:
             return oddrns_after_exclusion
-        return [oddrn for oddrn in include_oddrns if oddrn in oddrns_after_exclusion]
+
+        allowed_oddrns = set(oddrns_after_exclusion)
+        return [oddrn for oddrn in include_oddrns if oddrn in allowed_oddrns]
@@ -20,7 +20,7 @@ from odd_collector_aws.adapters.dms import (
 
 from .endpoints import EndpointEngine, engines_factory
 from .metadata import create_metadata_extension_list
-from .tables import EntitiesExtractor
+from .tables import DegResolver, EntitiesExtractor
 
 DMS_TASK_STATUSES: Dict[str, JobRunStatus] = {
     "creating": JobRunStatus.UNKNOWN,
@@ -44,7 +44,9 @@ class IOTransformer:
         raw_job_data: Dict[str, Any],
         factory: Dict[str, Type[EndpointEngine]],
         rules_nodes: List[Dict[str, Any]],
+        deg_resolver: DegResolver,
     ):
+        self.deg_resolver = deg_resolver
         self.rules_nodes = rules_nodes
         self.factory = factory
         self.raw_job_data = raw_job_data
@@ -61,20 +63,6 @@ class IOTransformer:
     def __get_endpoint_node(self, arn_node_name: str) -> Dict[str, Any]:
         return self.endpoints_arn_dict.get(self.raw_job_data.get(arn_node_name))
 
-    @staticmethod
-    def __get_platform_host_url() -> str:
-        config_file_name = "collector_config.yaml"
-        path = (
-            os.path.dirname(os.path.abspath(config_file_name)) + "/" + config_file_name
-        )
-        with open(path) as f:
-            config_dict: Dict[str, Any] = safe_load(f)
-        return config_dict["platform_host_url"]
-
-    @property
-    def __platform_host_url(self):
-        return self.__get_platform_host_url()
-
     def __find_endpoint_engine_cls(
         self, endpoint_node: Dict[str, Any]
     ) -> Union[Type[EndpointEngine], None]:
@@ -87,7 +75,7 @@ class IOTransformer:
             return []
         endpoint_engine = endpoint_engine_cls(endpoint_node)
         extractor = EntitiesExtractor(
-            self.rules_nodes, self.__get_platform_host_url(), endpoint_engine
+            self.rules_nodes, self.deg_resolver, endpoint_engine
         )
         return extractor.get_oddrns_list()
 
@@ -98,15 +86,24 @@ class IOTransformer:
         return self.__extract_oddrns(self.__output_endpoint_node)
 
 
+def get_platform_host_url() -> str:
+    config_file_name = "collector_config.yaml"
+    path = os.path.dirname(os.path.abspath(config_file_name)) + "/" + config_file_name
+    with open(path) as f:
+        config_dict: Dict[str, Any] = safe_load(f)
+    return config_dict["platform_host_url"]
+
+
 def map_dms_task(
     raw_job_data: Dict[str, Any], mapper_args: Dict[str, Any]
 ) -> DataEntity:
     oddrn_generator: DmsGenerator = mapper_args["oddrn_generator"]
     endpoints_arn_dict: Dict[str, Dict[str, Any]] = mapper_args["endpoints_arn_dict"]
+    deg_resolver: DegResolver = mapper_args["deg_resolver"]
     rules_nodes: List[Dict[str, Any]] = loads(raw_job_data["TableMappings"])["rules"]
 
     io_transformer = IOTransformer(
-        endpoints_arn_dict, raw_job_data, engines_factory, rules_nodes
+        endpoints_arn_dict, raw_job_data, engines_factory, rules_nodes, deg_resolver
     )
 
     trans = DataTransformer(
@@ -1,7 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Iterable, List, Union
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
 
-import boto3
+from botocore.exceptions import ClientError
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import (
     DataEntity,
@@ -13,32 +14,45 @@ from odd_models.models import (
 )
 from oddrn_generator import DynamodbGenerator
 
+from odd_collector_aws.aws.aws_client import Aws
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
 from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import DynamoDbPlugin
+from odd_collector_aws.logger import logger
 
 from .metadata import MetadataExtractor
+from .sampler import ItemSampler
 
 SDK_DATASET_MAX_RESULTS = 100
 
 
 class Adapter(AbstractAdapter):
-    __dynamo_types = {"N": "TYPE_NUMBER", "S": "TYPE_STRING", "B": "TYPE_BINARY"}
+    __dynamo_types = {
+        "N": "TYPE_NUMBER",
+        "S": "TYPE_STRING",
+        "B": "TYPE_BINARY",
+        "BOOL": "TYPE_BOOLEAN",
+        "M": "TYPE_MAP",
+        "L": "TYPE_LIST",
+        "SS": "TYPE_LIST",
+        "NS": "TYPE_LIST",
+        "BS": "TYPE_LIST",
+    }
 
     def __init__(self, config: DynamoDbPlugin) -> None:
-        self.__dynamo_client = boto3.client(
-            "dynamodb",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.aws_region,
-        )
-        self.__aws_account_id = boto3.client(
-            "sts",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.aws_region,
-        ).get_caller_identity()["Account"]
+        aws = Aws(config)
+        self.__dynamo_client = aws.get_client("dynamodb")
+        self.__aws_account_id = aws.get_account_id()
         self.__exclude_tables = config.exclude_tables
         self.__metadata_extractor = MetadataExtractor()
+        self.__max_concurrency = config.max_concurrency
+        self.__sampler = (
+            ItemSampler(
+                self.__dynamo_client, config.sample_items, config.sample_segments
+            )
+            if config.sample_items
+            else None
+        )
         self.__oddrn_generator = DynamodbGenerator(
             cloud_settings={
                 "region": config.aws_region,
@@ -50,10 +64,24 @@ class Adapter(AbstractAdapter):
         return self.__oddrn_generator.get_data_source_oddrn()
 
     def get_data_entities(self) -> List[DataEntity]:
-        return [
-            self.__map_table_from_response(table) for table in self.__fetch_tables()
+        """
+        Describe (and sample) tables concurrently.
+        Tables are mapped in the caller thread, because oddrn generator is not thread-safe.
+        """
+        table_names = [
+            tn for tn in self.__fetch_tables_names() if tn not in self.__exclude_tables
         ]
 
+        with ThreadPoolExecutor(
+            max_workers=self.__max_concurrency, thread_name_prefix="dynamodb"
+        ) as executor:
+            return [
+                self.__map_table_from_response(table, sampled_attributes)
+                for table, sampled_attributes in executor.map(
+                    self.__describe_table, table_names
+                )
+            ]
+
     def get_data_entity_list(self) -> DataEntityList:
         return DataEntityList(
             data_source_oddrn=self.get_data_source_oddrn(),
@@ -72,12 +100,18 @@ class Adapter(AbstractAdapter):
     def get_transformers_runs(self) -> List[DataEntity]:
         return []
 
-    def __fetch_tables(self) -> Iterable[Dict[str, Any]]:
-        return [
-            self.__dynamo_client.describe_table(TableName=tn)
-            for tn in self.__fetch_tables_names()
-            if tn not in self.__exclude_tables
-        ]
+    def __describe_table(
+        self, table_name: str
+    ) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+        table = self.__dynamo_client.describe_table(TableName=table_name)
+        if self.__sampler is None:
+            return table, {}
+
+        try:
+            return table, self.__sampler.sample(table_name)
+        except ClientError as e:
+            logger.warning(f"Could not sample items of {table_name}. {e}")
+            return table, {}
 
     def __fetch_tables_names(self) -> Iterable:
         return self.__fetch_paginator(
@@ -88,35 +122,14 @@ class Adapter(AbstractAdapter):
             )
         )
 
-    def __fetch_paginator(self, conf: PaginatorConfig) -> Iterable:
-        paginator = self.__dynamo_client.get_paginator(operation_name=conf.op_name)
+    def __fetch_paginator(
+        self, conf: PaginatorConfig, prefetch: bool = False
+    ) -> Iterable:
+        return fetch_paginator(conf, self.__dynamo_client, prefetch)
 
-        token = None
-        while True:
-            sdk_response = paginator.paginate(
-                **conf.parameters,
-                PaginationConfig={"MaxItems": conf.page_size, "StartingToken": token},
-            )
-
-            sdk_response_payload = (
-                sdk_response.build_full_result()[conf.payload_key]
-                if conf.payload_key
-                else sdk_response.build_full_result()
-            )
-
-            for entity in sdk_response_payload:
-                yield (
-                    entity
-                    if conf.mapper is None
-                    else conf.mapper(entity, conf.mapper_args)
-                )
-
-            if sdk_response.resume_token is None:
-                break
-
-            token = sdk_response.resume_token
-
-    def __map_table_from_response(self, raw_response: Dict[str, Any]) -> DataEntity:
+    def __map_table_from_response(
+        self, raw_response: Dict[str, Any], sampled_attributes: Dict[str, List[str]]
+    ) -> DataEntity:
         raw_table_data = raw_response["Table"]
 
         return DataEntity(
@@ -138,6 +151,9 @@ class Adapter(AbstractAdapter):
                 rows_number=raw_table_data["ItemCount"],
                 field_list=self.__map_fields_from_attributes(
                     raw_table_data["AttributeDefinitions"]
+                )
+                + self.__map_fields_from_sample(
+                    raw_table_data["AttributeDefinitions"], sampled_attributes
                 ),
             ),
         )
@@ -147,6 +163,34 @@ class Adapter(AbstractAdapter):
     ) -> Iterable[DataSetField]:
         return [self.__map_field_from_attribute(a) for a in raw_attributes]
 
+    def __map_fields_from_sample(
+        self,
+        raw_attributes: List[Dict[str, Any]],
+        sampled_attributes: Dict[str, List[str]],
+    ) -> List[DataSetField]:
+        """
+        Map attributes found in sampled items, except key attributes which are defined by the table.
+        Attribute with values of different types is mapped with unknown type.
+        """
+        keys = {a["AttributeName"] for a in raw_attributes}
+        return [
+            DataSetField(
+                oddrn=self.__oddrn_generator.get_oddrn_by_path("columns", name),
+                name=name,
+                type=DataSetFieldType(
+                    type=(
+                        self.__dynamo_types.get(types[0], "TYPE_UNKNOWN")
+                        if len(types) == 1
+                        else "TYPE_UNKNOWN"
+                    ),
+                    logical_type="|".join(types),
+                    is_nullable=True,
+                ),
+            )
+            for name, types in sampled_attributes.items()
+            if name not in keys
+        ]
+
     def __map_field_from_attribute(self, raw_attribute: Dict[str, Any]) -> DataSetField:
         return DataSetField(
             oddrn=self.__oddrn_generator.get_oddrn_by_path(
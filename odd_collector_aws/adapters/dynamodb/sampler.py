@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from botocore.client import BaseClient
+
+from odd_collector_aws.aws.throttling import AdaptiveThrottle
+
+
+class ItemSampler:
+    """
+    Infers attributes of a table from a bounded sample of its items.
+
+    Table is scanned with `segments` parallel segments, every segment reads a single page.
+    Items are split exactly between segments, first items % segments segments read one item
+    more, so sampling of a table never reads more than `items` items.
+    """
+
+    def __init__(self, client: BaseClient, items: int, segments: int):
+        self.client = client
+        self.items = items
+        self.segments = segments
+        self.throttle = AdaptiveThrottle("DynamoDB scan")
+
+    def sample(self, table_name: str) -> dict[str, list[str]]:
+        """
+        Get attributes of sampled items.
+        @param table_name: table to scan
+        @return: attribute name to its type descriptors (i.e. "S", "N", "M") in order of appearance
+        """
+        scan = partial(self._scan_segment, table_name)
+        limits = self._segment_limits()
+
+        if len(limits) == 1:
+            pages = [scan(*limits[0])]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=len(limits), thread_name_prefix="dynamodb-scan"
+            ) as executor:
+                pages = list(executor.map(lambda args: scan(*args), limits))
+
+        attributes: dict[str, list[str]] = {}
+        for items in pages:
+            for item in items:
+                for name, value in item.items():
+                    types = attributes.setdefault(name, [])
+                    types.extend(
+                        descriptor for descriptor in value if descriptor not in types
+                    )
+
+        return attributes
+
+    def _segment_limits(self) -> list[tuple[int, int]]:
+        """
+        Get (segment, limit) pairs to scan, segments left without items are skipped
+        as scan Limit must be at least 1.
+        """
+        per_segment, extra = divmod(self.items, self.segments)
+        limits = [
+            (segment, per_segment + (1 if segment < extra else 0))
+            for segment in range(self.segments)
+        ]
+        return [(segment, limit) for segment, limit in limits if limit > 0]
+
+    def _scan_segment(
+        self, table_name: str, segment: int, limit: int
+    ) -> list[dict[str, Any]]:
+        response = self.throttle.call(
+            self.client.scan,
+            TableName=table_name,
+            Limit=limit,
+            Segment=segment,
+            TotalSegments=self.segments,
+        )
+        return response.get("Items", [])
@@ -1,14 +1,21 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from itertools import chain
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterable, List, Optional, Set
 
-import boto3
 from more_itertools import chunked, flatten
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import DataEntity, DataEntityList
 from oddrn_generator import GlueGenerator
 
+from odd_collector_aws.aws.aws_client import Aws
+from odd_collector_aws.aws.throttling import AdaptiveThrottle
+from odd_collector_aws.cache.sqlite_cache import create_cache
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
 from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import GluePlugin
+from odd_collector_aws.logger import logger
 
 from .mappers.columns import map_column_stats
 from .mappers.jobs import map_glue_job, map_glue_job_run
@@ -17,46 +24,114 @@ from .mappers.tables import map_glue_table
 SDK_DATASET_MAX_RESULTS = 1000
 SDK_DATASET_COL_STATS_MAX_RESULTS = 100
 SDK_DATA_TRANSFORMERS_MAX_RESULTS = 100
+UNFINISHED_JOB_RUN_STATES = {"STARTING", "RUNNING", "STOPPING", "WAITING"}
+
+
+def _table_key(raw_table_data: Dict[str, Any]) -> str:
+    return f"{raw_table_data['DatabaseName']}.{raw_table_data['Name']}"
+
+
+def _to_json(value: datetime) -> str:
+    return value.isoformat()
+
+
+def job_run_cursor(raw_job_runs: List[Dict[str, Any]]) -> datetime:
+    """
+    Cursor is the start of the oldest unfinished run, so it is fetched again
+    until it finishes, otherwise the start of the newest run.
+    Runs started at the cursor are fetched again, mapping them twice is harmless.
+    """
+    unfinished = [
+        r["StartedOn"]
+        for r in raw_job_runs
+        if r["JobRunState"] in UNFINISHED_JOB_RUN_STATES
+    ]
+    return min(unfinished) if unfinished else max(r["StartedOn"] for r in raw_job_runs)
 
 
 class Adapter(AbstractAdapter):
     def __init__(self, config: GluePlugin) -> None:
-        self._glue_client = boto3.client(
-            "glue",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            aws_session_token=config.aws_session_token,
-            region_name=config.aws_region,
-        )
-        account_id = boto3.client(
-            "sts",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            aws_session_token=config.aws_session_token,
-        ).get_caller_identity()["Account"]
+        aws = Aws(config)
+        self._glue_client = aws.get_client("glue")
+        account_id = aws.get_account_id()
 
         self._oddrn_generator = GlueGenerator(
             cloud_settings={"region": config.aws_region, "account": account_id}
         )
+        self._max_concurrency = config.max_concurrency
+        self._stats_throttle = AdaptiveThrottle("Glue column statistics")
+        self._stats_cache = None
+        if config.skip_unchanged_statistics:
+            self._stats_cache = create_cache(config, "glue_column_stats")
+            if self._stats_cache is None:
+                logger.warning(
+                    "Statistics are fetched for all tables, cache_dir is not set"
+                )
+
+        self._max_runs_per_job = config.max_runs_per_job
+        self._job_runs_lookback_days = config.job_runs_lookback_days
+        self._job_runs_cache = None
+        # Cursors are kept until the runs are sent, caches of the plugin share one transaction
+        self._job_run_cursors: Dict[str, datetime] = {}
+        self._job_names: Set[str] = set()
+        if config.incremental_job_runs:
+            self._job_runs_cache = create_cache(config, "glue_job_runs")
+            if self._job_runs_cache is None:
+                logger.warning(
+                    "Job runs are fetched without cursors, cache_dir is not set"
+                )
 
     def get_data_source_oddrn(self) -> str:
         return self._oddrn_generator.get_data_source_oddrn()
 
     def get_data_entities(self) -> Iterable[DataEntity]:
-        return flatten([self.__get_tables(dn) for dn in self.__get_database_names()])
+        """
+        Get tables of all databases, column statistics are fetched concurrently.
+        Tables are mapped in the caller thread, because oddrn generator is not thread-safe.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="glue-stats"
+        ) as executor:
+            tables = [
+                (raw_table, executor.submit(self.__get_column_stats, raw_table))
+                for database_name in self.__get_database_names()
+                for raw_table in self.__get_raw_tables(database_name)
+            ]
+
+            data_entities = [
+                map_glue_table(raw_table, stats.result(), self._oddrn_generator)
+                for raw_table, stats in tables
+            ]
 
-    def get_data_entity_list(self) -> DataEntityList:
+        logger.info(
+            f"Glue column statistics for {len(tables)} tables,"
+            f" throttled={self._stats_throttle.throttled},"
+            f" workers={self._max_concurrency}"
+        )
+        if self._stats_cache:
+            self.__remove_dropped_tables(raw_table for raw_table, _ in tables)
+            self._stats_cache.flush()
+            logger.info(self._stats_cache.stats())
+            self._stats_cache.reset_stats()
+
+        return data_entities
+
+    def get_data_entity_list(self) -> Iterable[DataEntityList]:
+        transformers = list(self.get_transformers())
         items = chain(
             self.get_data_entities(),
-            self.get_transformers(),
-            self.get_transformers_runs(),
+            transformers,
+            self.get_transformers_runs(transformers),
         )
 
-        return DataEntityList(
+        yield DataEntityList(
             data_source_oddrn=self.get_data_source_oddrn(),
             items=list(items),
         )
 
+        # Resumed only after the list was sent, if ingestion fails the runs are fetched again
+        self.__commit_job_run_cursors()
+
     def get_transformers(self) -> Iterable[DataEntity]:
         return self.__fetch_paginator(
             PaginatorConfig(
@@ -70,26 +145,110 @@ class Adapter(AbstractAdapter):
         )
 
     def get_transformers_runs(
-        self, transformer: DataEntity = None
-    ) -> Iterable[DataEntity]:
-        if transformer is None:
-            return flatten(
-                [self.get_transformers_runs(t) for t in self.get_transformers()]
+        self, transformers: Optional[Iterable[DataEntity]] = None
+    ) -> List[DataEntity]:
+        """
+        Get runs of the jobs, runs of each job are fetched concurrently.
+        Runs are mapped in the caller thread, because oddrn generator is not thread-safe.
+        @param transformers: mapped jobs, fetched if not passed
+        """
+        if transformers is None:
+            transformers = list(self.get_transformers())
+
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="glue-runs"
+        ) as executor:
+            job_runs = list(
+                zip(
+                    transformers,
+                    executor.map(
+                        self.__get_raw_job_runs, (t.name for t in transformers)
+                    ),
+                )
             )
 
-        return self.__fetch_paginator(
+        data_entities = []
+        for transformer, raw_job_runs in job_runs:
+            # Runs are linked to the job by the current jobs path of the generator
+            self._oddrn_generator.set_oddrn_paths(jobs=transformer.name)
+            mapper_args = {
+                "oddrn_generator": self._oddrn_generator,
+                "transformer_owner": transformer.owner,
+            }
+            data_entities.extend(
+                map_glue_job_run(raw_job_run, mapper_args)
+                for raw_job_run in raw_job_runs
+            )
+            if self._job_runs_cache and raw_job_runs:
+                self._job_run_cursors[transformer.name] = job_run_cursor(raw_job_runs)
+
+        self._job_names = {t.name for t in transformers}
+        return data_entities
+
+    def __get_raw_job_runs(self, job_name: str) -> List[Dict[str, Any]]:
+        """
+        Get runs of the job started since the look-back window or the job cursor,
+        called from worker threads.
+        @param job_name: name of the job
+        @return: runs, newest first
+        """
+        cursor = self.__get_job_run_cursor(job_name)
+        started_since = max(
+            (since for since in (cursor, self.__lookback_start()) if since),
+            default=None,
+        )
+
+        raw_job_runs = []
+        page_size = min(
+            self._max_runs_per_job or SDK_DATASET_MAX_RESULTS, SDK_DATASET_MAX_RESULTS
+        )
+        for raw_job_run in self.__fetch_paginator(
             PaginatorConfig(
                 op_name="get_job_runs",
-                parameters={"JobName": transformer.name},
-                page_size=SDK_DATASET_MAX_RESULTS,
+                parameters={"JobName": job_name},
+                page_size=page_size,
                 list_fetch_key="JobRuns",
-                mapper=map_glue_job_run,
-                mapper_args={
-                    "oddrn_generator": self._oddrn_generator,
-                    "transformer_owner": transformer.owner,
-                },
             )
-        )
+        ):
+            # get_job_runs returns runs newest first (not documented by AWS),
+            # so the rest of pages are older
+            if started_since and raw_job_run["StartedOn"] < started_since:
+                break
+
+            raw_job_runs.append(raw_job_run)
+            if self._max_runs_per_job and len(raw_job_runs) >= self._max_runs_per_job:
+                break
+
+        return raw_job_runs
+
+    def __lookback_start(self) -> Optional[datetime]:
+        if not self._job_runs_lookback_days:
+            return None
+
+        return datetime.now(timezone.utc) - timedelta(days=self._job_runs_lookback_days)
+
+    def __get_job_run_cursor(self, job_name: str) -> Optional[datetime]:
+        if self._job_runs_cache is None:
+            return None
+
+        cursor = self._job_runs_cache.get(job_name)
+        return datetime.fromisoformat(cursor.decode()) if cursor else None
+
+    def __commit_job_run_cursors(self) -> None:
+        """
+        Store cursors of the sent runs and remove cursors of deleted jobs.
+        """
+        if self._job_runs_cache is None:
+            return
+
+        for job_name, cursor in self._job_run_cursors.items():
+            self._job_runs_cache.set(job_name, "", cursor.isoformat().encode())
+        for job_name, _ in self._job_runs_cache.fingerprints():
+            if job_name not in self._job_names:
+                self._job_runs_cache.delete(job_name)
+
+        self._job_runs_cache.flush()
+        self._job_run_cursors = {}
 
     def __get_database_names(self) -> Iterable[str]:
         return self.__fetch_paginator(
@@ -102,66 +261,73 @@ class Adapter(AbstractAdapter):
             )
         )
 
-    def __get_tables(self, database_name: str) -> Iterable[DataEntity]:
-        raw_tables: Iterable[Dict[str, Any]] = self.__fetch_paginator(
+    def __get_raw_tables(self, database_name: str) -> Iterable[Dict[str, Any]]:
+        return self.__fetch_paginator(
             PaginatorConfig(
                 op_name="get_tables",
                 parameters={"DatabaseName": database_name},
                 page_size=SDK_DATASET_MAX_RESULTS,
                 list_fetch_key="TableList",
-            )
+            ),
+            prefetch=True,
         )
 
-        return [self.__process_table_raw_data(rt) for rt in raw_tables]
+    def __fetch_paginator(
+        self, conf: PaginatorConfig, prefetch: bool = False
+    ) -> Iterable:
+        return fetch_paginator(conf, self._glue_client, prefetch)
 
-    def __fetch_paginator(self, conf: PaginatorConfig) -> Iterable:
-        paginator = self._glue_client.get_paginator(operation_name=conf.op_name)
+    def __remove_dropped_tables(self, raw_tables: Iterable[Dict[str, Any]]) -> None:
+        keys = {_table_key(raw_table) for raw_table in raw_tables}
+        for key, _ in self._stats_cache.fingerprints():
+            if key not in keys:
+                self._stats_cache.delete(key)
 
-        token = None
-        while True:
-            sdk_response = paginator.paginate(
-                **conf.parameters,
-                PaginationConfig={"MaxItems": conf.page_size, "StartingToken": token},
-            )
+    def __get_column_stats(self, raw_table_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get mapped column statistics of the table, called from worker threads.
+        @param raw_table_data: table from get_tables response
+        @return: column name to statistics
+        """
+        key = _table_key(raw_table_data)
+        update_time = raw_table_data.get("UpdateTime")
+        fingerprint = update_time.isoformat() if update_time else None
+        use_cache = self._stats_cache is not None and fingerprint is not None
 
-            for entity in sdk_response.build_full_result()[conf.list_fetch_key]:
-                yield (
-                    entity
-                    if conf.mapper is None
-                    else conf.mapper(entity, conf.mapper_args)
-                )
+        cached = self._stats_cache.get(key, fingerprint) if use_cache else None
+        if cached is not None:
+            # datetimes of the stats are parsed back from isoformat by DataSetFieldStat
+            return json.loads(cached)
 
-            if sdk_response.resume_token is None:
-                break
+        stats = dict(map_column_stats(self.__fetch_column_stats(raw_table_data)))
+        if use_cache:
+            self._stats_cache.set(
+                key, fingerprint, json.dumps(stats, default=_to_json).encode()
+            )
 
-            token = sdk_response.resume_token
+        return stats
 
-    def __process_table_raw_data(self, raw_table_data: Dict[str, Any]) -> DataEntity:
+    def __fetch_column_stats(
+        self, raw_table_data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
         column_names = [
             c["Name"] for c in raw_table_data["StorageDescriptor"]["Columns"]
         ]
 
-        column_stats = flatten(
-            [
-                map_column_stats(
-                    self.__get_stats_for_columns(cns, raw_table_data)[
-                        "ColumnStatisticsList"
-                    ]
-                )
+        return list(
+            flatten(
+                self.__get_stats_for_columns(cns, raw_table_data)[
+                    "ColumnStatisticsList"
+                ]
                 for cns in chunked(column_names, SDK_DATASET_COL_STATS_MAX_RESULTS)
-            ]
-        )
-
-        return map_glue_table(
-            raw_table_data,
-            {col[0]: col[1] for col in column_stats},
-            self._oddrn_generator,
+            )
         )
 
     def __get_stats_for_columns(
         self, column_names: Iterable[str], raw_table_data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        return self._glue_client.get_column_statistics_for_table(
+        return self._stats_throttle.call(
+            self._glue_client.get_column_statistics_for_table,
             DatabaseName=raw_table_data["DatabaseName"],
             TableName=raw_table_data["Name"],
             ColumnNames=column_names,
@@ -1,16 +1,40 @@
 import logging
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
 
-from lark import Lark, LarkError
+from lark import LarkError
 from odd_models.models import DataSetField, DataSetFieldType
 from oddrn_generator import GlueGenerator
 
+from odd_collector_aws.utils.type_parser import DECIMAL, VARCHAR, TypeParser
+
 from .field_stat_schema import FIELD_TYPE_SCHEMA
 from .glue_field_type_transformer import GlueFieldTypeTransformer
 
-glue_field_type_transformer = GlueFieldTypeTransformer()
-parser = Lark.open(
-    "grammar/glue_field_type_grammar.lark", rel_to=__file__, parser="lalr", start="type"
+# SIMPLE_TYPE of the grammar, varchar and decimal without parameters
+PRIMITIVE_TYPES = [
+    "int",
+    "string",
+    "bigint",
+    "binary",
+    "boolean",
+    "char",
+    "date",
+    "double",
+    "float",
+    "interval",
+    "smallint",
+    "timestamp",
+    "tinyint",
+    "varchar",
+    "decimal",
+]
+
+parser = TypeParser(
+    "grammar/glue_field_type_grammar.lark",
+    __file__,
+    GlueFieldTypeTransformer(),
+    primitives=PRIMITIVE_TYPES,
+    parameterized=[VARCHAR, DECIMAL],
 )
 
 TYPES_GLUE_TO_ODD = {
@@ -40,14 +64,13 @@ def __map_glue_type(glue_type: str) -> str:
     return TYPES_GLUE_TO_ODD.get(glue_type, "TYPE_UNKNOWN")
 
 
-def __parse(field_type: str) -> Dict[str, Any]:
-    column_tree = parser.parse(field_type)
-    return glue_field_type_transformer.transform(column_tree)
+def __parse(field_type: str) -> Mapping[str, Any]:
+    return parser.parse(field_type)
 
 
 def __map_column(
     oddrn_generator: GlueGenerator,
-    type_parsed: Dict[str, Any],
+    type_parsed: Mapping[str, Any],
     parent_oddrn: str = None,
     column_name: str = None,
     column_description: str = None,
@@ -62,7 +62,11 @@ def map_glue_job_run(
         ],
         data_transformer_run=DataTransformerRun(
             start_time=raw_job_run_data["StartedOn"].isoformat(),
-            end_time=raw_job_run_data["CompletedOn"].isoformat(),
+            end_time=(
+                raw_job_run_data["CompletedOn"].isoformat()
+                if "CompletedOn" in raw_job_run_data
+                else None
+            ),
             transformer_oddrn=oddrn_generator.get_oddrn_by_path("jobs"),
             status_reason=(
                 raw_job_run_data["ErrorMessage"] if status == "Fail" else None
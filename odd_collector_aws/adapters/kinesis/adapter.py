@@ -1,21 +1,30 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List
 
-import boto3
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import DataEntity, DataEntityList
 from oddrn_generator import KinesisGenerator
 
+from odd_collector_aws.aws.aws_client import Aws
+from odd_collector_aws.aws.throttling import AdaptiveThrottle
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
+from odd_collector_aws.domain.paginator_config import PaginatorConfig
+from odd_collector_aws.domain.plugin import KinesisPlugin
+
 from .mappers.streams import map_kinesis_stream
 
+LIST_STREAMS_PAGE_SIZE = 100
+LIST_SHARDS_PAGE_SIZE = 1000
+
 
 class Adapter(AbstractAdapter):
-    def __init__(self, config) -> None:
-        self._kinesis_client = boto3.client(
-            "kinesis",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.aws_region,
-        )
+    def __init__(self, config: KinesisPlugin) -> None:
+        self._kinesis_client = Aws(config).get_client("kinesis")
+        self._max_concurrency = config.max_concurrency
+        self._include_shards = config.include_shards
+        # DescribeStreamSummary and ListShards are limited by account, not by stream
+        self._describe_throttle = AdaptiveThrottle("Kinesis describe_stream_summary")
+        self._shards_throttle = AdaptiveThrottle("Kinesis list_shards")
 
         self.__oddrn_generator = KinesisGenerator(
             cloud_settings={
@@ -36,17 +45,54 @@ class Adapter(AbstractAdapter):
 
     def get_data_entities(self) -> List[DataEntity]:
         """
-        retrieve streams and all their metadata and converting them to DataEntity type
+        retrieve streams and all their metadata and converting them to DataEntity type,
+        streams are described concurrently and mapped in the caller thread,
+        because oddrn generator is not thread-safe
         :return: list of data entities (streams)
         """
-        streams = self._kinesis_client.list_streams()["StreamNames"]
-
-        return [
-            map_kinesis_stream(
-                self._kinesis_client.describe_stream(StreamName=stream)[
-                    "StreamDescription"
-                ],
-                self.__oddrn_generator,
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="kinesis"
+        ) as executor:
+            return [
+                map_kinesis_stream(stream, self.__oddrn_generator)
+                for stream in executor.map(self._describe_stream, self._list_streams())
+            ]
+
+    def _list_streams(self) -> Iterable[str]:
+        return fetch_paginator(
+            PaginatorConfig(
+                op_name="list_streams",
+                list_fetch_key="StreamNames",
+                page_size=LIST_STREAMS_PAGE_SIZE,
+            ),
+            self._kinesis_client,
+        )
+
+    def _describe_stream(self, stream_name: str) -> Dict[str, Any]:
+        stream = self._describe_throttle.call(
+            self._kinesis_client.describe_stream_summary, StreamName=stream_name
+        )["StreamDescriptionSummary"]
+
+        if self._include_shards:
+            stream["Shards"] = self._list_shards(stream_name)
+
+        return stream
+
+    def _list_shards(self, stream_name: str) -> List[Dict[str, Any]]:
+        """
+        Pages are requested by hand, because ListShards rejects StreamName together
+        with NextToken, which botocore paginator sends on every page.
+        """
+        shards = []
+        params = {"StreamName": stream_name}
+        while True:
+            page = self._shards_throttle.call(
+                self._kinesis_client.list_shards,
+                MaxResults=LIST_SHARDS_PAGE_SIZE,
+                **params,
             )
-            for stream in streams
-        ]
+            shards.extend(page.get("Shards", []))
+
+            if not page.get("NextToken"):
+                return shards
+            params = {"NextToken": page["NextToken"]}
@@ -1,13 +1,14 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
-from typing import Any, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
-import boto3
-from more_itertools import flatten
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import DataEntity, DataEntityList
 from oddrn_generator import QuicksightGenerator
 
+from odd_collector_aws.aws.aws_client import Aws
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
 from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import QuicksightPlugin
 
@@ -23,21 +24,15 @@ SDK_DATA_TRANSFORMERS_MAX_RESULTS = 100
 
 class Adapter(AbstractAdapter):
     def __init__(self, config: QuicksightPlugin) -> None:
-        self._account_id = boto3.client(
-            "sts",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-        ).get_caller_identity()["Account"]
+        aws = Aws(config)
+        self._account_id = aws.get_account_id()
         self._region_name = config.aws_region
-        self._quicksight_client = boto3.client(
-            "quicksight",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.aws_region,
-        )
+        self._quicksight_client = aws.get_client("quicksight")
         self._oddrn_generator = QuicksightGenerator(
             cloud_settings={"region": self._region_name, "account": self._account_id}
         )
+        self._max_concurrency = config.max_concurrency
+        self._data_sources: Optional[Dict[str, Dict[str, Any]]] = None
 
     def get_data_source_oddrn(self) -> str:
         return self._oddrn_generator.get_data_source_oddrn()
@@ -54,15 +49,18 @@ class Adapter(AbstractAdapter):
     """
 
     def get_data_entities(self) -> Iterable[DataEntity]:
-        result = []
-        for i in self.__get_dataset():
-            try:
-                result.append(self.__describe_data_set(i))
-            except self._quicksight_client.exceptions.InvalidParameterValueException:
-                logging.warning(f"Could not process dataset: {i}")
-        return flatten(result)
+        return [
+            self.__process_dataset_raw_data(raw_dataset)
+            for raw_dataset in self.__describe_all(
+                self.__describe_data_set, self.__get_dataset()
+            )
+            if raw_dataset is not None
+        ]
 
     def get_data_entity_list(self) -> DataEntityList:
+        # data sources are fetched once per run when the first dataset is mapped
+        self._data_sources = None
+
         items = chain(
             self.get_data_entities(),
             self.get_dashboard(),
@@ -75,20 +73,20 @@ class Adapter(AbstractAdapter):
         )
 
     def get_dashboard(self) -> Iterable[DataEntity]:
-        return flatten(
-            [
-                self.__describe_dashboard(dashboard_id)
-                for dashboard_id in self.__get_dashboard()
-            ]
-        )
+        return [
+            self.__process_dashboard_raw_data(raw_dashboard)
+            for raw_dashboard in self.__describe_all(
+                self.__describe_dashboard, self.__get_dashboard()
+            )
+        ]
 
     def get_analysis(self) -> Iterable[DataEntity]:
-        return flatten(
-            [
-                self.__describe_analysis(analysis_id)
-                for analysis_id in self.__get_analysis()
-            ]
-        )
+        return [
+            self.__process_analysis_raw_data(raw_analysis)
+            for raw_analysis in self.__describe_all(
+                self.__describe_analysis, self.__get_analysis()
+            )
+        ]
 
     def get_transformers(self) -> List[DataEntity]:
         return []
@@ -107,11 +105,26 @@ class Adapter(AbstractAdapter):
             )
         )
 
-    def __describe_data_set(self, dataset_id: str):
-        raw_datasets: Dict[str, Any] = self._quicksight_client.describe_data_set(
-            AwsAccountId=self._account_id, DataSetId=dataset_id
-        )["DataSet"]
-        return [self.__process_dataset_raw_data(raw_datasets)]
+    def __describe_all(
+        self, describe: Callable[[str], Any], ids: Iterable[str]
+    ) -> List[Any]:
+        """
+        Call describe for each id in a bounded pool, keeping the order of ids.
+        Only API calls are made concurrently, responses are mapped by the caller.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="quicksight"
+        ) as executor:
+            return list(executor.map(describe, ids))
+
+    def __describe_data_set(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._quicksight_client.describe_data_set(
+                AwsAccountId=self._account_id, DataSetId=dataset_id
+            )["DataSet"]
+        except self._quicksight_client.exceptions.InvalidParameterValueException:
+            logging.warning(f"Could not process dataset: {dataset_id}")
+            return None
 
     def __get_ingestions(self, dataset_id: str):
         return self.__fetch_paginator(
@@ -134,11 +147,10 @@ class Adapter(AbstractAdapter):
             )
         )
 
-    def __describe_dashboard(self, dashboard_id: str):
-        raw_dashboards: Dict[str, Any] = self._quicksight_client.describe_dashboard(
+    def __describe_dashboard(self, dashboard_id: str) -> Dict[str, Any]:
+        return self._quicksight_client.describe_dashboard(
             AwsAccountId=self._account_id, DashboardId=dashboard_id
         )["Dashboard"]
-        return [self.__process_dashboard_raw_data(raw_dashboards)]
 
     def __get_analysis(self) -> Iterable[str]:
         return self.__fetch_paginator(
@@ -151,44 +163,44 @@ class Adapter(AbstractAdapter):
             )
         )
 
-    def __describe_analysis(self, analysis_id: str):
-        raw_analysis: Dict[str, Any] = self._quicksight_client.describe_analysis(
+    def __describe_analysis(self, analysis_id: str) -> Dict[str, Any]:
+        return self._quicksight_client.describe_analysis(
             AwsAccountId=self._account_id, AnalysisId=analysis_id
         )["Analysis"]
-        return [self.__process_analysis_raw_data(raw_analysis)]
 
-    def __get_data_sources(self) -> Iterable[str]:
+    def __get_data_sources(self) -> Iterable[Dict[str, Any]]:
         return self.__fetch_paginator(
             PaginatorConfig(
                 op_name="list_data_sources",
                 parameters={"AwsAccountId": self._account_id},
                 page_size=SDK_DATASET_MAX_RESULTS,
                 list_fetch_key="DataSources",
-                mapper=lambda dataset, _: dataset["DataSourceId"],
             )
         )
 
-    def __fetch_paginator(self, conf: PaginatorConfig) -> Iterable:
-        paginator = self._quicksight_client.get_paginator(operation_name=conf.op_name)
-
-        token = None
-        while True:
-            sdk_response = paginator.paginate(
-                **conf.parameters,
-                PaginationConfig={"MaxItems": conf.page_size, "StartingToken": token},
+    def __get_data_source(self, data_source_id: str) -> Dict[str, Any]:
+        """
+        Get data source from the list fetched once per run,
+        data sources missing in the list are described and memoized.
+        """
+        if self._data_sources is None:
+            self._data_sources = {
+                ds["DataSourceId"]: ds for ds in self.__get_data_sources()
+            }
+
+        if data_source_id not in self._data_sources:
+            self._data_sources[data_source_id] = (
+                self._quicksight_client.describe_data_source(
+                    AwsAccountId=self._account_id, DataSourceId=data_source_id
+                )["DataSource"]
             )
 
-            for entity in sdk_response.build_full_result()[conf.list_fetch_key]:
-                yield (
-                    entity
-                    if conf.mapper is None
-                    else conf.mapper(entity, conf.mapper_args)
-                )
-
-            if sdk_response.resume_token is None:
-                break
+        return self._data_sources[data_source_id]
 
-            token = sdk_response.resume_token
+    def __fetch_paginator(
+        self, conf: PaginatorConfig, prefetch: bool = False
+    ) -> Iterable:
+        return fetch_paginator(conf, self._quicksight_client, prefetch)
 
     def __process_dataset_raw_data(
         self, raw_dataset_data: Dict[str, Any]
@@ -197,7 +209,7 @@ class Adapter(AbstractAdapter):
             raw_dataset_data,
             self._account_id,
             self._region_name,
-            self._quicksight_client,
+            self.__get_data_source,
         )
 
     def __process_dashboard_raw_data(
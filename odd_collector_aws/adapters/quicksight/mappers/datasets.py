@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 from more_itertools import flatten
 from odd_models.models import DataEntity, DataEntityType, DataSet, DataTransformer
@@ -18,7 +18,7 @@ def map_quicksight_dataset(
     raw_dataset_data: Dict[str, Any],
     account_id: str,
     region_name: str,
-    quicksight_client,
+    get_data_source: Callable[[str], Dict[str, Any]],
 ) -> DataEntity:
     oddrn_gen = QuicksightGenerator(
         cloud_settings={"account": account_id, "region": region_name},
@@ -38,9 +38,7 @@ def map_quicksight_dataset(
             source_id = raw_dataset_data["PhysicalTableMap"][k][j][
                 "DataSourceArn"
             ].split("/")[-1]
-            source_info = __describe_data_source(
-                quicksight_client, source_id, account_id
-            )
+            source_info = get_data_source(source_id)
             source_type = source_info["Type"]
             oddrn = ""
             if source_type == "S3":
@@ -137,10 +135,3 @@ def map_quicksight_dataset(
             outputs=[],
         ),
     )
-
-
-def __describe_data_source(client, data_source_id: str, account_id: str):
-    raw_data_sources: Dict[str, Any] = client.describe_data_source(
-        AwsAccountId=account_id, DataSourceId=data_source_id
-    )["DataSource"]
-    return raw_data_sources
@@ -1,5 +1,6 @@
 from typing import Iterable, Union
 
+from more_itertools import chunked
 from odd_collector_sdk.domain.adapter import BaseAdapter
 from odd_models.models import DataEntityList
 from oddrn_generator.generators import Generator, S3Generator
@@ -23,13 +24,17 @@ class Adapter(BaseAdapter):
     def create_generator(self) -> Generator:
         return create_generator(S3Generator, self.config)
 
-    def get_data_entity_list(self) -> DataEntityList:
+    def get_data_entity_list(self) -> Iterable[DataEntityList]:
         logger.debug(f"Getting data entities for {self.config.dataset_config.bucket} bucket")
 
         bucket = self.fs.get_bucket(self.config.dataset_config)
-        data_entities = map_bucket(bucket, self.generator)
+        data_entities = map_bucket(bucket, self.generator, self.fs.inventory)
 
-        return DataEntityList(
-            data_source_oddrn=self.get_data_source_oddrn(),
-            items=list(data_entities),
-        )
+        for items in chunked(data_entities, self.config.entities_chunk_size):
+            yield DataEntityList(
+                data_source_oddrn=self.get_data_source_oddrn(),
+                items=items,
+            )
+
+        if self.fs.inventory:
+            self.fs.inventory.finish()
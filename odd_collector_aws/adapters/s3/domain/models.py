@@ -1,6 +1,6 @@
 import datetime
 from dataclasses import dataclass, field
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 
 @dataclass
@@ -11,10 +11,21 @@ class File:
     format: str
     mtime: Optional[datetime.datetime] = None
     metadata: Optional[dict] = field(default_factory=dict)
+    rows_number: Optional[int] = None
+    # Object size and mtime, set when file is listed from s3
+    fingerprint: Optional[str] = None
+    # DataEntity json from the previous run, set for unchanged files in incremental mode
+    data_entity: Optional[str] = None
 
     @classmethod
     def dataset(
-        cls, path: str, name: str, schema: Any, file_format: str, metadata: dict = None
+        cls,
+        path: str,
+        name: str,
+        schema: Any,
+        file_format: str,
+        metadata: dict = None,
+        rows_number: int = None,
     ):
         return cls(
             path=path,
@@ -22,20 +33,33 @@ class File:
             schema=schema,
             format=file_format,
             metadata=metadata,
+            rows_number=rows_number,
         )
 
     @classmethod
     def unknown(cls, path: str, base_name: str, file_format: str):
         return cls(path=path, base_name=base_name, schema=None, format=file_format)
 
+    @classmethod
+    def unchanged(cls, path: str, base_name: str, fingerprint: str, data_entity: str):
+        return cls(
+            path=path,
+            base_name=base_name,
+            schema=None,
+            format="unknown",
+            fingerprint=fingerprint,
+            data_entity=data_entity,
+        )
+
 
 @dataclass
 class Folder:
     path: str
-    objects: list[Union["Folder", File]] = field(default_factory=list)
+    # Listed lazily by FileSystem, objects can be iterated only once
+    objects: Iterable[Union["Folder", File]] = field(default_factory=list)
 
 
 @dataclass
 class Bucket:
     name: str
-    objects: list[Union[Folder, File]] = field(default_factory=list)
+    objects: Iterable[Union[Folder, File]] = field(default_factory=list)
@@ -1,13 +1,26 @@
-from typing import Union
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Iterator, Optional, Union
+
+from pyarrow._dataset import CsvFileFormat
+from pyarrow._fs import FileInfo
 
 from odd_collector_aws.domain.plugin import S3Plugin
 
+from ...cache.sqlite_cache import create_cache
 from ...domain.dataset_config import DatasetConfig
 from ...filesystem.pyarrow_fs import FileSystem as PyarrowFs
+from ...utils.latency import LatencyRecorder
 from ...utils.remove_s3_protocol import remove_protocol
 from .domain.models import Bucket, File, Folder
+from .inventory import Inventory
 from .logger import logger
-from .utils import file_format
+from .schema_cache import SchemaCache, file_fingerprint
+from .utils import csv_delimiter, file_format, is_csv_format, parquet_metadata
+
+# Files which schemas are read ahead of the mapper, for each worker
+READ_AHEAD_PER_WORKER = 4
 
 
 class FileSystem:
@@ -18,6 +31,19 @@ class FileSystem:
     def __init__(self, config: S3Plugin):
         self.fs = PyarrowFs(config)
         self.filename_filter = config.filename_filter
+        self.max_concurrency = config.max_concurrency
+        self.dataset_config = config.dataset_config
+
+        cache = create_cache(config, "s3_schemas", config.schema_cache_size)
+        self.schema_cache = SchemaCache(cache) if cache else None
+
+        self.inventory = None
+        if config.incremental:
+            cache = create_cache(config, "s3_inventory")
+            if cache:
+                self.inventory = Inventory(cache)
+            else:
+                logger.warning("Incremental listing is disabled, cache_dir is not set")
 
     def get_folder_as_file(self, dataset_config: DatasetConfig) -> File:
         """
@@ -49,52 +75,146 @@ class FileSystem:
 
     def get_bucket(self, dataset_config: DatasetConfig) -> Bucket:
         """
-        Get bucket with all related objects.
+        Get bucket with lazily listed objects.
+        Objects are listed and their schemas are read while the bucket is mapped,
+        so only files read ahead of the mapper are kept in memory.
         @param dataset_config:
         @return: Bucket
         """
         bucket = Bucket(dataset_config.bucket)
         if dataset_config.folder_as_dataset:
-            bucket.objects.append(self.get_folder_as_file(dataset_config))
+            bucket.objects = [self.get_folder_as_file(dataset_config)]
         else:
-            objects = self.list_objects(path=dataset_config.full_path)
-            bucket.objects.extend(objects)
+            bucket.objects = self._iter_bucket_objects(dataset_config)
 
         return bucket
 
-    def list_objects(self, path: str) -> list[Union[File, Folder]]:
+    def _iter_bucket_objects(
+        self, dataset_config: DatasetConfig
+    ) -> Iterator[Union[File, Folder]]:
+        if self.inventory:
+            self.inventory.start(remove_protocol(dataset_config.full_path))
+
+        latency = LatencyRecorder("S3 schema reads")
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="s3-schema"
+        ) as executor:
+            yield from self.iter_objects(
+                path=dataset_config.full_path, executor=executor, latency=latency
+            )
+
+        logger.info(f"{latency.summary()}, workers={self.max_concurrency}")
+        if self.schema_cache:
+            self.schema_cache.flush()
+            logger.info(self.schema_cache.stats())
+            self.schema_cache.reset_stats()
+
+    def iter_objects(
+        self,
+        path: str,
+        executor: Optional[Executor] = None,
+        latency: Optional[LatencyRecorder] = None,
+    ) -> Iterator[Union[File, Folder]]:
         """
-        Recursively get objects for path.
+        Lazily get objects for path, folders are listed when their objects are iterated.
+        When executor is passed, schemas of at most READ_AHEAD_PER_WORKER files per worker
+        are read ahead of the consumer, objects are yielded in the listing order.
+        In incremental mode files unchanged since the previous run are returned without reading.
         @param path: s3 path
-        @return: list of either File or Folder
+        @param executor: optional executor to read files schemas concurrently
+        @param latency: optional recorder for per-file schema read latency
+        @return: iterator of either File or Folder
         """
         logger.debug(f"Getting objects for {path=}")
-        objects = []
+        read_ahead = self.max_concurrency * READ_AHEAD_PER_WORKER
+        pending: deque[Union[File, Future]] = deque()
 
         for obj in self.fs.get_file_info(path):
             if obj.is_file:
                 if not self.filename_filter.is_allowed(obj.base_name):
                     continue
 
-                objects.append(self.get_file(obj.path, obj.base_name))
+                pending.append(self._list_file(obj, executor, latency))
+                while len(pending) > read_ahead:
+                    yield _resolve(pending.popleft())
             else:
-                objects.append(self.get_folder(obj.path))
+                while pending:
+                    yield _resolve(pending.popleft())
+                yield self.get_folder(obj.path, executor=executor, latency=latency)
+
+        while pending:
+            yield _resolve(pending.popleft())
 
-        return objects
+    def _list_file(
+        self,
+        obj: FileInfo,
+        executor: Optional[Executor],
+        latency: Optional[LatencyRecorder],
+    ) -> Union[File, Future]:
+        fingerprint = file_fingerprint(obj)
+        if self.inventory:
+            data_entity = self.inventory.lookup(obj.path, fingerprint)
+            if data_entity is not None:
+                return File.unchanged(obj.path, obj.base_name, fingerprint, data_entity)
 
-    def get_file(self, path: str, file_name: str = None) -> File:
+        args = (obj.path, obj.base_name, latency, fingerprint)
+        if executor is None:
+            return self.get_file(*args)
+
+        return executor.submit(self.get_file, *args)
+
+    def get_file(
+        self,
+        path: str,
+        file_name: str = None,
+        latency: Optional[LatencyRecorder] = None,
+        fingerprint: Optional[str] = None,
+    ) -> File:
         """
         Get File with schema and metadata.
         @param path: s3 path to file
         @param file_name: file name
+        @param latency: optional recorder for schema read latency
+        @param fingerprint: object size and mtime, when passed schema is looked up in cache first
         @return: File
         """
+        use_cache = self.schema_cache is not None and fingerprint is not None
+        if use_cache:
+            path = remove_protocol(path)
+            file = self.schema_cache.get(
+                path, file_name or path.split("/")[-1], fingerprint
+            )
+            if file is not None:
+                return file
+
+        start = perf_counter()
+        file = self._get_file(path, file_name)
+        elapsed = perf_counter() - start
+
+        logger.debug(f"Got schema for {file.path} in {elapsed:.3f}s")
+        if latency is not None:
+            latency.record(elapsed)
+
+        if use_cache:
+            self.schema_cache.set(file, fingerprint)
+
+        file.fingerprint = fingerprint
+        return file
+
+    def _get_file(self, path: str, file_name: str = None) -> File:
         path = remove_protocol(path)
         if not file_name:
             file_name = path.split("/")[-1]
 
         try:
             file_fmt = file_format(file_name)
+
+            if file_fmt == "parquet":
+                return self.get_parquet_file(path, file_name)
+
+            if self.dataset_config.csv_sample_size_kb and is_csv_format(file_fmt):
+                return self.get_csv_sample_file(path, file_name, file_fmt)
+
             dataset = self.fs.get_dataset(path, file_fmt)
 
             return File.dataset(
@@ -112,13 +232,68 @@ class FileSystem:
                 file_format="unknown",
             )
 
-    def get_folder(self, path: str, recursive: bool = True) -> Folder:
+    def get_parquet_file(self, path: str, file_name: str) -> File:
+        """
+        Get parquet File using only its footer, without dataset discovery.
+        @param path: s3 path to file without protocol
+        @param file_name: file name
+        @return: File with schema, rows number and row groups statistics
+        """
+        metadata = self.fs.get_parquet_metadata(path)
+
+        return File.dataset(
+            path=path,
+            name=file_name,
+            schema=metadata.schema.to_arrow_schema(),
+            file_format="parquet",
+            metadata=parquet_metadata(metadata),
+            rows_number=metadata.num_rows,
+        )
+
+    def get_csv_sample_file(
+        self, path: str, file_name: str, file_fmt: Union[str, CsvFileFormat]
+    ) -> File:
+        """
+        Get csv/tsv File with schema inferred from the beginning of the file.
+        @param path: s3 path to file without protocol
+        @param file_name: file name
+        @param file_fmt: "csv" or CsvFileFormat
+        @return: File
+        """
+        schema = self.fs.get_csv_sample_schema(
+            path,
+            delimiter=csv_delimiter(file_fmt),
+            sample_size=self.dataset_config.csv_sample_size_kb * 1024,
+            sample_rows=self.dataset_config.csv_sample_rows,
+        )
+
+        return File.dataset(
+            path=path,
+            name=file_name,
+            schema=schema,
+            file_format=file_fmt,
+            metadata={},
+        )
+
+    def get_folder(
+        self,
+        path: str,
+        recursive: bool = True,
+        executor: Optional[Executor] = None,
+        latency: Optional[LatencyRecorder] = None,
+    ) -> Folder:
         """
         Get Folder with objects recursively.
         @param path: s3 path to
         @param recursive: Flag to recursively search nested objects
-        @return: Folder class with objects and path
+        @param executor: optional executor to read files schemas concurrently
+        @param latency: optional recorder for per-file schema read latency
+        @return: Folder class with lazily listed objects and path
         """
         path = remove_protocol(path)
-        objects = self.list_objects(path) if recursive else []
+        objects = self.iter_objects(path, executor, latency) if recursive else []
         return Folder(path, objects)
+
+
+def _resolve(obj: Union[File, Future]) -> File:
+    return obj.result() if isinstance(obj, Future) else obj
@@ -0,0 +1,81 @@
+from typing import Optional
+
+from odd_models.models import DataEntity
+
+from odd_collector_aws.cache.sqlite_cache import SqliteCache
+
+from .logger import logger
+
+
+class Inventory:
+    """
+    Snapshot of objects listed on the previous run with their mapped DataEntity.
+
+    Listing is compared with the snapshot, unchanged files are re-emitted from the stored
+    DataEntity, so only new and changed files go through schema inference and mapping.
+    Objects which were not listed again are removed from the snapshot on finish.
+    """
+
+    def __init__(self, cache: SqliteCache):
+        self.cache = cache
+        self._snapshot: dict[str, str] = {}
+        self._seen: set[str] = set()
+        self.new = 0
+        self.changed = 0
+        self.unchanged = 0
+
+    def start(self, prefix: str) -> None:
+        """
+        Load snapshot of objects under prefix.
+        @param prefix: listed s3 path without protocol, i.e. bucket/folder
+        """
+        self._snapshot = {
+            path: fingerprint
+            for path, fingerprint in self.cache.fingerprints()
+            if path == prefix or path.startswith(f"{prefix}/")
+        }
+        self._seen = set()
+        self.new = self.changed = self.unchanged = 0
+
+    def lookup(self, path: str, fingerprint: str) -> Optional[str]:
+        """
+        Mark object as listed and get its stored DataEntity if the object is unchanged.
+        @param path: s3 path to file without protocol
+        @param fingerprint: object size and mtime
+        @return: DataEntity json or None for new and changed objects
+        """
+        self._seen.add(path)
+        previous = self._snapshot.get(path)
+
+        if previous is None:
+            self.new += 1
+            return None
+
+        if previous != fingerprint:
+            self.changed += 1
+            return None
+
+        data_entity = self.cache.get(path, fingerprint)
+        if data_entity is None:
+            self.changed += 1
+            return None
+
+        self.unchanged += 1
+        return data_entity.decode()
+
+    def save(self, path: str, fingerprint: str, data_entity: DataEntity) -> None:
+        self.cache.set(path, fingerprint, data_entity.json().encode())
+
+    def finish(self) -> None:
+        """
+        Remove objects which were not listed from the snapshot and persist it.
+        """
+        deleted = self._snapshot.keys() - self._seen
+        for path in deleted:
+            self.cache.delete(path)
+        self.cache.flush()
+
+        logger.info(
+            f"S3 inventory: new={self.new}, changed={self.changed}, "
+            f"unchanged={self.unchanged}, deleted={len(deleted)}"
+        )
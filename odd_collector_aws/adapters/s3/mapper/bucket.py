@@ -1,14 +1,20 @@
-from collections import deque
+from typing import Iterable, Iterator, Optional, Union
 
 from odd_models import DataEntity, DataEntityGroup, DataEntityType, DataSet
 from oddrn_generator import S3Generator
 
 from odd_collector_aws.adapters.s3.domain.models import Bucket, File, Folder
+from odd_collector_aws.adapters.s3.inventory import Inventory
 
 from .column import map_columns
 
 
-def map_file(file: File, generator: S3Generator) -> DataEntity:
+def map_file(
+    file: File, generator: S3Generator, inventory: Optional[Inventory] = None
+) -> DataEntity:
+    if file.data_entity is not None:
+        return DataEntity.parse_raw(file.data_entity)
+
     bucket, *keys = file.path.split("/")
     generator.set_oddrn_paths(keys="/".join(keys))
 
@@ -32,17 +38,44 @@ def map_file(file: File, generator: S3Generator) -> DataEntity:
 
     if file.schema:
         data_entity.dataset = DataSet(
-            field_list=map_columns(schema=file.schema, generator=generator)
+            rows_number=file.rows_number,
+            field_list=map_columns(schema=file.schema, generator=generator),
         )
 
+        if inventory is not None and file.fingerprint is not None:
+            inventory.save(file.path, file.fingerprint, data_entity)
+
     return data_entity
 
 
-def map_folder(folder: Folder, generator: S3Generator) -> tuple[str, deque[DataEntity]]:
+def map_objects(
+    objects: Iterable[Union[File, Folder]],
+    parent: DataEntity,
+    generator: S3Generator,
+    inventory: Optional[Inventory] = None,
+) -> Iterator[DataEntity]:
+    """
+    Map objects lazily and add them to the parent DAG entity.
+    Entities of a folder are yielded before the folder itself, so nothing is accumulated.
+    """
+    for obj in objects:
+        if isinstance(obj, File):
+            file_entity = map_file(obj, generator, inventory)
+            parent.data_entity_group.entities_list.append(file_entity.oddrn)
+            yield file_entity
+        if isinstance(obj, Folder):
+            for folder_entity in map_folder(obj, generator, inventory):
+                yield folder_entity
+            # the last yielded entity is the folder DAG
+            parent.data_entity_group.entities_list.append(folder_entity.oddrn)
+
+
+def map_folder(
+    folder: Folder, generator: S3Generator, inventory: Optional[Inventory] = None
+) -> Iterator[DataEntity]:
     bucket, *keys = folder.path.split("/")
     generator.set_oddrn_paths(keys="/".join(keys))
 
-    res = deque()
     data_entity = DataEntity(
         oddrn=generator.get_oddrn_by_path("keys"),
         name=folder.path,
@@ -50,41 +83,21 @@ def map_folder(folder: Folder, generator: S3Generator) -> tuple[str, deque[DataE
         data_entity_group=DataEntityGroup(entities_list=[]),
     )
 
-    res.appendleft(data_entity)
-
-    for obj in folder.objects:
-        if isinstance(obj, File):
-            file_entity = map_file(obj, generator)
-            data_entity.data_entity_group.entities_list.append(file_entity.oddrn)
-            res.appendleft(file_entity)
-        if isinstance(obj, Folder):
-            oddrn, items = map_folder(obj, generator)
-            res = items + res
-            data_entity.data_entity_group.entities_list.append(oddrn)
-
-    return data_entity.oddrn, res
+    yield from map_objects(folder.objects, data_entity, generator, inventory)
+    yield data_entity
 
 
-def map_bucket(bucket: Bucket, generator: S3Generator) -> deque[DataEntity]:
+def map_bucket(
+    bucket: Bucket, generator: S3Generator, inventory: Optional[Inventory] = None
+) -> Iterator[DataEntity]:
     generator.set_oddrn_paths(buckets=bucket.name)
 
-    res = deque()
     data_entity = DataEntity(
         oddrn=bucket.name,
         name=bucket.name,
         type=DataEntityType.DAG,
         data_entity_group=DataEntityGroup(entities_list=[]),
     )
-    res.appendleft(data_entity)
-
-    for obj in bucket.objects:
-        if isinstance(obj, File):
-            file_entity = map_file(obj, generator)
-            res.appendleft(file_entity)
-            data_entity.data_entity_group.entities_list.append(file_entity.oddrn)
-        if isinstance(obj, Folder):
-            dir_oddrn, items = map_folder(obj, generator)
-            res = items + res
-            data_entity.data_entity_group.entities_list.append(dir_oddrn)
 
-    return res
+    yield from map_objects(bucket.objects, data_entity, generator, inventory)
+    yield data_entity
@@ -1,7 +1,6 @@
-from typing import Any
+from typing import Any, Mapping
 
 from funcy import lflatten
-from lark import Lark
 from odd_models.models import DataSetField, DataSetFieldType, Type
 from oddrn_generator import S3Generator
 from pyarrow import Schema
@@ -9,6 +8,7 @@ from pyarrow import Schema
 from odd_collector_aws.adapters.s3.mapper.s3_field_type_transformer import (
     field_type_transformer,
 )
+from odd_collector_aws.utils.type_parser import DECIMAL, TIMESTAMP, VARCHAR, TypeParser
 
 from ..logger import logger
 
@@ -51,15 +51,54 @@ TYPE_MAP: dict[str, Type] = {
     "unknown": Type.TYPE_UNKNOWN,
 }
 
-parser = Lark.open(
-    "grammar/s3_field_type_grammar.lark", rel_to=__file__, parser="lalr", start="type"
+# SIMPLE_TYPE of the grammar, timestamp, varchar and decimal without parameters
+PRIMITIVE_TYPES = [
+    "int8",
+    "int16",
+    "int32",
+    "int64",
+    "uint8",
+    "uint16",
+    "uint32",
+    "uint64",
+    "float",
+    "float8",
+    "float16",
+    "float32",
+    "float64",
+    "time32",
+    "time64",
+    "date32",
+    "date32[day]",
+    "date64",
+    "duration",
+    "month_day_nano_interval",
+    "binary",
+    "string",
+    "utf8",
+    "large_binary",
+    "large_string",
+    "large_utf8",
+    "decimal128",
+    "double",
+    "bool",
+    "timestamp",
+    "varchar",
+    "decimal",
+]
+
+parser = TypeParser(
+    "grammar/s3_field_type_grammar.lark",
+    __file__,
+    field_type_transformer,
+    primitives=PRIMITIVE_TYPES,
+    parameterized=[VARCHAR, DECIMAL, TIMESTAMP],
 )
 
 
-def parse(field_type: str) -> dict[str, Any]:
+def parse(field_type: str) -> Mapping[str, Any]:
     try:
-        column_tree = parser.parse(field_type)
-        return field_type_transformer.transform(column_tree)
+        return parser.parse(field_type)
     except Exception as exc:
         logger.warning(f"Could not map field type: {field_type}. {exc}")
         return {"type": "unknown", "logical_type": field_type}
@@ -67,7 +106,7 @@ def parse(field_type: str) -> dict[str, Any]:
 
 def map_column(
     generator: S3Generator,
-    type_parsed: dict[str, Any],
+    type_parsed: Mapping[str, Any],
     column_name: str = None,
     parent_oddrn: str = None,
     column_description: str = None,
@@ -1,9 +1,8 @@
 import logging
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping
 
 from funcy import lflatten
-from lark import Lark
 from odd_models.models import (
     DataEntity,
     DataEntityType,
@@ -16,7 +15,7 @@ from oddrn_generator.generators import S3Generator
 from oddrn_generator.utils import escape
 from pyarrow import Schema
 
-from .s3_field_type_transformer import S3FieldTypeTransformer
+from .column import parser
 
 SCHEMA_FILE_URL = (
     "https://raw.githubusercontent.com/opendatadiscovery/opendatadiscovery-specification/"
@@ -62,16 +61,11 @@ TYPE_MAP: Dict[str, Type] = {
     "dictionary": Type.TYPE_STRUCT,
     "unknown": Type.TYPE_UNKNOWN,
 }
-field_type_transformer = S3FieldTypeTransformer()
-parser = Lark.open(
-    "grammar/s3_field_type_grammar.lark", rel_to=__file__, parser="lalr", start="type"
-)
 
 
-def __parse(field_type: str) -> Dict[str, Any]:
+def __parse(field_type: str) -> Mapping[str, Any]:
     try:
-        column_tree = parser.parse(field_type)
-        return field_type_transformer.transform(column_tree)
+        return parser.parse(field_type)
     except Exception as exc:
         logging.warning(f"Could not map field type: {field_type}")
         logging.debug(exc, exc_info=True)
@@ -116,7 +110,7 @@ def map_dataset(
 
 def map_column(
     oddrn_gen: S3Generator,
-    type_parsed: Dict[str, Any],
+    type_parsed: Mapping[str, Any],
     column_name: str = None,
     parent_oddrn: str = None,
     column_description: str = None,
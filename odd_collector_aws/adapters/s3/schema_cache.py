@@ -0,0 +1,86 @@
+import base64
+import json
+from typing import Optional, Union
+
+import pyarrow as pa
+from pyarrow._dataset import CsvFileFormat
+from pyarrow._fs import FileInfo
+from pyarrow.csv import ParseOptions
+
+from odd_collector_aws.cache.sqlite_cache import SqliteCache
+
+from .domain.models import File
+
+
+def file_fingerprint(info: FileInfo) -> str:
+    """
+    Fingerprint of s3 object, changes when the object is overwritten.
+    pyarrow doesn't expose ETag, so size with modification time are used.
+    """
+    return f"{info.size}:{info.mtime_ns}"
+
+
+def format_name(file_fmt: Union[str, CsvFileFormat]) -> str:
+    if isinstance(file_fmt, CsvFileFormat):
+        return "tsv" if file_fmt.parse_options.delimiter == "\t" else "csv"
+
+    return file_fmt
+
+
+def parse_format(name: str) -> Union[str, CsvFileFormat]:
+    """
+    Inverse of format_name, restores format as it is returned by utils.file_format.
+    """
+    if name == "tsv":
+        return CsvFileFormat(ParseOptions(delimiter="\t"))
+
+    return name
+
+
+class SchemaCache:
+    """
+    Persistent cache of files schemas, so unchanged objects are not read again.
+    """
+
+    def __init__(self, cache: SqliteCache):
+        self.cache = cache
+
+    def get(self, path: str, file_name: str, fingerprint: str) -> Optional[File]:
+        value = self.cache.get(path, fingerprint)
+        if value is None:
+            return None
+
+        entry = json.loads(value)
+        schema = pa.ipc.read_schema(pa.py_buffer(base64.b64decode(entry["schema"])))
+
+        file = File.dataset(
+            path=path,
+            name=file_name,
+            schema=schema,
+            file_format=parse_format(entry["format"]),
+            metadata=entry["metadata"],
+            rows_number=entry["rows_number"],
+        )
+        file.fingerprint = fingerprint
+        return file
+
+    def set(self, file: File, fingerprint: str) -> None:
+        if file.schema is None:
+            return
+
+        entry = {
+            "schema": base64.b64encode(file.schema.serialize().to_pybytes()).decode(),
+            "format": format_name(file.format),
+            "metadata": file.metadata,
+            "rows_number": file.rows_number,
+        }
+        self.cache.set(file.path, fingerprint, json.dumps(entry).encode())
+
+    def flush(self) -> None:
+        self.cache.flush()
+
+    def stats(self) -> str:
+        return self.cache.stats()
+
+    def reset_stats(self) -> None:
+        self.cache.reset_stats()
@@ -1,8 +1,9 @@
 import re
-from typing import Union
+from typing import Any, Union
 
 from pyarrow._csv import ParseOptions
 from pyarrow._dataset import CsvFileFormat
+from pyarrow.parquet import FileMetaData
 
 from odd_collector_aws.adapters.s3.logger import logger
 
@@ -38,3 +39,47 @@ def file_format(file_name: str) -> Union[str, CsvFileFormat]:
     else:
         logger.warning(f"No available parser for {extension=}")
         return extension
+
+
+def is_csv_format(file_fmt: Union[str, CsvFileFormat]) -> bool:
+    return file_fmt == "csv" or isinstance(file_fmt, CsvFileFormat)
+
+
+def csv_delimiter(file_fmt: Union[str, CsvFileFormat]) -> str:
+    """
+    Get columns delimiter for csv or tsv file format.
+    @param file_fmt: "csv" or CsvFileFormat returned by file_format
+    @return: delimiter
+    """
+    if isinstance(file_fmt, CsvFileFormat):
+        return file_fmt.parse_options.delimiter
+
+    return ","
+
+
+def parquet_metadata(metadata: FileMetaData) -> dict[str, Any]:
+    """
+    Get file level metadata and row groups statistics from parquet footer.
+    @param metadata: parquet FileMetaData
+    @return: dict of metadata
+    """
+    row_groups = [metadata.row_group(i) for i in range(metadata.num_row_groups)]
+    rows_per_group = [row_group.num_rows for row_group in row_groups]
+
+    return {
+        "Format": "parquet",
+        "CreatedBy": metadata.created_by,
+        "FormatVersion": metadata.format_version,
+        "NumRows": metadata.num_rows,
+        "NumColumns": metadata.num_columns,
+        "NumRowGroups": metadata.num_row_groups,
+        "MinRowGroupRows": min(rows_per_group, default=0),
+        "MaxRowGroupRows": max(rows_per_group, default=0),
+        "TotalByteSize": sum(row_group.total_byte_size for row_group in row_groups),
+        "TotalCompressedSize": sum(
+            row_group.column(i).total_compressed_size
+            for row_group in row_groups
+            for i in range(row_group.num_columns)
+        ),
+        "FooterSize": metadata.serialized_size,
+    }
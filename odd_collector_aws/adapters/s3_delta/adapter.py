@@ -1,7 +1,9 @@
+from functools import cached_property
 from typing import Union
 
 from funcy import lmap, mapcat, partial
 from odd_collector_sdk.domain.adapter import BaseAdapter
+from odd_collector_sdk.grammar_parser.build_dataset_field import DatasetFieldBuilder
 from odd_models.models import DataEntityList
 from oddrn_generator.generators import Generator, S3Generator
 
@@ -11,6 +13,7 @@ from odd_collector_aws.utils.create_generator import create_generator
 from .client import DeltaClient
 from .logger import logger
 from .mappers.delta_table import map_delta_table
+from .mappers.field import create_field_builder
 
 # TODO: Add tags
 
@@ -26,11 +29,17 @@ class Adapter(BaseAdapter):
     def create_generator(self) -> Generator:
         return create_generator(S3Generator, self.config)
 
+    @cached_property
+    def field_builder(self) -> DatasetFieldBuilder:
+        return create_field_builder(self.generator)
+
     def get_data_entity_list(self) -> DataEntityList:
         logger.debug(f"Getting data entity list for {self.config.delta_tables}")
 
-        tables = mapcat(self.client.get_table, self.config.delta_tables)
-        data_entities = lmap(partial(map_delta_table, self.generator), tables)
+        tables = mapcat(self.client.get_tables, self.config.delta_tables)
+        data_entities = lmap(
+            partial(map_delta_table, self.generator, self.field_builder), tables
+        )
 
         return DataEntityList(
             data_source_oddrn=self.generator.get_data_source_oddrn(),
@@ -1,142 +1,144 @@
-import traceback as tb
-from dataclasses import asdict, dataclass
-from typing import Any, Iterable, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Union
 
-from deltalake import DeltaTable
-from funcy import complement, isnone, last, partial, select_values, silent, walk
+import pyarrow as pa
+import pyarrow.compute as pc
+from deltalake import Schema
+from funcy import silent
 
 from odd_collector_aws.domain.plugin import DeltaTableConfig, S3DeltaPlugin
 from odd_collector_aws.filesystem.pyarrow_fs import FileSystem
 
 from ...utils.dates import add_utc_timezone, from_ms
 from ...utils.remove_s3_protocol import remove_protocol
+from .delta_log import DELTA_LOG, DeltaLog, DeltaLogNotFound, DeltaLogReader
 from .logger import logger
 from .models.table import DTable
 
+# Computed on the Arrow batch, without converting add actions to Python lists
+ADD_ACTIONS_AGGREGATES = {
+    "size_bytes": pc.sum,
+    "num_records": pc.sum,
+    "modification_time": pc.max,
+}
 
-def handle_values(
-        obj: dict, handler: tuple[str, callable]
-) -> tuple[str, Optional[any]]:
-    key, callback = handler
-    return key, silent(callback)(obj.get(key))
 
+def aggregate_add_actions(actions: Union[pa.RecordBatch, pa.Table]) -> dict[str, Any]:
+    """
+    Aggregate add actions of the table.
+    @param actions: add actions, i.e. DeltaLog.add_actions or DeltaTable.get_add_actions(flatten=True)
+    @return: total size_bytes and num_records, latest modification_time, None for missing columns
+    """
 
-@dataclass
-class StorageOptions:
-    DEFAULT_REGION = "us-east-1"
-
-    aws_access_key_id: str = None
-    aws_secret_access_key: str = None
-    aws_region: str = None
-    aws_session_token: str = None
-    aws_storage_allow_http: str = None
-    endpoint_url: str = None
-    aws_profile: str = None
-    aws_role_session_name: str = None
-
-    @classmethod
-    def from_config(cls, config: S3DeltaPlugin) -> "StorageOptions":
-        return cls(
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            aws_region=config.aws_region or cls.DEFAULT_REGION,
-            aws_session_token=config.aws_session_token,
-            endpoint_url=config.endpoint_url,
-            aws_storage_allow_http="true" if config.aws_storage_allow_http else None,
-            aws_profile=config.profile_name,
-            aws_role_session_name=config.aws_role_session_name,
-        )
-
-    def to_dict(self) -> dict[str, str]:
-        return select_values(complement(isnone), asdict(self))
+    def aggregate(key: str, callback: Callable) -> Optional[Any]:
+        index = actions.schema.get_field_index(key)
+        return None if index < 0 else callback(actions.column(index)).as_py()
 
-
-class IsNotDeltaTable(Exception):
-    ...
+    return {
+        key: silent(aggregate)(key, callback)
+        for key, callback in ADD_ACTIONS_AGGREGATES.items()
+    }
 
 
 class DeltaClient:
-    def __init__(self, config: S3DeltaPlugin) -> None:
-        self.storage_options: StorageOptions = StorageOptions.from_config(config)
-        self.fs = FileSystem(config)
-
-    def load_delta_table(self, delta_table_config: DeltaTableConfig) -> DeltaTable:
-        try:
-            return DeltaTable(
-                delta_table_config.path,
-                storage_options=self.storage_options.to_dict(),
-            )
-        except Exception as e:
-            raise IsNotDeltaTable() from e
-
-    def handle_folder(self, config: DeltaTableConfig) -> Iterable[DTable]:
-        logger.debug(f"Getting delta tables from folder {config.path}")
+    DEFAULT_REGION = "us-east-1"
 
+    def __init__(self, config: S3DeltaPlugin) -> None:
+        self.fs = FileSystem(config, default_region=self.DEFAULT_REGION)
+        self.log_reader = DeltaLogReader(self.fs.fs)
+        self.max_concurrency = config.max_concurrency
+
+    def get_tables(self, config: DeltaTableConfig) -> Iterable[DTable]:
+        """
+        Discover delta tables under the prefix and load them concurrently.
+        @param config: prefix which is either a delta table or a folder with delta tables
+        @return: tables in discovery order
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="s3-delta"
+        ) as executor:
+            tables = self.discover_tables(config, executor)
+            logger.debug(f"Found {len(tables)} delta tables in {config.path}")
+
+            yield from filter(None, executor.map(self.get_table, tables))
+
+    def discover_tables(
+        self, config: DeltaTableConfig, executor: Executor
+    ) -> list[DeltaTableConfig]:
+        """
+        Walk folders level by level, listing folders of each level concurrently.
+        Folder with _delta_log is a table, its subfolders are not listed.
+        """
+        tables = []
+        level = [config]
+        while level:
+            next_level = []
+            for folder, (is_table, subfolders) in zip(
+                level, executor.map(self.list_folder, level)
+            ):
+                if is_table:
+                    tables.append(folder)
+                else:
+                    next_level.extend(subfolders)
+            level = next_level
+
+        return tables
+
+    def list_folder(
+        self, config: DeltaTableConfig
+    ) -> tuple[bool, list[DeltaTableConfig]]:
+        """
+        List folder once.
+        @return: whether the folder is a delta table and its allowed subfolders
+        """
         objects = self.fs.get_file_info(remove_protocol(config.path))
+        folders = [obj for obj in objects if not obj.is_file and obj.base_name]
 
-        folders = filter(lambda obj: not obj.is_file, objects)
-        allowed = filter(lambda folder: folder.base_name, folders)
-        filtered = filter(lambda item: config.allow(item.path), allowed)
+        if any(folder.base_name == DELTA_LOG for folder in folders):
+            return True, []
 
-        for obj in filtered:
-            new_config = config.append_prefix(obj.base_name)
-            yield from self.get_table(new_config)
+        return False, [
+            config.append_prefix(folder.base_name)
+            for folder in folders
+            if config.allow(folder.path)
+        ]
 
-    def get_table(self, delta_table_config: DeltaTableConfig) -> Iterable[DTable]:
+    def get_table(self, delta_table_config: DeltaTableConfig) -> Optional[DTable]:
         # sourcery skip: raise-specific-error
         try:
             logger.debug(f"Getting delta table {delta_table_config.path}")
-            table = self.load_delta_table(delta_table_config)
+            delta_log = self.log_reader.read(remove_protocol(delta_table_config.path))
 
-            metadata = get_metadata(table)
+            metadata = get_metadata(delta_log)
 
-            yield DTable(
-                table_uri=table.table_uri,
-                schema=table.schema(),
+            return DTable(
+                table_uri=delta_table_config.path,
+                schema=Schema.from_json(delta_log.metadata["schemaString"]),
                 num_rows=metadata.get("num_records"),
                 metadata=metadata,
                 created_at=silent(from_ms)(metadata.get("created_time")),
                 updated_at=silent(add_utc_timezone)(metadata.get("modification_time")),
             )
-        except IsNotDeltaTable:
-            logger.warning(
-                f"Path {delta_table_config.path} is not a delta table. Searching for"
-                " delta tables in subfolders."
-            )
-            yield from self.handle_folder(delta_table_config)
+        except DeltaLogNotFound:
+            logger.warning(f"Path {delta_table_config.path} has empty delta log")
+            return None
         except Exception as e:
             raise Exception(
                 f"Failed to get delta table {delta_table_config.path}. {e}"
             ) from e
 
 
-def get_metadata(table: DeltaTable) -> dict[str, Any]:
-    metadata = {}
-
-    try:
-        logger.debug(f"Getting actions list for {table.table_uri}")
-        actions = table.get_add_actions(flatten=True).to_pydict()
-
-        metadata |= walk(
-            partial(handle_values, actions),
-            {"size_bytes": sum, "num_records": sum, "modification_time": last},
-        )
-    except Exception as e:
-        logger.error(f"Failed to get actions list for {table.table_uri}")
-
-    try:
-        logger.debug(f"Getting metadata for {table.table_uri}")
-        delta_metadata = table.metadata()
-        metadata |= {
-            "id": delta_metadata.id,
-            "name": delta_metadata.name,
-            "description": delta_metadata.description,
-            "partition_columns": ",".join(delta_metadata.partition_columns),
-            "configuration": delta_metadata.configuration,
-            "created_time": delta_metadata.created_time,
-        }
-    except Exception as e:
-        logger.debug(tb.format_exc())
-        logger.error(f"Failed to get metadata for {table.table_uri}. {e}")
-
-    return metadata
+def get_metadata(delta_log: DeltaLog) -> dict[str, Any]:
+    delta_metadata = delta_log.metadata
+
+    return aggregate_add_actions(delta_log.add_actions) | {
+        "id": delta_metadata.get("id"),
+        "name": delta_metadata.get("name"),
+        "description": delta_metadata.get("description"),
+        "partition_columns": ",".join(delta_metadata.get("partitionColumns", [])),
+        "configuration": delta_metadata.get("configuration"),
+        "created_time": delta_metadata.get("createdTime"),
+        "version": delta_log.version,
+        "min_reader_version": delta_log.protocol.get("minReaderVersion"),
+        "min_writer_version": delta_log.protocol.get("minWriterVersion"),
+    }
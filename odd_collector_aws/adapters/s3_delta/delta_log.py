@@ -0,0 +1,299 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow.fs import FileSelector, FileSystem, FileType
+
+from .logger import logger
+
+DELTA_LOG = "_delta_log"
+LAST_CHECKPOINT = "_last_checkpoint"
+# Writers put numRecords first in file stats, so the first match is the top level one
+NUM_RECORDS_PATTERN = r'"numRecords"\s*:\s*(?P<num_records>\d+)'
+
+ADD_ACTIONS_SCHEMA = pa.schema(
+    [
+        ("path", pa.string()),
+        ("size_bytes", pa.int64()),
+        ("modification_time", pa.timestamp("ms")),
+        ("num_records", pa.int64()),
+    ]
+)
+
+
+class DeltaLogNotFound(Exception):
+    ...
+
+
+class DeltaLogIncomplete(Exception):
+    ...
+
+
+@dataclass
+class DeltaLog:
+    version: int
+    metadata: dict[str, Any]
+    protocol: dict[str, Any]
+    # Active files of the table, in ADD_ACTIONS_SCHEMA
+    add_actions: pa.Table
+
+
+def commit_version(file_name: str) -> Optional[int]:
+    """
+    Get version of a commit file, i.e. 00000000000000000010.json
+    @return: version or None if the file isn't a commit
+    """
+    stem, _, extension = file_name.partition(".")
+    return int(stem) if extension == "json" and stem.isdigit() else None
+
+
+def checkpoint_files(version: int, parts: Optional[int]) -> list[str]:
+    if not parts:
+        return [f"{version:020d}.checkpoint.parquet"]
+
+    return [
+        f"{version:020d}.checkpoint.{part:010d}.{parts:010d}.parquet"
+        for part in range(1, parts + 1)
+    ]
+
+
+def find_last_checkpoint(file_names: list[str]) -> Optional[dict]:
+    """
+    Find the latest complete checkpoint when _last_checkpoint is missing.
+    @param file_names: files of _delta_log
+    @return: checkpoint in _last_checkpoint format, i.e. {"version": 10, "parts": 2}
+    """
+    checkpoints: dict[int, dict[Optional[int], set[int]]] = {}
+    for file_name in file_names:
+        parts = file_name.split(".")
+        if len(parts) < 3 or parts[1] != "checkpoint" or parts[-1] != "parquet":
+            continue
+        if not parts[0].isdigit():
+            continue
+
+        version = int(parts[0])
+        if len(parts) == 3:
+            checkpoints.setdefault(version, {}).setdefault(None, set())
+        elif len(parts) == 5 and parts[2].isdigit() and parts[3].isdigit():
+            checkpoints.setdefault(version, {}).setdefault(int(parts[3]), set()).add(
+                int(parts[2])
+            )
+
+    for version in sorted(checkpoints, reverse=True):
+        for total, found in checkpoints[version].items():
+            if total is None:
+                return {"version": version}
+            if found == set(range(1, total + 1)):
+                return {"version": version, "parts": total}
+
+    return None
+
+
+def num_records(stats: Optional[str]) -> Optional[int]:
+    return json.loads(stats).get("numRecords") if stats else None
+
+
+def num_records_array(stats: pa.Array) -> pa.Array:
+    """
+    Extract numRecords of JSON encoded file stats without converting them to Python objects.
+    @param stats: string array of add.stats
+    @return: int64 array, null where stats are missing or don't have numRecords
+    """
+    matches = pc.extract_regex(stats, NUM_RECORDS_PATTERN)
+    return pc.struct_field(matches, [0]).cast(pa.int64())
+
+
+class DeltaLogReader:
+    """
+    Reads state of a Delta table from its _delta_log without replaying it with deltalake.
+
+    Only the checkpoint referenced by _last_checkpoint (or the latest complete checkpoint
+    if it is missing) and the JSON commits written after it are read. Columns of the checkpoint
+    needed for the table stats are read into Arrow arrays, so the active files are never
+    converted to Python objects.
+    """
+
+    def __init__(self, fs: FileSystem):
+        self.fs = fs
+
+    def read(self, table_path: str) -> DeltaLog:
+        """
+        Read table state.
+        @param table_path: path to table without protocol, i.e. bucket/delta_data/table
+        @return: DeltaLog with the latest metaData, protocol and active files
+        @raise DeltaLogNotFound: if there are no commits and checkpoints
+        @raise DeltaLogIncomplete: if commits between the checkpoint and the latest version are missing
+        """
+        log_path = f"{table_path}/{DELTA_LOG}"
+        file_names = self._list_log(log_path)
+        last_checkpoint = self._read_last_checkpoint(log_path) or find_last_checkpoint(
+            file_names
+        )
+        checkpoint_version = last_checkpoint["version"] if last_checkpoint else -1
+
+        commits = sorted(
+            version
+            for version in map(commit_version, file_names)
+            if version is not None and version > checkpoint_version
+        )
+        if not last_checkpoint and not commits:
+            raise DeltaLogNotFound(f"No delta log found in {table_path}")
+
+        # Commits removed by log retention can't be replayed without a checkpoint
+        expected = list(
+            range(checkpoint_version + 1, checkpoint_version + 1 + len(commits))
+        )
+        if commits != expected:
+            raise DeltaLogIncomplete(
+                f"Delta log of {table_path} misses commits after version"
+                f" {checkpoint_version}"
+            )
+
+        state = _State()
+        if last_checkpoint:
+            for file_name in checkpoint_files(
+                checkpoint_version, last_checkpoint.get("parts")
+            ):
+                state.apply_checkpoint(self._read_checkpoint(f"{log_path}/{file_name}"))
+
+        for version in commits:
+            with self.fs.open_input_stream(f"{log_path}/{version:020d}.json") as stream:
+                state.apply_commit(stream.read().decode())
+
+        version = commits[-1] if commits else checkpoint_version
+        logger.debug(
+            f"Read {table_path} version {version}: "
+            f"checkpoint={checkpoint_version}, commits={len(commits)}"
+        )
+        return state.to_delta_log(version)
+
+    def _read_last_checkpoint(self, log_path: str) -> Optional[dict]:
+        path = f"{log_path}/{LAST_CHECKPOINT}"
+        if self.fs.get_file_info(path).type != FileType.File:
+            return None
+
+        with self.fs.open_input_stream(path) as stream:
+            return json.loads(stream.read())
+
+    def _list_log(self, log_path: str) -> list[str]:
+        infos = self.fs.get_file_info(FileSelector(log_path, allow_not_found=True))
+        return [info.base_name for info in infos if info.is_file]
+
+    def _read_checkpoint(self, path: str) -> pa.Table:
+        with self.fs.open_input_file(path) as file:
+            parquet_file = pq.ParquetFile(file)
+            add_type = parquet_file.schema_arrow.field("add").type
+            stats = (
+                "add.stats_parsed.numRecords"
+                if add_type.get_field_index("stats_parsed") >= 0
+                else "add.stats"
+            )
+            return parquet_file.read(
+                columns=[
+                    "metaData",
+                    "protocol",
+                    "add.path",
+                    "add.size",
+                    "add.modificationTime",
+                    stats,
+                ]
+            )
+
+
+class _State:
+    def __init__(self):
+        self.metadata: dict[str, Any] = {}
+        self.protocol: dict[str, Any] = {}
+        self.checkpoint_actions: list[pa.RecordBatch] = []
+        # Files added or removed by commits after the checkpoint
+        self.commit_actions: dict[str, Optional[tuple]] = {}
+
+    def apply_checkpoint(self, checkpoint: pa.Table) -> None:
+        metadata = checkpoint.column("metaData").drop_null()
+        if len(metadata):
+            self.metadata = metadata[0].as_py()
+
+        protocol = checkpoint.column("protocol").drop_null()
+        if len(protocol):
+            self.protocol = protocol[0].as_py()
+
+        add = checkpoint.column("add").combine_chunks()
+        add = add.filter(pc.is_valid(add.field("path")))
+
+        if add.type.get_field_index("stats_parsed") >= 0:
+            records = add.field("stats_parsed").field("numRecords")
+        else:
+            records = num_records_array(add.field("stats"))
+
+        self.checkpoint_actions.append(
+            pa.RecordBatch.from_arrays(
+                [
+                    add.field("path"),
+                    add.field("size"),
+                    add.field("modificationTime").cast(pa.timestamp("ms")),
+                    records,
+                ],
+                schema=ADD_ACTIONS_SCHEMA,
+            )
+        )
+
+    def apply_commit(self, commit: str) -> None:
+        for line in commit.splitlines():
+            if not line.strip():
+                continue
+
+            action = json.loads(line)
+            if "add" in action:
+                add = action["add"]
+                self.commit_actions[add["path"]] = (
+                    add["path"],
+                    add.get("size"),
+                    add.get("modificationTime"),
+                    num_records(add.get("stats")),
+                )
+            elif "remove" in action:
+                self.commit_actions[action["remove"]["path"]] = None
+            elif "metaData" in action:
+                self.metadata = action["metaData"]
+            elif "protocol" in action:
+                self.protocol = action["protocol"]
+
+    def to_delta_log(self, version: int) -> DeltaLog:
+        batches = self.checkpoint_actions
+        if self.commit_actions:
+            # Files touched by commits are replaced by the latest commit action
+            touched = pa.array(list(self.commit_actions), pa.string())
+            batches = [
+                batch.filter(pc.invert(pc.is_in(batch.column(0), value_set=touched)))
+                for batch in batches
+            ]
+
+        added = pa.RecordBatch.from_pylist(
+            [
+                dict(zip(ADD_ACTIONS_SCHEMA.names, action))
+                for action in self.commit_actions.values()
+                if action
+            ],
+            schema=ADD_ACTIONS_SCHEMA,
+        )
+
+        return DeltaLog(
+            version=version,
+            metadata=_maps_as_dicts(self.metadata),
+            protocol=self.protocol,
+            add_actions=pa.Table.from_batches([*batches, added], ADD_ACTIONS_SCHEMA),
+        )
+
+
+def _maps_as_dicts(metadata: dict[str, Any]) -> dict[str, Any]:
+    """
+    Arrow converts map columns of the checkpoint to lists of (key, value) pairs.
+    """
+    result = dict(metadata)
+    if isinstance(result.get("configuration"), list):
+        result["configuration"] = dict(result["configuration"])
+
+    return result
@@ -1,3 +1,4 @@
+from odd_collector_sdk.grammar_parser.build_dataset_field import DatasetFieldBuilder
 from odd_models.models import DataEntity, DataEntityType, DataSet
 from oddrn_generator import S3Generator
 
@@ -9,14 +10,16 @@ from .field import map_field
 from .metadata import map_metadata
 
 
-def map_delta_table(generator: S3Generator, delta_table: DTable) -> DataEntity:
+def map_delta_table(
+    generator: S3Generator, field_builder: DatasetFieldBuilder, delta_table: DTable
+) -> DataEntity:
     bucket, key = parse_s3_url(delta_table.table_uri)
     fields = [DField(field) for field in delta_table.schema.fields]
     generator.set_oddrn_paths(buckets=bucket, keys=key)
 
     field_list = []
     for field in fields:
-        processed_ds_fields = map_field(generator, field)
+        processed_ds_fields = map_field(field_builder, field)
         field_list.extend(processed_ds_fields)
 
     return DataEntity(
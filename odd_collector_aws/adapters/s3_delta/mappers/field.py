@@ -1,7 +1,9 @@
 from pathlib import Path
+
 from odd_collector_sdk.grammar_parser.build_dataset_field import DatasetFieldBuilder
 from odd_models.models import DataSetField, Type
 from oddrn_generator import S3Generator
+
 from ..models.field import DField
 
 DELTA_TO_ODD_TYPE_MAP: dict[str, Type] = {
@@ -26,13 +28,17 @@ DELTA_TO_ODD_TYPE_MAP: dict[str, Type] = {
 }
 
 
-def map_field(oddrn_generator: S3Generator, column: DField) -> list[DataSetField]:
-    field_builder = DatasetFieldBuilder(
+def create_field_builder(oddrn_generator: S3Generator) -> DatasetFieldBuilder:
+    """
+    Builder compiles the grammar, so it is created once per adapter instead of once per column.
+    """
+    return DatasetFieldBuilder(
         data_source="s3_delta",
         oddrn_generator=oddrn_generator,
-        parser_config_path=Path(
-            "odd_collector_aws/adapters/s3_delta/mappers/grammar/field_types.lark"
-        ).absolute(),
+        parser_config_path=Path(__file__).parent / "grammar" / "field_types.lark",
         odd_types_map=DELTA_TO_ODD_TYPE_MAP,
     )
+
+
+def map_field(field_builder: DatasetFieldBuilder, column: DField) -> list[DataSetField]:
     return field_builder.build_dataset_field(column)
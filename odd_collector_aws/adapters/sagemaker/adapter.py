@@ -1,10 +1,14 @@
-from funcy import lmapcat
+from typing import Iterable
+
 from odd_collector_sdk.domain.adapter import AbstractAdapter
-from odd_models.models import DataEntityList
+from odd_models.models import DataEntity, DataEntityList
 from oddrn_generator.generators import S3Generator, SagemakerGenerator
 
 from odd_collector_aws.adapters.sagemaker.experiment_mapper import ExperimentMapper
+from odd_collector_aws.adapters.sagemaker.logger import logger
 from odd_collector_aws.adapters.sagemaker.sagemaker_client import SagemakerClient
+from odd_collector_aws.adapters.sagemaker.snapshot import ExperimentSnapshot
+from odd_collector_aws.cache.sqlite_cache import create_cache
 from odd_collector_aws.domain.plugin import SagemakerPlugin
 from odd_collector_aws.utils.create_generator import create_generator
 
@@ -19,16 +23,44 @@ class Adapter(AbstractAdapter):
         self.sagemaker = SagemakerClient(config)
         self.generator = create_generator(SagemakerGenerator, config)
 
+        self.snapshot = None
+        if config.incremental:
+            cache = create_cache(config, "sagemaker_experiments")
+            if cache:
+                self.snapshot = ExperimentSnapshot(cache)
+            else:
+                logger.warning("Incremental sync is disabled, cache_dir is not set")
+
     def get_data_source_oddrn(self) -> str:
         return self.generator.get_data_source_oddrn()
 
     # Error handling:
     def get_data_entity_list(self):
-        mapper = ExperimentMapper(self.generator, self.s3_generator)
-        experiments = list(self.sagemaker.get_experiments(self.config.experiments))
-        data_entities = lmapcat(mapper.map_experiment, experiments)
-
         return DataEntityList(
             data_source_oddrn=self.get_data_source_oddrn(),
-            items=data_entities,
+            items=list(self.get_data_entities()),
+        )
+
+    def get_data_entities(self) -> Iterable[DataEntity]:
+        mapper = ExperimentMapper(self.generator, self.s3_generator)
+
+        if self.snapshot is None:
+            for experiment in self.sagemaker.get_experiments(self.config.experiments):
+                yield from mapper.map_experiment(experiment)
+            return
+
+        watermark = self.snapshot.watermark
+        self.snapshot.start(
+            self.sagemaker.get_changed_experiments(watermark) if watermark else set()
         )
+
+        experiments = self.sagemaker.get_experiments(
+            self.config.experiments, self.snapshot.is_unchanged
+        )
+        for experiment in experiments:
+            data_entities = mapper.map_experiment(experiment)
+            self.snapshot.save(experiment, data_entities)
+            yield from data_entities
+
+        yield from self.snapshot.get_unchanged()
+        self.snapshot.finish()
@@ -52,8 +52,14 @@ class ExperimentMapper:
         self.s3_generator = s3_generator
 
     def map_experiment(self, experiment: Experiment) -> list[DataEntity]:
+        """
+        Map experiment with its trials, trial components and artifacts.
+        Returns DataEntities created for the experiment, artifacts already mapped
+        for previous experiments are only linked.
+        """
         # Set oddrn context by experiment name
         try:
+            mapped = len(self.entities.entities)
             self.generator.set_oddrn_paths(experiments=experiment.experiment_name)
 
             # Create experiment data entity
@@ -65,7 +71,7 @@ class ExperimentMapper:
             for trial in experiment.trials:
                 self.map_trial(trial, experiment_data_entity)
 
-            return list(self.entities.get_all())
+            return self.entities.get_all()[mapped:]
         except Exception as e:
             logging.error(
                 f"Error while mapping experiment {experiment.experiment_name}"
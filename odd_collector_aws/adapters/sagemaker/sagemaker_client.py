@@ -1,10 +1,13 @@
+import threading
 import traceback
-from typing import Iterable, Optional, Union
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional, Union
 
 from funcy import lflatten
 from oddrn_generator import S3Generator
 
-from odd_collector_aws.adapters.s3.file_system import FileSystem
 from odd_collector_aws.adapters.sagemaker.domain import (
     Association,
     Experiment,
@@ -19,21 +22,62 @@ from odd_collector_aws.adapters.sagemaker.domain.artifact import (
 )
 from odd_collector_aws.adapters.sagemaker.logger import logger
 from odd_collector_aws.aws.aws_client import AwsClient
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
 from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import SagemakerPlugin
 from odd_collector_aws.utils.parse_s3_url import parse_s3_url
 
+# Raw experiment with raw trials and futures of their described trial components
+PendingExperiment = tuple[dict, list[tuple[dict, list[Future]]]]
+
+
+def _is_described(pending: PendingExperiment) -> bool:
+    _, trials = pending
+    return all(future.done() for _, futures in trials for future in futures)
+
+
+def _to_experiment(
+    experiment: dict, trials: list[tuple[dict, list[Future]]]
+) -> Experiment:
+    return Experiment.parse_obj(
+        {
+            **experiment,
+            "Trials": [
+                Trial.parse_obj(
+                    {
+                        **trial,
+                        "TrialComponents": [future.result() for future in futures],
+                    }
+                )
+                for trial, futures in trials
+            ],
+        }
+    )
+
 
 class SagemakerClient:
     def __init__(self, config: SagemakerPlugin):
         aws_client = AwsClient(config)
         self.client = aws_client.get_client("sagemaker")
         self.account_id = aws_client.get_account_id()
-        self.s3_fs = FileSystem(config)
+        self.max_concurrency = config.max_concurrency
+
+        self._artifacts: dict[str, Optional[dict]] = {}
+        self._artifacts_lock = threading.Lock()
 
     def get_experiments(
-        self, experiments_name: Optional[list[str]]
+        self,
+        experiments_name: Optional[list[str]],
+        is_unchanged: Callable[[dict], bool] = lambda experiment: False,
     ) -> Iterable[Experiment]:
+        """
+        Crawl experiments with their trials and trial components.
+        Experiments, trials and components are listed in the caller thread, components with
+        their artifacts are described in a pool of max_concurrency workers.
+        Experiments are yielded in search order as soon as all their components are described.
+        @param experiments_name: names of experiments, all experiments if empty
+        @param is_unchanged: experiments from search results for which it returns True are skipped
+        """
         pconf = PaginatorConfig(
             op_name="search",
             list_fetch_key="Results",
@@ -42,35 +86,91 @@ class SagemakerClient:
                 **self._get_search_expression(experiments_name),
             },
         )
-        for experiment in self._fetch(pconf):
-            experiment = experiment.get("Experiment")
-            trials = self.get_trials(experiment.get("ExperimentName"))
+        self._artifacts = {}
+        pending: deque[PendingExperiment] = deque()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="sagemaker"
+        ) as executor:
+            for experiment in self._fetch(pconf):
+                experiment = experiment.get("Experiment")
+                if is_unchanged(experiment):
+                    continue
+
+                trials = [
+                    (trial, self._describe_trial_components(trial, executor))
+                    for trial in self.get_trials(experiment.get("ExperimentName"))
+                ]
+                pending.append((experiment, trials))
+
+                while pending and (
+                    len(pending) > self.max_concurrency or _is_described(pending[0])
+                ):
+                    yield _to_experiment(*pending.popleft())
+
+            while pending:
+                yield _to_experiment(*pending.popleft())
 
-            yield Experiment.parse_obj({**experiment, "Trials": trials})
+    def get_changed_experiments(self, since: datetime) -> set[str]:
+        """
+        Get names of experiments with trials or trial components modified after the time.
+        Experiment's LastModifiedTime isn't updated when its trials and components change.
+        """
+        search_expression = {
+            "Filters": [
+                {
+                    "Name": "LastModifiedTime",
+                    "Operator": "GreaterThan",
+                    "Value": since.astimezone(timezone.utc).strftime(
+                        "%Y-%m-%dT%H:%M:%SZ"
+                    ),
+                }
+            ]
+        }
+
+        changed = set()
+        for resource in ("ExperimentTrial", "ExperimentTrialComponent"):
+            pconf = PaginatorConfig(
+                op_name="search",
+                list_fetch_key="Results",
+                kwargs={"Resource": resource, "SearchExpression": search_expression},
+            )
+            for result in self._fetch(pconf):
+                if trial := result.get("Trial"):
+                    changed.add(trial.get("ExperimentName"))
+
+                for parent in result.get("TrialComponent", {}).get("Parents", []):
+                    changed.add(parent.get("ExperimentName"))
+
+        return changed
 
-    def get_trials(self, experiment_name: str) -> Iterable[Trial]:
+    def get_trials(self, experiment_name: str) -> Iterable[dict]:
         pconf = PaginatorConfig(
             op_name="list_trials",
             list_fetch_key="TrialSummaries",
             kwargs={"ExperimentName": experiment_name},
         )
+        return self._fetch(pconf)
 
-        for trial in self._fetch(pconf):
-            trial_components = self.get_trial_components(trial.get("TrialName"))
-            yield Trial.parse_obj({**trial, "TrialComponents": trial_components})
-
-    def get_trial_components(self, trial_name: str) -> Iterable[TrialComponent]:
+    def get_trial_components(self, trial_name: str) -> Iterable[dict]:
         pconf = PaginatorConfig(
             op_name="list_trial_components",
             parameters={},
             list_fetch_key="TrialComponentSummaries",
             kwargs={"TrialName": trial_name},
         )
+        return self._fetch(pconf)
 
-        for trial_component in self._fetch(pconf):
-            yield self.get_trial_component_description(
-                trial_component.get("TrialComponentName")
+    def _describe_trial_components(
+        self, trial: dict, executor: Executor
+    ) -> list[Future]:
+        return [
+            executor.submit(
+                self.get_trial_component_description,
+                trial_component.get("TrialComponentName"),
             )
+            for trial_component in self.get_trial_components(trial.get("TrialName"))
+        ]
 
     def get_trial_component_description(
         self, trial_component_name: str
@@ -118,10 +218,23 @@ class SagemakerClient:
         return []
 
     def _describe_artifact(self, arn: str):
+        """
+        Describe artifact once per run, artifacts are often shared between components.
+        """
+        with self._artifacts_lock:
+            if arn in self._artifacts:
+                return self._artifacts[arn]
+
         try:
-            return self.client.describe_artifact(ArtifactArn=arn)
+            artifact = self.client.describe_artifact(ArtifactArn=arn)
         except Exception as e:
             logger.warning(e, exc_info=True)
+            artifact = None
+
+        with self._artifacts_lock:
+            self._artifacts[arn] = artifact
+
+        return artifact
 
     def _get_input_artifacts(self, arn: str):
         return lflatten(
@@ -148,10 +261,7 @@ class SagemakerClient:
         return [Association.parse_obj(resp) for resp in self._fetch(pconf)]
 
     def _fetch(self, conf: PaginatorConfig):
-        paginator = self.client.get_paginator(conf.op_name)
-
-        for res in paginator.paginate(**conf.kwargs):
-            yield from res.get(conf.list_fetch_key)
+        return fetch_paginator(conf, self.client)
 
     @staticmethod
     def _get_search_expression(experiments_name: Optional[list[str]]):
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+from odd_models.models import DataEntity
+from pydantic import parse_raw_as
+
+from odd_collector_aws.cache.sqlite_cache import SqliteCache
+
+from .domain.experiment import Experiment
+from .logger import logger
+
+WATERMARK_KEY = "__watermark__"
+# Changes made while the previous run was listing them, or hidden by clock skew, are crawled again
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def experiment_fingerprint(last_modified_time: datetime) -> str:
+    return last_modified_time.isoformat()
+
+
+class ExperimentSnapshot:
+    """
+    Experiments crawled on the previous runs with their mapped DataEntities.
+
+    Start time of the last complete run is kept as watermark. Experiment is crawled again
+    if its LastModifiedTime differs from the stored one or any of its trials or trial components
+    was modified after the watermark, otherwise the stored DataEntities are re-emitted.
+    """
+
+    def __init__(self, cache: SqliteCache):
+        self.cache = cache
+        self._started_at: Optional[datetime] = None
+        self._changed: set[str] = set()
+        self._unchanged: dict[str, bytes] = {}
+        self._crawled: dict[str, tuple[str, list[DataEntity]]] = {}
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """
+        Time after which trials and trial components must be checked for changes,
+        None if there was no complete run yet.
+        """
+        value = self.cache.get(WATERMARK_KEY)
+        if value is None:
+            return None
+
+        return datetime.fromisoformat(value.decode()) - WATERMARK_OVERLAP
+
+    def start(self, changed: set[str]) -> None:
+        """
+        @param changed: names of experiments with trials or trial components modified after the watermark
+        """
+        self._started_at = datetime.now(timezone.utc)
+        self._changed = changed
+        self._unchanged = {}
+        self._crawled = {}
+
+    def is_unchanged(self, experiment: dict) -> bool:
+        """
+        Check whether the stored DataEntities of the experiment can be re-emitted.
+        @param experiment: experiment from the search results
+        """
+        name = experiment.get("ExperimentName")
+        if name in self._changed:
+            return False
+
+        modified = experiment.get("LastModifiedTime") or experiment.get("CreationTime")
+        if modified is None:
+            return False
+
+        data_entities = self.cache.get(name, experiment_fingerprint(modified))
+        if data_entities is None:
+            return False
+
+        self._unchanged[name] = data_entities
+        return True
+
+    def save(self, experiment: Experiment, data_entities: list[DataEntity]) -> None:
+        """
+        Keep DataEntities of the crawled experiment, they are stored on finish,
+        because mapping of the next experiments can still link them to shared artifacts.
+        """
+        self._crawled[experiment.experiment_name] = (
+            experiment_fingerprint(experiment.last_modified_time),
+            data_entities,
+        )
+
+    def get_unchanged(self) -> Iterator[DataEntity]:
+        """
+        Stored DataEntities of unchanged experiments. Artifacts shared with experiments
+        crawled in this run were already emitted by them with fresh links, so they are skipped.
+        """
+        emitted = {
+            entity.oddrn
+            for _, data_entities in self._crawled.values()
+            for entity in data_entities
+        }
+        for data_entities in self._unchanged.values():
+            for entity in parse_raw_as(list[DataEntity], data_entities):
+                if entity.oddrn not in emitted:
+                    emitted.add(entity.oddrn)
+                    yield entity
+
+    def finish(self) -> None:
+        """
+        Store crawled experiments, remove experiments which were not found and move the watermark.
+        """
+        for name, (fingerprint, data_entities) in self._crawled.items():
+            value = "[" + ",".join(entity.json() for entity in data_entities) + "]"
+            self.cache.set(name, fingerprint, value.encode())
+
+        seen = self._crawled.keys() | self._unchanged.keys() | {WATERMARK_KEY}
+        deleted = [name for name, _ in self.cache.fingerprints() if name not in seen]
+        for name in deleted:
+            self.cache.delete(name)
+
+        self.cache.set(WATERMARK_KEY, "", self._started_at.isoformat().encode())
+        self.cache.flush()
+
+        logger.info(
+            f"SageMaker snapshot: crawled={len(self._crawled)}, "
+            f"unchanged={len(self._unchanged)}, deleted={len(deleted)}"
+        )
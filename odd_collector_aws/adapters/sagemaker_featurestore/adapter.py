@@ -1,32 +1,57 @@
-from typing import Iterable
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
 
-import boto3
-import pytz
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import DataEntity, DataEntityList, DataEntityType, DataSet, List
 
+from odd_collector_aws.aws.aws_client import Aws
+from odd_collector_aws.aws.throttling import AdaptiveThrottle
+from odd_collector_aws.cache.sqlite_cache import create_cache
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
+from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import SagemakerFeaturestorePlugin
+from odd_collector_aws.logger import logger
 
 from .mappers.datasets import DatasetMapper
 from .mappers.metadata import metadata_extractor
 from .mappers.oddrn import ODDRN_BASE
 
+SDK_LIST_MAX_RESULTS = 100
+
+
+def _to_json(value: datetime) -> str:
+    return value.isoformat()
+
+
+def _from_json(value: str) -> Dict[str, Any]:
+    """
+    Decode feature group as it is stored in the cache. Described feature groups are decoded
+    from the same JSON, so timestamps of metadata are ISO strings in both cases,
+    only CreationTime is a datetime.
+    """
+    feature = json.loads(value)
+    feature["CreationTime"] = datetime.fromisoformat(feature["CreationTime"])
+    return feature
+
 
 class Adapter(AbstractAdapter):
     def __init__(self, config: SagemakerFeaturestorePlugin) -> None:
-        self.__sagemaker_client = boto3.client(
-            "sagemaker",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.aws_region,
-        )
-        self.__aws_account_id = boto3.client(
-            "sts",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-        ).get_caller_identity()["Account"]
+        aws = Aws(config)
+        self.__sagemaker_client = aws.get_client("sagemaker")
+        self.__aws_account_id = aws.get_account_id()
         self.__region_name = config.aws_region
         self.__dataset_mapper = DatasetMapper(self.__region_name, self.__aws_account_id)
+        self.__max_concurrency = config.max_concurrency
+        self.__describe_throttle = AdaptiveThrottle("SageMaker describe_feature_group")
+        self.__cache = None
+        if config.skip_unchanged_feature_groups:
+            self.__cache = create_cache(config, "sagemaker_feature_groups")
+            if self.__cache is None:
+                logger.warning(
+                    "Feature groups are described on every run, cache_dir is not set"
+                )
 
     def get_data_source_oddrn(self) -> str:
         return self._oddrn_generator.get_data_source_oddrn()
@@ -54,18 +79,85 @@ class Adapter(AbstractAdapter):
         return []
 
     def __fetch_feature_groups(self) -> Iterable[DataEntity]:
-        feature_groups_list = self.__sagemaker_client.list_feature_groups().get(
-            "FeatureGroupSummaries"
+        """
+        Describe feature groups concurrently, unchanged ones are taken from the cache.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.__max_concurrency, thread_name_prefix="featurestore"
+        ) as executor:
+            feature_groups = list(
+                executor.map(self.__fetch_feature_group, self.__list_feature_groups())
+            )
+
+        if self.__cache:
+            self.__remove_deleted(feature_groups)
+            self.__cache.flush()
+            logger.info(self.__cache.stats())
+            self.__cache.reset_stats()
+
+        return [self.__map_feature_group_to_data_entity(f) for f in feature_groups]
+
+    def __list_feature_groups(self) -> Iterable[Tuple[str, Optional[str]]]:
+        """
+        @return: names of feature groups with fingerprints, fingerprints are None when caching is disabled
+        """
+        if self.__cache is None:
+            return (
+                (summary["FeatureGroupName"], None)
+                for summary in fetch_paginator(
+                    PaginatorConfig(
+                        op_name="list_feature_groups",
+                        list_fetch_key="FeatureGroupSummaries",
+                        page_size=SDK_LIST_MAX_RESULTS,
+                    ),
+                    self.__sagemaker_client,
+                )
+            )
+
+        # Summaries of list_feature_groups have no LastModifiedTime, search results have it
+        return (
+            (
+                result["FeatureGroup"]["FeatureGroupName"],
+                _to_json(
+                    result["FeatureGroup"].get("LastModifiedTime")
+                    or result["FeatureGroup"]["CreationTime"]
+                ),
+            )
+            for result in fetch_paginator(
+                PaginatorConfig(
+                    op_name="search",
+                    parameters={"Resource": "FeatureGroup"},
+                    list_fetch_key="Results",
+                    page_size=SDK_LIST_MAX_RESULTS,
+                ),
+                self.__sagemaker_client,
+            )
         )
-        return [
-            self.__map_feature_group_to_data_entity(f)
-            for f in [self.__fetch_feature_group(fg) for fg in feature_groups_list]
-        ]
-
-    def __fetch_feature_group(self, feature: dict) -> dict:
-        return self.__sagemaker_client.describe_feature_group(
-            FeatureGroupName=feature.get("FeatureGroupName")
+
+    def __fetch_feature_group(
+        self, feature_group: Tuple[str, Optional[str]]
+    ) -> Dict[str, Any]:
+        name, fingerprint = feature_group
+        if fingerprint is not None:
+            cached = self.__cache.get(name, fingerprint)
+            if cached is not None:
+                return _from_json(cached)
+
+        feature = self.__describe_throttle.call(
+            self.__sagemaker_client.describe_feature_group, FeatureGroupName=name
         )
+        feature.pop("ResponseMetadata", None)
+        value = json.dumps(feature, default=_to_json)
+        if fingerprint is not None:
+            self.__cache.set(name, fingerprint, value.encode())
+
+        return _from_json(value)
+
+    def __remove_deleted(self, feature_groups: Iterable[Dict[str, Any]]) -> None:
+        names = {f["FeatureGroupName"] for f in feature_groups}
+        for name, _ in self.__cache.fingerprints():
+            if name not in names:
+                self.__cache.delete(name)
 
     def __map_feature_group_to_data_entity(self, feature: dict) -> DataEntity:
         oddrn = (ODDRN_BASE + "/feature_groups/{feature_group_name}").format(
@@ -78,7 +170,7 @@ class Adapter(AbstractAdapter):
             name=feature.get("FeatureGroupName"),
             type=DataEntityType.FEATURE_GROUP,
             metadata=metadata_extractor.extract_dataset_metadata(feature),
-            created_at=feature.get("CreationTime").astimezone(pytz.utc),
+            created_at=feature.get("CreationTime").astimezone(timezone.utc),
             dataset=DataSet(
                 field_list=[
                     self.__dataset_mapper.map_feature_group_to_data_set_fields(
@@ -1,14 +1,18 @@
 import datetime
-from cmath import log
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import boto3
 import pytz
 from botocore.exceptions import ClientError
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import DataEntity, DataEntityList, DataEntityType
 
+from odd_collector_aws.aws.aws_client import Aws
+from odd_collector_aws.aws.throttling import AdaptiveThrottle
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
+from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import SQSPlugin
+from odd_collector_aws.logger import logger
 
 from .sqs_generator import SqsGenerator
 
@@ -16,22 +20,20 @@ SCHEMA_FILE_URL = (
     "https://raw.githubusercontent.com/opendatadiscovery/opendatadiscovery-specification/"
     "main/specification/extensions/sqs.json"
 )
+LIST_QUEUES_PAGE_SIZE = 1000
+QUEUE_DOES_NOT_EXIST_CODES = {
+    "AWS.SimpleQueueService.NonExistentQueue",
+    "QueueDoesNotExist",
+}
 
 
 class Adapter(AbstractAdapter):
     def __init__(self, config: SQSPlugin) -> None:
-        self._account_id = boto3.client(
-            "sts",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.aws_region,
-        ).get_caller_identity()["Account"]
-        self._sqs_client = boto3.client(
-            "sqs",
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.aws_region,
-        )
+        aws = Aws(config)
+        self._account_id = aws.get_account_id()
+        self._sqs_client = aws.get_client("sqs")
+        self._max_concurrency = config.max_concurrency
+        self._throttle = AdaptiveThrottle("SQS get_queue_attributes")
 
         self.__oddrn_generator = SqsGenerator(
             cloud_settings={"region": config.aws_region, "account": self._account_id}
@@ -44,48 +46,79 @@ class Adapter(AbstractAdapter):
         )
 
     def get_data_entities(self) -> List[DataEntity]:
-        try:
-            sqs_queues = []
-            for queue in self._sqs_client.list_queues()["QueueUrls"]:
-                queue_name = queue.split("/")[-1]
-                queue_attributes = self._sqs_client.get_queue_attributes(
-                    QueueUrl=queue, AttributeNames=["All"]
-                )["Attributes"]
-                created_at = datetime.datetime.fromtimestamp(
-                    int(queue_attributes["CreatedTimestamp"]), tz=pytz.utc
-                )
-                updated_at = datetime.datetime.fromtimestamp(
-                    int(queue_attributes["LastModifiedTimestamp"]), tz=pytz.utc
+        """
+        Get attributes of queues concurrently, queues are mapped in the caller thread,
+        because oddrn generator is not thread-safe.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="sqs"
+        ) as executor:
+            return [
+                self._map_queue(queue_url, queue_attributes)
+                for queue_url, queue_attributes in executor.map(
+                    self._get_queue_attributes, self._list_queues()
                 )
-                del queue_attributes["CreatedTimestamp"]
-                del queue_attributes["LastModifiedTimestamp"]
-                del queue_attributes["Policy"]
-                queue_attributes["AccountID"] = self._account_id
-                metadata = [
-                    {
-                        "schema_url": (
-                            f"{SCHEMA_FILE_URL}#/definitions/SQSDataSetExtension"
-                        ),
-                        "metadata": queue_attributes,
-                    }
-                ]
-                sqs_queues.append(
-                    DataEntity(
-                        name=queue_name,
-                        oddrn=self.__oddrn_generator.get_oddrn_by_path(
-                            "queue", queue_name
-                        ),
-                        type=DataEntityType.KAFKA_TOPIC,
-                        created_at=created_at,
-                        updated_at=updated_at,
-                        metadata=metadata,
-                        dataset={"field_list": []},
-                    )
-                )
-        except ClientError:
+                if queue_attributes is not None
+            ]
+
+    def _list_queues(self) -> Iterable[str]:
+        return fetch_paginator(
+            PaginatorConfig(
+                op_name="list_queues",
+                list_fetch_key="QueueUrls",
+                page_size=LIST_QUEUES_PAGE_SIZE,
+            ),
+            self._sqs_client,
+        )
+
+    def _get_queue_attributes(
+        self, queue_url: str
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        try:
+            return (
+                queue_url,
+                self._throttle.call(
+                    self._sqs_client.get_queue_attributes,
+                    QueueUrl=queue_url,
+                    AttributeNames=["All"],
+                )["Attributes"],
+            )
+        except ClientError as e:
+            # Queue could be deleted after it was listed
+            if e.response.get("Error", {}).get("Code") in QUEUE_DOES_NOT_EXIST_CODES:
+                logger.warning(f"Queue {queue_url} does not exist anymore, skipped")
+                return queue_url, None
             raise
-        else:
-            return sqs_queues
+
+    def _map_queue(
+        self, queue_url: str, queue_attributes: Dict[str, Any]
+    ) -> DataEntity:
+        queue_name = queue_url.split("/")[-1]
+        created_at = datetime.datetime.fromtimestamp(
+            int(queue_attributes["CreatedTimestamp"]), tz=pytz.utc
+        )
+        updated_at = datetime.datetime.fromtimestamp(
+            int(queue_attributes["LastModifiedTimestamp"]), tz=pytz.utc
+        )
+        del queue_attributes["CreatedTimestamp"]
+        del queue_attributes["LastModifiedTimestamp"]
+        queue_attributes.pop("Policy", None)
+        queue_attributes["AccountID"] = self._account_id
+        metadata = [
+            {
+                "schema_url": f"{SCHEMA_FILE_URL}#/definitions/SQSDataSetExtension",
+                "metadata": queue_attributes,
+            }
+        ]
+        return DataEntity(
+            name=queue_name,
+            oddrn=self.__oddrn_generator.get_oddrn_by_path("queue", queue_name),
+            type=DataEntityType.KAFKA_TOPIC,
+            created_at=created_at,
+            updated_at=updated_at,
+            metadata=metadata,
+            dataset={"field_list": []},
+        )
 
     def get_data_source_oddrn(self) -> str:
         return self.__oddrn_generator.get_data_source_oddrn()
@@ -1,123 +1,204 @@
+import threading
 from dataclasses import dataclass
+from typing import Optional
 
 import boto3
+import botocore.session
 from botocore.client import BaseClient
+from botocore.config import Config
+from botocore.credentials import CredentialProvider, DeferredRefreshableCredentials
 
 from odd_collector_aws.domain.plugin import AwsPlugin
 from odd_collector_aws.logger import logger
 
+DEFAULT_ROLE_SESSION_NAME = "odd-collector-aws"
+# Clients are shared between adapters and their worker threads
+MAX_POOL_CONNECTIONS = 50
 
-@dataclass
-class TempCredentials:
-    aws_access_key_id: str
-    aws_secret_access_key: str
-    aws_session_token: str
 
+@dataclass(frozen=True)
+class SessionKey:
+    aws_access_key_id: Optional[str]
+    aws_secret_access_key: Optional[str]
+    aws_session_token: Optional[str]
+    aws_region: Optional[str]
+    profile_name: Optional[str]
+    aws_role_arn: Optional[str]
+    aws_role_session_name: Optional[str]
 
-class Aws:
-    config: AwsPlugin
-
-    def __init__(self, config: AwsPlugin):
-        self.config = config
-
-    def get_client(self, client_name: str) -> BaseClient:
-        return self.create_session().client(client_name)
-
-    def get_s3_client(self) -> BaseClient:
-        return self.create_session().client("s3", endpoint_url=self.config.endpoint_url)
-
-    def create_session(self) -> boto3.Session:
-        config = self.config
-
-        # Add invariant
-        session = boto3.Session(
+    @classmethod
+    def from_config(cls, config: AwsPlugin) -> "SessionKey":
+        return cls(
             aws_access_key_id=config.aws_access_key_id,
             aws_secret_access_key=config.aws_secret_access_key,
             aws_session_token=config.aws_session_token,
-            region_name=config.aws_region,
+            aws_region=config.aws_region,
             profile_name=config.profile_name,
+            aws_role_arn=config.aws_role_arn,
+            aws_role_session_name=config.aws_role_session_name,
         )
 
-        if config.aws_role_arn:
-            temp_credentials = self.get_temporary_credentials(session)
-            session = boto3.Session(
-                aws_access_key_id=temp_credentials.aws_access_key_id,
-                aws_secret_access_key=temp_credentials.aws_secret_access_key,
-                aws_session_token=temp_credentials.aws_session_token,
-                region_name=config.aws_region,
-            )
 
-        return session
+class RoleCredentialProvider(CredentialProvider):
+    """
+    Provides credentials of assumed role, inserted first into botocore credential resolver.
+    Role is assumed lazily on the first request and refreshed by botocore before it expires.
+    """
 
-    def get_account_id(self):
-        if self.config.aws_account_id:
-            return self.config.aws_account_id
-        else:
-            return self.create_session().client("sts").get_caller_identity()["Account"]
+    METHOD = "odd-assume-role"
+    CANONICAL_NAME = "odd-assume-role"
 
-    def get_temporary_credentials(self, session: boto3.Session) -> TempCredentials:
-        """
+    def __init__(self, sts_client: BaseClient, role_arn: str, role_session_name: str):
+        self.sts_client = sts_client
+        self.role_arn = role_arn
+        self.role_session_name = role_session_name
+
+    def load(self) -> DeferredRefreshableCredentials:
+        return DeferredRefreshableCredentials(
+            refresh_using=self._assume_role, method=self.METHOD
+        )
 
-        @param session:
-        @return: TempCredentials
+    def _assume_role(self) -> dict:
+        logger.debug(f"Assume role for {self.role_arn}")
+        credentials = self.sts_client.assume_role(
+            RoleArn=self.role_arn, RoleSessionName=self.role_session_name
+        )["Credentials"]
+        logger.debug(f"Assumed role for {self.role_arn}")
+
+        return {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretAccessKey"],
+            "token": credentials["SessionToken"],
+            "expiry_time": credentials["Expiration"].isoformat(),
+        }
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of boto3 sessions and clients.
+
+    Plugins with the same credentials, region and role share one session, clients
+    (with their connection pools) and account id. Assumed role credentials are refreshed
+    by botocore before they expire.
+    """
+
+    def __init__(self):
+        self._sessions: dict[SessionKey, boto3.Session] = {}
+        self._clients: dict[tuple[SessionKey, str, Optional[str]], BaseClient] = {}
+        self._account_ids: dict[SessionKey, str] = {}
+        # boto3 sessions are not thread-safe, so clients are created under the lock
+        self._lock = threading.RLock()
+
+    def get_session(self, config: AwsPlugin) -> boto3.Session:
+        key = SessionKey.from_config(config)
+
+        with self._lock:
+            if key not in self._sessions:
+                self._sessions[key] = self._create_session(key)
+
+            return self._sessions[key]
+
+    def get_client(
+        self, config: AwsPlugin, service_name: str, endpoint_url: Optional[str] = None
+    ) -> BaseClient:
+        """
+        Get shared client, clients are thread-safe and can be used from worker threads.
+        @param config: plugin config
+        @param service_name: i.e. "glue", "s3"
+        @param endpoint_url: custom endpoint, i.e. for S3 compatible storages
+        @return: boto3 client
         """
-        logger.debug(f"Assume role for {self.config.aws_role_arn}")
-        sts_client = session.client("sts")
-        response = sts_client.assume_role(
-            RoleArn=self.config.aws_role_arn,
-            RoleSessionName=self.config.aws_role_session_name,
+        key = SessionKey.from_config(config), service_name, endpoint_url
+
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = self.get_session(config).client(
+                    service_name,
+                    endpoint_url=endpoint_url,
+                    config=Config(max_pool_connections=MAX_POOL_CONNECTIONS),
+                )
+
+            return self._clients[key]
+
+    def get_account_id(self, config: AwsPlugin) -> str:
+        if config.aws_account_id:
+            return config.aws_account_id
+
+        key = SessionKey.from_config(config)
+        with self._lock:
+            if key in self._account_ids:
+                return self._account_ids[key]
+
+        # STS request is made without the lock, so other plugins are not blocked by it,
+        # concurrent callers may request it twice, first result wins
+        account_id = self.get_client(config, "sts").get_caller_identity()["Account"]
+        with self._lock:
+            return self._account_ids.setdefault(key, account_id)
+
+    def _create_session(self, key: SessionKey) -> boto3.Session:
+        session = boto3.Session(
+            aws_access_key_id=key.aws_access_key_id,
+            aws_secret_access_key=key.aws_secret_access_key,
+            aws_session_token=key.aws_session_token,
+            region_name=key.aws_region,
+            profile_name=key.profile_name,
         )
-        logger.debug(f"Assumed role for {self.config.aws_role_arn}")
-        temp_credentials = response["Credentials"]
 
-        return TempCredentials(
-            aws_access_key_id=temp_credentials["AccessKeyId"],
-            aws_secret_access_key=temp_credentials["SecretAccessKey"],
-            aws_session_token=temp_credentials["SessionToken"],
+        if not key.aws_role_arn:
+            return session
+
+        provider = RoleCredentialProvider(
+            sts_client=session.client("sts"),
+            role_arn=key.aws_role_arn,
+            role_session_name=key.aws_role_session_name or DEFAULT_ROLE_SESSION_NAME,
+        )
+        botocore_session = botocore.session.get_session()
+        botocore_session.get_component("credential_provider").insert_before(
+            "env", provider
+        )
+
+        return boto3.Session(
+            botocore_session=botocore_session, region_name=key.aws_region
         )
 
 
-class AwsClient:
-    session: boto3.Session
+registry = ClientRegistry()
+
+
+class Aws:
+    config: AwsPlugin
 
     def __init__(self, config: AwsPlugin):
-        self._config = config
+        self.config = config
+
+    def get_client(self, client_name: str) -> BaseClient:
+        return registry.get_client(self.config, client_name)
 
-        self._init_session()
+    def get_s3_client(self) -> BaseClient:
+        return registry.get_client(self.config, "s3", self.config.endpoint_url)
 
-    def _init_session(self):
-        self.session = boto3.Session(
-            aws_access_key_id=self._config.aws_access_key_id,
-            aws_secret_access_key=self._config.aws_secret_access_key,
-            aws_session_token=self._config.aws_session_token,
-            region_name=self._config.aws_region,
-        )
+    def create_session(self) -> boto3.Session:
+        return registry.get_session(self.config)
 
-        if self._config.aws_role_arn and self._config.aws_role_session_name:
-            try:
-                assumed_role_response = self.session.client("sts").assume_role(
-                    RoleArn=self._config.aws_role_arn,
-                    RoleSessionName=self._config.aws_role_session_name,
-                )
+    def get_account_id(self):
+        return registry.get_account_id(self.config)
 
-                if assumed_role_response.Credentials:
-                    self.session = boto3.Session(
-                        aws_access_key_id=assumed_role_response.Credentials.AccessKeyId,
-                        aws_secret_access_key=assumed_role_response.Credentials.SecretAccessKey,
-                        aws_session_token=assumed_role_response.Credentials.SessionToken,
-                        region_name=self._config.aws_region,
-                    )
-            except Exception:
-                logger.debug("Error assuming AWS Role", exc_info=True)
+
+class AwsClient:
+    def __init__(self, config: AwsPlugin):
+        self._config = config
+
+    @property
+    def session(self) -> boto3.Session:
+        return registry.get_session(self._config)
 
     def get_client(self, service_name: str) -> BaseClient:
-        return self.session.client(service_name, endpoint_url=self._config.endpoint_url)
+        return registry.get_client(
+            self._config, service_name, self._config.endpoint_url
+        )
 
     def get_account_id(self):
-        if self._config.aws_account_id:
-            return self._config.aws_account_id
-        else:
-            return self.session.client("sts").get_caller_identity()["Account"]
+        return registry.get_account_id(self._config)
 
     def get_region(self):
         return self._config.aws_region
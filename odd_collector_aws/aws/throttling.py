@@ -0,0 +1,85 @@
+import random
+import threading
+import time
+from typing import Callable, TypeVar
+
+from botocore.exceptions import ClientError
+
+from odd_collector_aws.logger import logger
+
+T = TypeVar("T")
+
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "Throttling",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "ProvisionedThroughputExceededException",
+}
+
+
+def is_throttling_error(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+class AdaptiveThrottle:
+    """
+    Delay shared by all workers calling the same API.
+
+    Every throttling error doubles the delay before the next calls of all workers,
+    every successful call shrinks it by 10%, so the pool settles near the rate the API allows.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_delay: float = 0.05,
+        max_delay: float = 10.0,
+        max_attempts: int = 8,
+    ):
+        self.name = name
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.throttled = 0
+
+        self._delay = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Call fn, retrying it while the API throttles.
+        @param fn: i.e. boto3 client method
+        @return: fn result
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            delay = self._delay
+            if delay:
+                # jitter spreads out workers which were throttled at the same time
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+            try:
+                result = fn(*args, **kwargs)
+            except ClientError as e:
+                if not is_throttling_error(e) or attempt == self.max_attempts:
+                    raise
+
+                self._slow_down()
+                continue
+
+            self._speed_up()
+            return result
+
+    def _slow_down(self) -> None:
+        with self._lock:
+            self.throttled += 1
+            self._delay = min(max(self._delay * 2, self.min_delay), self.max_delay)
+            logger.debug(f"{self.name} throttled, delay is {self._delay:.2f}s")
+
+    def _speed_up(self) -> None:
+        if not self._delay:
+            return
+
+        with self._lock:
+            self._delay = self._delay * 0.9 if self._delay > self.min_delay else 0.0
@@ -0,0 +1,175 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from odd_collector_aws.domain.plugin import AwsPlugin
+from odd_collector_aws.logger import logger
+
+_connections: dict[Path, tuple[sqlite3.Connection, threading.Lock]] = {}
+_connections_lock = threading.Lock()
+
+
+def _connect(path: Path) -> tuple[sqlite3.Connection, threading.Lock]:
+    """
+    Caches of the same file share one connection, otherwise their write transactions would block each other.
+    """
+    with _connections_lock:
+        if path not in _connections:
+            connection = sqlite3.connect(str(path), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_lru"
+                " ON entries (namespace, accessed_at)"
+            )
+            connection.commit()
+            _connections[path] = connection, threading.Lock()
+
+        return _connections[path]
+
+
+class SqliteCache:
+    """
+    Persistent key-value cache stored in a SQLite file.
+
+    Each value is saved with a fingerprint (i.e. object size and modification time),
+    value is returned only while the fingerprint matches.
+    Least recently used entries are evicted on flush when there are more than max_entries.
+    Changes are committed on flush, so it should be called at the end of each run.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        namespace: str,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        @param clock: source of access times used for eviction order
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+
+        self._connection, self._lock = _connect(path)
+
+    def get(self, key: str, fingerprint: Optional[str] = None) -> Optional[bytes]:
+        """
+        Get value by key.
+        @param key: cache key
+        @param fingerprint: if passed, value is returned only if it was saved with the same fingerprint
+        @return: value or None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                (
+                    "SELECT fingerprint, value FROM entries WHERE namespace = ? AND"
+                    " key = ?"
+                ),
+                (self.namespace, key),
+            ).fetchone()
+
+            if row is None or (fingerprint is not None and row[0] != fingerprint):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._connection.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (self.clock(), self.namespace, key),
+            )
+            return row[1]
+
+    def set(self, key: str, fingerprint: str, value: bytes) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, fingerprint, value, self.clock()),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+
+    def fingerprints(self) -> Iterator[tuple[str, str]]:
+        """
+        Get all keys with their fingerprints.
+        @return: iterator of (key, fingerprint)
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, fingerprint FROM entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchall()
+
+        return iter(rows)
+
+    def flush(self) -> None:
+        """
+        Evict least recently used entries above max_entries and commit changes.
+        """
+        with self._lock:
+            if self.max_entries is not None:
+                evicted = self._connection.execute(
+                    """
+                    DELETE FROM entries WHERE namespace = ? AND key IN (
+                        SELECT key FROM entries WHERE namespace = ?
+                        ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.namespace, self.namespace, self.max_entries),
+                ).rowcount
+
+                if evicted:
+                    logger.debug(
+                        f"Evicted {evicted} entries from {self.namespace} cache"
+                    )
+
+            self._connection.commit()
+
+    def stats(self) -> str:
+        return f"{self.namespace} cache: hits={self.hits}, misses={self.misses}"
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+def create_cache(
+    config: AwsPlugin, namespace: str, max_entries: Optional[int] = None
+) -> Optional[SqliteCache]:
+    """
+    Create cache for the plugin if cache_dir is configured.
+    Caches of one plugin share the file {cache_dir}/{plugin name}.sqlite.
+    @param config: plugin config
+    @param namespace: name of the cache inside the file
+    @param max_entries: LRU size cap, unlimited if None
+    @return: SqliteCache or None when caching is disabled
+    """
+    if not config.cache_dir:
+        return None
+
+    cache_dir = Path(config.cache_dir).resolve()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    return SqliteCache(cache_dir / f"{config.name}.sqlite", namespace, max_entries)
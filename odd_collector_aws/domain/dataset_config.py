@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class FolderAsDataset(BaseModel):
@@ -15,9 +15,17 @@ class FolderAsDataset(BaseModel):
 
 
 class DatasetConfig(BaseModel):
+    """
+    Configuration for bucket objects.
+    If csv_sample_size_kb is set, csv and tsv schemas are inferred from the first
+    csv_sample_size_kb kilobytes (after decompression) and csv_sample_rows rows of each file.
+    """
+
     bucket: str
     prefix: Optional[str]
     folder_as_dataset: Optional[FolderAsDataset] = None
+    csv_sample_size_kb: Optional[int] = Field(default=None, gt=0)
+    csv_sample_rows: int = Field(default=1000, gt=0)
 
     @property
     def full_path(self) -> str:
@@ -1,26 +1,132 @@
-from typing import Iterable
+import threading
+from queue import Full, Queue
+from typing import Any, Iterable, Iterator, Optional
 
 from botocore.client import BaseClient
+from botocore.paginate import Paginator
+
+from odd_collector_aws.logger import logger
 
 from .paginator_config import PaginatorConfig
 
+# Time to wait for the consumer before checking whether it stopped iterating
+PREFETCH_POLL_INTERVAL = 1.0
+
 
-def fetch_paginator(conf: PaginatorConfig, client: BaseClient) -> Iterable:
+def fetch_paginator(
+    conf: PaginatorConfig, client: BaseClient, prefetch: bool = False
+) -> Iterable:
+    """
+    Walk pages of the operation once, yielding items as soon as each page arrives.
+    @param conf: paginator config, items are taken from list_fetch_key or payload_key of each page
+    @param client: boto3 client
+    @param prefetch: fetch the next page in background thread while the current one is processed
+    @return: items, mapped with conf.mapper if it is set
+    """
     paginator = client.get_paginator(operation_name=conf.op_name)
+    pagination_config = {}
+
+    page_size = _page_size(client, paginator, conf)
+    if page_size:
+        pagination_config["PageSize"] = page_size
 
-    token = None
-    while True:
-        sdk_response = paginator.paginate(
-            **conf.parameters,
-            PaginationConfig={"MaxItems": conf.page_size, "StartingToken": token},
-        )
+    pages = paginator.paginate(
+        **conf.parameters,
+        **(conf.kwargs or {}),
+        PaginationConfig=pagination_config,
+    )
+    if prefetch:
+        pages = _prefetch(pages, conf.op_name)
 
-        for entity in sdk_response.build_full_result()[conf.list_fetch_key]:
+    key = conf.list_fetch_key or conf.payload_key
+    calls = items = 0
+    for page in pages:
+        calls += 1
+        for entity in page.get(key, []):
+            items += 1
             yield (
                 entity if conf.mapper is None else conf.mapper(entity, conf.mapper_args)
             )
 
-        if sdk_response.resume_token is None:
-            break
+    logger.debug(f"Paginated {conf.op_name}: calls={calls}, items={items}")
+
+
+def _page_size(
+    client: BaseClient, paginator: Paginator, conf: PaginatorConfig
+) -> Optional[int]:
+    """
+    Page size limited by the maximum the operation accepts,
+    None if page size isn't set or the operation doesn't support it.
+    """
+    if not conf.page_size:
+        return None
+
+    limit_key = _limit_key(paginator)
+    if not limit_key:
+        return None
+
+    api_name = client.meta.method_to_api_mapping[conf.op_name]
+    input_shape = client.meta.service_model.operation_model(api_name).input_shape
+    max_page_size = input_shape.members[limit_key].metadata.get("max")
+
+    return min(conf.page_size, max_page_size) if max_page_size else conf.page_size
+
+
+def _limit_key(paginator: Paginator) -> Optional[str]:
+    """
+    Name of the operation page size parameter from paginator model.
+    botocore doesn't expose it publicly, so page size isn't set when it can't be read.
+    """
+    pagination_cfg = getattr(paginator, "_pagination_cfg", None)
+    if not isinstance(pagination_cfg, dict):
+        logger.debug("Paginator model isn't available, default page size is used")
+        return None
+
+    return pagination_cfg.get("limit_key")
+
+
+class _Done:
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error
+
+
+def _prefetch(pages: Iterable[Any], name: str) -> Iterator[Any]:
+    """
+    Iterate pages in background thread, keeping at most one page ahead of the consumer.
+    """
+    queue: Queue = Queue(maxsize=1)
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=PREFETCH_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def worker():
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+        except Exception as e:
+            put(_Done(e))
+        else:
+            put(_Done())
+
+    thread = threading.Thread(target=worker, name=f"prefetch-{name}", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = queue.get()
+            if isinstance(item, _Done):
+                if item.error:
+                    raise item.error
+                return
 
-        token = sdk_response.resume_token
+            yield item
+    finally:
+        stopped.set()
@@ -18,10 +18,18 @@ class AwsPlugin(Plugin):
     aws_role_arn: Optional[str]
     aws_role_session_name: Optional[str]
     endpoint_url: Optional[str] = None
+    # Directory for persistent caches between runs, caching is disabled if not set
+    cache_dir: Optional[str] = None
 
 
 class GluePlugin(AwsPlugin):
     type: Literal["glue"]
+    max_concurrency: int = Field(default=1, ge=1)
+    skip_unchanged_statistics: bool = False
+    # Limits of job runs fetched for each job, all runs are fetched if not set
+    max_runs_per_job: Optional[int] = Field(default=None, gt=0)
+    job_runs_lookback_days: Optional[int] = Field(default=None, gt=0)
+    incremental_job_runs: bool = False
 
 
 class DmsPlugin(AwsPlugin):
@@ -31,14 +39,20 @@ class DmsPlugin(AwsPlugin):
 class DynamoDbPlugin(AwsPlugin):
     type: Literal["dynamodb"]
     exclude_tables: Optional[List[str]] = []
+    max_concurrency: int = Field(default=1, ge=1)
+    # Number of items scanned per table to infer non-key attributes, disabled if 0
+    sample_items: int = Field(default=0, ge=0)
+    sample_segments: int = Field(default=1, ge=1)
 
 
 class AthenaPlugin(AwsPlugin):
     type: Literal["athena"]
+    max_concurrency: int = Field(default=1, ge=1)
 
 
 class SQSPlugin(AwsPlugin):
     type: Literal["sqs"]
+    max_concurrency: int = Field(default=1, ge=1)
 
 
 class DeltaTableConfig(BaseModel):
@@ -66,8 +80,10 @@ class DeltaTableConfig(BaseModel):
 class S3DeltaPlugin(AwsPlugin):
     type: Literal["s3_delta"]
     endpoint_url: Optional[str]
+    # Connect to endpoint_url without TLS, i.e. to local MinIO
     aws_storage_allow_http: Optional[bool] = False
     delta_tables: list[DeltaTableConfig]
+    max_concurrency: int = Field(default=1, ge=1)
 
 
 class S3Plugin(AwsPlugin):
@@ -76,6 +92,10 @@ class S3Plugin(AwsPlugin):
     datasets: Optional[list[DatasetConfig]] = None
     dataset_config: DatasetConfig
     filename_filter: Optional[Filter] = Filter()
+    max_concurrency: int = Field(default=1, ge=1)
+    schema_cache_size: int = Field(default=100_000, gt=0)
+    incremental: bool = False
+    entities_chunk_size: int = Field(default=5000, gt=0)
 
     @validator("datasets", pre=True)
     def validate_datasets(cls, v):
@@ -83,9 +103,9 @@ class S3Plugin(AwsPlugin):
             raise ValueError("datasets field is deprecated, use dataset_config instead")
 
 
-
 class QuicksightPlugin(AwsPlugin):
     type: Literal["quicksight"]
+    max_concurrency: int = Field(default=1, ge=1)
 
 
 class SagemakerPlugin(AwsPlugin):
@@ -96,15 +116,22 @@ class SagemakerPlugin(AwsPlugin):
     aws_session_token: Optional[str]
     aws_account_id: Optional[str]
     experiments: Optional[list[str]]
+    max_concurrency: int = Field(default=1, ge=1)
+    incremental: bool = False
 
 
 class SagemakerFeaturestorePlugin(AwsPlugin):
     type: Literal["sagemaker_featurestore"]
+    max_concurrency: int = Field(default=1, ge=1)
+    skip_unchanged_feature_groups: bool = False
 
 
 class KinesisPlugin(AwsPlugin):
     type: Literal["kinesis"]
     aws_account_id: str
+    max_concurrency: int = Field(default=1, ge=1)
+    # Shards are listed for every stream, they can be thousands per stream
+    include_shards: bool = False
 
 
 PLUGIN_FACTORY: PluginFactory = {
@@ -0,0 +1,65 @@
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.csv as csv
+
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2"}
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """
+    Get compression codec name by file extension.
+    @param path: path to file, i.e. bucket/folder/file.csv.gz
+    @return: codec name or None for not compressed files
+    """
+    for extension, compression in COMPRESSIONS.items():
+        if path.endswith(extension):
+            return compression
+
+    return None
+
+
+def read_head(
+    file: pa.NativeFile, size: int, compression: Optional[str] = None
+) -> tuple[bytes, bool]:
+    """
+    Read at most size bytes of (decompressed) data from the beginning of the file.
+    Compressed data is decompressed incrementally, so memory doesn't depend on the file size.
+    @param file: file opened for reading, i.e. with S3FileSystem.open_input_file
+    @param size: maximum number of bytes to return
+    @param compression: None or any pyarrow codec name, i.e. "gzip", "bz2"
+    @return: data and flag whether the whole file was read
+    """
+    stream = (
+        file if compression is None else pa.CompressedInputStream(file, compression)
+    )
+
+    data = stream.read(size)
+    if len(data) < size:
+        return data, True
+
+    return data, not stream.read(1)
+
+
+def infer_csv_schema(
+    data: bytes, delimiter: str, max_rows: int, complete: bool
+) -> pa.Schema:
+    """
+    Infer schema from the first rows of csv data.
+    @param data: beginning of csv file
+    @param delimiter: columns delimiter
+    @param max_rows: maximum number of rows (without header) used for inference
+    @param complete: whether data is the whole file, otherwise the last line may be cut and is dropped
+    @return: pyarrow Schema
+    """
+    lines = data.split(b"\n", max_rows + 1)
+    if len(lines) > max_rows + 1:
+        lines = lines[: max_rows + 1]
+    elif not complete and len(lines) > 1:
+        lines = lines[:-1]
+
+    table = csv.read_csv(
+        pa.BufferReader(b"\n".join(lines)),
+        parse_options=csv.ParseOptions(delimiter=delimiter),
+    )
+    return table.schema
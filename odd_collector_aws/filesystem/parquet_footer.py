@@ -0,0 +1,43 @@
+import struct
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from odd_collector_aws.errors import InvalidFileFormatWarning
+
+PARQUET_MAGIC = b"PAR1"
+# 4 bytes of metadata length followed by 4 bytes of magic
+FOOTER_TAIL_SIZE = 8
+# Usually the whole footer fits into it, so it is read with a single ranged request
+SPECULATIVE_TAIL_SIZE = 64 * 1024
+
+
+def read_parquet_footer(file: pa.NativeFile) -> pq.FileMetaData:
+    """
+    Read parquet FileMetaData using only ranged reads of the file tail.
+    The last 64KiB are read at once, if the metadata block is bigger it is read with one more request.
+    @param file: random access file, i.e. opened with S3FileSystem.open_input_file
+    @return: FileMetaData
+    """
+    size = file.size()
+    if size < len(PARQUET_MAGIC) + FOOTER_TAIL_SIZE:
+        raise InvalidFileFormatWarning(f"File is too small to be parquet: {size} bytes")
+
+    tail_size = min(size, SPECULATIVE_TAIL_SIZE)
+    tail = file.read_at(tail_size, size - tail_size)
+
+    if tail[-4:] != PARQUET_MAGIC:
+        raise InvalidFileFormatWarning("File doesn't end with parquet magic bytes")
+
+    metadata_size = struct.unpack("<I", tail[-FOOTER_TAIL_SIZE:-4])[0]
+    if metadata_size + FOOTER_TAIL_SIZE + len(PARQUET_MAGIC) > size:
+        raise InvalidFileFormatWarning(f"Invalid parquet metadata size {metadata_size}")
+
+    if metadata_size + FOOTER_TAIL_SIZE <= tail_size:
+        metadata = tail[-FOOTER_TAIL_SIZE - metadata_size : -FOOTER_TAIL_SIZE]
+    else:
+        metadata = file.read_at(metadata_size, size - FOOTER_TAIL_SIZE - metadata_size)
+
+    # Parquet reader needs only the footer, so it is wrapped into minimal valid file
+    footer = PARQUET_MAGIC + metadata + tail[-FOOTER_TAIL_SIZE:]
+    return pq.read_metadata(pa.BufferReader(footer))
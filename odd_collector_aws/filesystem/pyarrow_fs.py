@@ -1,29 +1,66 @@
-from typing import Union
+from typing import Optional, Union
 
+import boto3
+import pyarrow as pa
 import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pyarrow._fs import FileInfo, FileSelector
 from pyarrow.fs import S3FileSystem
 
 from odd_collector_aws.domain.plugin import S3DeltaPlugin, S3Plugin
 
+from .csv_sample import detect_compression, infer_csv_schema, read_head
+from .parquet_footer import read_parquet_footer
+
 S3Config = Union[S3Plugin, S3DeltaPlugin]
 
 
+def profile_params(profile_name: str) -> dict[str, Optional[str]]:
+    """
+    Resolve credentials of AWS profile, S3FileSystem doesn't read profiles itself.
+    Credentials are resolved once, expiring credentials of a profile (i.e. SSO) are not refreshed.
+    @param profile_name: profile from AWS config or credentials files
+    @return: S3FileSystem credentials params and profile_region
+    """
+    session = boto3.Session(profile_name=profile_name)
+    credentials = session.get_credentials()
+    if credentials is None:
+        raise ValueError(f"No credentials found for AWS profile {profile_name}")
+
+    credentials = credentials.get_frozen_credentials()
+    return {
+        "access_key": credentials.access_key,
+        "secret_key": credentials.secret_key,
+        "session_token": credentials.token,
+        "profile_region": session.region_name,
+    }
+
+
 class FileSystem:
     """
     FileSystem hides pyarrow.fs implementation details.
     """
 
-    def __init__(self, config: S3Config):
+    def __init__(self, config: S3Config, default_region: Optional[str] = None):
+        """
+        @param config: plugin config
+        @param default_region: region used when it is set neither in config nor in profile
+        """
         params = {
             "access_key": config.aws_access_key_id,
             "secret_key": config.aws_secret_access_key,
             "session_token": config.aws_session_token,
-            "region": config.aws_region,
+            "region": config.aws_region or default_region,
             "endpoint_override": config.endpoint_url,
             "role_arn": config.aws_role_arn,
             "session_name": config.aws_role_session_name,
         }
+        if config.profile_name and not config.aws_access_key_id:
+            params |= profile_params(config.profile_name)
+            profile_region = params.pop("profile_region")
+            params["region"] = config.aws_region or profile_region or default_region
+        if getattr(config, "aws_storage_allow_http", False):
+            params["scheme"] = "http"
 
         self.fs = S3FileSystem(**params)
 
@@ -55,3 +92,28 @@ class FileSystem:
             }
 
         return ds.dataset(**params)
+
+    def get_parquet_metadata(self, path: str) -> pq.FileMetaData:
+        """
+        Get parquet file metadata reading only the footer of the file.
+        @param path: path to s3 object
+        @return: FileMetaData
+        """
+        with self.fs.open_input_file(path) as file:
+            return read_parquet_footer(file)
+
+    def get_csv_sample_schema(
+        self, path: str, delimiter: str, sample_size: int, sample_rows: int
+    ) -> pa.Schema:
+        """
+        Infer csv file schema from its first bytes, the rest of the file is not read.
+        @param path: path to s3 object, gzip and bz2 compressed files are supported
+        @param delimiter: columns delimiter
+        @param sample_size: maximum number of (decompressed) bytes to read
+        @param sample_rows: maximum number of rows used for inference
+        @return: Schema
+        """
+        with self.fs.open_input_file(path) as file:
+            data, complete = read_head(file, sample_size, detect_compression(path))
+
+        return infer_csv_schema(data, delimiter, sample_rows, complete)
@@ -0,0 +1,38 @@
+import threading
+
+
+class LatencyRecorder:
+    """
+    Thread-safe collector of call durations.
+    Used to report how long single remote calls take when tuning worker pools.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._durations: list[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._durations.append(seconds)
+
+    def summary(self) -> str:
+        with self._lock:
+            durations = sorted(self._durations)
+
+        if not durations:
+            return f"{self.name}: no calls"
+
+        total = sum(durations)
+        return (
+            f"{self.name}: calls={len(durations)}, total={total:.3f}s, "
+            f"mean={total / len(durations):.3f}s, "
+            f"p50={_percentile(durations, 50):.3f}s, "
+            f"p95={_percentile(durations, 95):.3f}s, "
+            f"max={durations[-1]:.3f}s"
+        )
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float:
+    index = round((len(sorted_values) - 1) * percent / 100)
+    return sorted_values[index]
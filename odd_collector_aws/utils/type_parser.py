@@ -0,0 +1,126 @@
+import re
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from lark import Lark, Transformer
+
+# Catalogs have millions of columns, but only hundreds of distinct type strings
+DEFAULT_CACHE_SIZE = 4096
+
+
+def freeze(value: Any) -> Any:
+    """
+    Make parsed type immutable, dicts become read-only mappings and lists become tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+
+    return value
+
+
+# Parameterized types are matched with a pattern and built without the grammar
+ParameterizedType = tuple[re.Pattern, Callable[[re.Match], dict[str, Any]]]
+
+NUMBER = r"\s*(0|[1-9][0-9]*)\s*"
+
+VARCHAR: ParameterizedType = (
+    re.compile(rf"varchar\s*\({NUMBER}\)", re.IGNORECASE),
+    lambda match: {"type": "varchar", "logical_type": f"varchar({match[1]})"},
+)
+DECIMAL: ParameterizedType = (
+    re.compile(rf"decimal\s*\({NUMBER},{NUMBER}\)", re.IGNORECASE),
+    lambda match: {
+        "type": "decimal",
+        "logical_type": f"decimal({match[1]}, {match[2]})",
+    },
+)
+TIMESTAMP: ParameterizedType = (
+    re.compile(r"timestamp\s*\[\s*([A-Za-z]+)\s*\]", re.IGNORECASE),
+    lambda match: {"type": "timestamp", "logical_type": f"timestamp[{match[1]}]"},
+)
+
+
+class TypeParser:
+    """
+    Parser of column type strings, i.e. "struct<a:int,b:array<string>>".
+
+    Primitive types are looked up in a precomputed table and parameterized types,
+    i.e. "decimal(10,2)", are matched with patterns, only nested types go through
+    LALR Lark grammar and transformer. Results of the last cache_size distinct
+    non-primitive type strings are memoized, so repeated types are parsed once.
+    The same parsed type is returned for every column of the type, that's why it is immutable.
+    Fast paths must return exactly what the grammar and transformer return for the type.
+    """
+
+    def __init__(
+        self,
+        grammar: str,
+        rel_to: str,
+        transformer: Transformer,
+        primitives: Iterable[str] = (),
+        parameterized: Iterable[ParameterizedType] = (),
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        """
+        @param grammar: path to .lark file
+        @param rel_to: file the grammar path is relative to, usually __file__ of the mapper
+        @param transformer: transformer of the parsed tree to dict
+        @param primitives: lowercase type names the grammar parses to {"type": name}
+        @param parameterized: patterns of parameterized types accepted by the grammar
+        @param cache_size: maximum number of memoized type strings
+        """
+        self.grammar = grammar
+        self.rel_to = rel_to
+        self.transformer = transformer
+        self.primitives = {name: freeze({"type": name}) for name in primitives}
+        self.parameterized = list(parameterized)
+        self._memoized = lru_cache(maxsize=cache_size)(self.parse_uncached)
+
+        self._lark: Optional[Lark] = None
+        self._lark_lock = threading.Lock()
+
+    @property
+    def lark(self) -> Lark:
+        """
+        Grammar is compiled on first use, so importing a mapper stays cheap
+        and catalogs with primitive types only never compile it.
+        """
+        if self._lark is None:
+            with self._lark_lock:
+                if self._lark is None:
+                    self._lark = Lark.open(
+                        self.grammar, rel_to=self.rel_to, parser="lalr", start="type"
+                    )
+
+        return self._lark
+
+    def parse(self, field_type: str) -> Mapping[str, Any]:
+        """
+        Parse type string.
+        @raise LarkError: if type string doesn't match the grammar
+        """
+        primitive = self.primitives.get(field_type.strip().lower())
+        if primitive is not None:
+            return primitive
+
+        return self._memoized(field_type)
+
+    def parse_uncached(self, field_type: str) -> Mapping[str, Any]:
+        for pattern, build in self.parameterized:
+            if match := pattern.fullmatch(field_type.strip()):
+                return freeze(build(match))
+
+        return self.parse_with_grammar(field_type)
+
+    def parse_with_grammar(self, field_type: str) -> Mapping[str, Any]:
+        return freeze(self.transformer.transform(self.lark.parse(field_type)))
+
+    def cache_info(self):
+        return self._memoized.cache_info()
+
+    def cache_clear(self) -> None:
+        self._memoized.cache_clear()
@@ -0,0 +1,58 @@
+import json
+from dataclasses import dataclass
+
+from odd_collector_aws.adapters.dms.mappers.tables import DegResolver
+
+CHILDREN = {
+    "db": [
+        {"type": "DATABASE_SERVICE", "oddrn": "db/schemas/a"},
+        {"type": "DATABASE_SERVICE", "oddrn": "db/schemas/b"},
+    ],
+    "db/schemas/a": [{"type": "TABLE", "oddrn": "db/schemas/a/tables/t1"}],
+    "db/schemas/b": [{"type": "TABLE", "oddrn": "db/schemas/b/tables/t2"}],
+}
+
+
+@dataclass
+class Response:
+    content: bytes
+
+
+class Session:
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url: str, params: dict) -> Response:
+        self.requested.append(params["oddrn"])
+        return Response(json.dumps({"items": CHILDREN[params["oddrn"]]}).encode())
+
+
+def test_deg_children_are_requested_once():
+    session = Session()
+    resolver = DegResolver("http://localhost:8080", session)
+
+    assert resolver.get_tables("db") == [
+        "db/schemas/a/tables/t1",
+        "db/schemas/b/tables/t2",
+    ]
+    assert resolver.get_tables("db/schemas/a") == ["db/schemas/a/tables/t1"]
+    assert len(resolver.get_children("db")) == 2
+    assert session.requested == ["db", "db/schemas/a", "db/schemas/b"]
+
+
+def test_platform_host_url_is_resolved_on_first_request():
+    calls = []
+
+    def host_url() -> str:
+        calls.append(1)
+        return "http://localhost:8080"
+
+    resolver = DegResolver(host_url, Session())
+    assert calls == []
+
+    assert resolver.get_tables_set("db") == {
+        "db/schemas/a/tables/t1",
+        "db/schemas/b/tables/t2",
+    }
+    resolver.get_tables_set("db/schemas/a")
+    assert len(calls) == 1
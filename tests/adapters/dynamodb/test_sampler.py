@@ -0,0 +1,33 @@
+from odd_collector_aws.adapters.dynamodb.sampler import ItemSampler
+
+
+class SegmentedTable:
+    def __init__(self, segments: list[list[dict]]):
+        self.segments = segments
+        self.calls = []
+
+    def scan(self, TableName, Limit, Segment, TotalSegments):
+        self.calls.append((TableName, Limit, Segment, TotalSegments))
+        return {"Items": self.segments[Segment][:Limit]}
+
+
+def test_sample_merges_attribute_types_of_segments():
+    table = SegmentedTable(
+        [
+            [{"id": {"S": "1"}, "price": {"N": "10"}}, {"id": {"S": "3"}}],
+            [{"id": {"S": "2"}, "price": {"S": "ten"}, "tags": {"SS": ["a"]}}],
+        ]
+    )
+
+    attributes = ItemSampler(table, items=3, segments=2).sample("orders")
+
+    assert attributes == {"id": ["S"], "price": ["N", "S"], "tags": ["SS"]}
+    assert sorted(table.calls) == [("orders", 1, 1, 2), ("orders", 2, 0, 2)]
+
+
+def test_segments_without_items_are_not_scanned():
+    table = SegmentedTable([[{"id": {"S": "1"}}], [{"id": {"S": "2"}}], []])
+
+    ItemSampler(table, items=2, segments=3).sample("orders")
+
+    assert sorted(table.calls) == [("orders", 1, 0, 3), ("orders", 1, 1, 3)]
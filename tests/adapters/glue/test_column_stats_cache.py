@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+from botocore.stub import Stubber
+from odd_models.models import DataSetFieldStat
+
+from odd_collector_aws.adapters.glue.adapter import Adapter
+from odd_collector_aws.domain.plugin import GluePlugin
+
+TABLE = {
+    "DatabaseName": "db",
+    "Name": "orders",
+    "UpdateTime": datetime(2023, 1, 1, tzinfo=timezone.utc),
+    "StorageDescriptor": {
+        "Columns": [{"Name": "price", "Type": "decimal(10,2)"}, {"Name": "day"}]
+    },
+}
+
+COLUMN_STATISTICS = [
+    {
+        "ColumnName": "price",
+        "ColumnType": "decimal(10,2)",
+        "AnalyzedTime": datetime(2023, 1, 1),
+        "StatisticsData": {
+            "Type": "DECIMAL",
+            "DecimalColumnStatisticsData": {
+                "MinimumValue": {"UnscaledValue": b"MTI=", "Scale": 1},
+                "MaximumValue": {"UnscaledValue": b"MTI=", "Scale": 1},
+                "NumberOfNulls": 0,
+                "NumberOfDistinctValues": 1,
+            },
+        },
+    },
+    {
+        "ColumnName": "day",
+        "ColumnType": "date",
+        "AnalyzedTime": datetime(2023, 1, 1),
+        "StatisticsData": {
+            "Type": "DATE",
+            "DateColumnStatisticsData": {
+                "MinimumValue": datetime(2022, 1, 1, tzinfo=timezone.utc),
+                "MaximumValue": datetime(2022, 12, 31, tzinfo=timezone.utc),
+                "NumberOfNulls": 1,
+                "NumberOfDistinctValues": 365,
+            },
+        },
+    },
+]
+
+
+def test_cached_column_stats_map_as_fetched(tmp_path):
+    adapter = Adapter(
+        GluePlugin(
+            type="glue",
+            name="glue_adapter",
+            aws_region="us-east-1",
+            aws_account_id="123456789012",
+            aws_access_key_id="key",
+            aws_secret_access_key="secret",
+            cache_dir=str(tmp_path),
+            skip_unchanged_statistics=True,
+        )
+    )
+    stubber = Stubber(adapter._glue_client)
+    stubber.add_response(
+        "get_column_statistics_for_table",
+        {"ColumnStatisticsList": COLUMN_STATISTICS, "Errors": []},
+    )
+
+    with stubber:
+        fetched = adapter._Adapter__get_column_stats(TABLE)
+        cached = adapter._Adapter__get_column_stats(TABLE)
+
+    stubber.assert_no_pending_responses()
+    assert fetched.keys() == cached.keys() == {"price", "day"}
+    for column in fetched:
+        assert DataSetFieldStat(**fetched[column]) == DataSetFieldStat(**cached[column])
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta, timezone
+
+from botocore.stub import Stubber
+
+from odd_collector_aws.adapters.glue.adapter import Adapter, job_run_cursor
+from odd_collector_aws.domain.plugin import GluePlugin
+
+NOW = datetime.now(timezone.utc)
+
+JOB = {
+    "Name": "job",
+    "CreatedOn": datetime(2023, 1, 1),
+    "LastModifiedOn": datetime(2023, 1, 1),
+    "Command": {"ScriptLocation": "s3://bucket/job.py"},
+}
+
+
+def run(run_id: str, started_on: datetime, state: str = "SUCCEEDED") -> dict:
+    return {"Id": run_id, "StartedOn": started_on, "JobRunState": state}
+
+
+def adapter(**kwargs) -> Adapter:
+    params = {
+        "type": "glue",
+        "name": "glue_adapter",
+        "aws_region": "us-east-1",
+        "aws_account_id": "123456789012",
+        "aws_access_key_id": "key",
+        "aws_secret_access_key": "secret",
+    }
+    return Adapter(GluePlugin(**(params | kwargs)))
+
+
+def test_cursor_is_oldest_unfinished_or_newest_run():
+    finished = [run("2", NOW), run("1", NOW - timedelta(hours=1))]
+    assert job_run_cursor(finished) == NOW
+
+    unfinished = [
+        run("3", NOW, "RUNNING"),
+        run("2", NOW - timedelta(hours=1), "WAITING"),
+        run("1", NOW - timedelta(hours=2)),
+    ]
+    assert job_run_cursor(unfinished) == NOW - timedelta(hours=1)
+
+
+def test_job_runs_paging_stops_at_max_runs():
+    glue = adapter(max_runs_per_job=3)
+
+    with Stubber(glue._glue_client) as stubber:
+        stubber.add_response(
+            "get_job_runs",
+            {"JobRuns": [run("4", NOW), run("3", NOW)], "NextToken": "t"},
+            {"JobName": "job", "MaxResults": 3},
+        )
+        stubber.add_response(
+            "get_job_runs",
+            {"JobRuns": [run("2", NOW), run("1", NOW)], "NextToken": "t2"},
+            {"JobName": "job", "MaxResults": 3, "NextToken": "t"},
+        )
+
+        raw_job_runs = glue._Adapter__get_raw_job_runs("job")
+        stubber.assert_no_pending_responses()
+
+    assert [r["Id"] for r in raw_job_runs] == ["4", "3", "2"]
+
+
+def test_job_runs_paging_stops_at_lookback_window():
+    glue = adapter(job_runs_lookback_days=1)
+
+    with Stubber(glue._glue_client) as stubber:
+        stubber.add_response(
+            "get_job_runs",
+            {
+                "JobRuns": [
+                    run("3", NOW - timedelta(hours=1)),
+                    run("2", NOW - timedelta(days=2)),
+                ],
+                "NextToken": "t",
+            },
+            {"JobName": "job", "MaxResults": 1000},
+        )
+
+        raw_job_runs = glue._Adapter__get_raw_job_runs("job")
+        stubber.assert_no_pending_responses()
+
+    assert [r["Id"] for r in raw_job_runs] == ["3"]
+
+
+def add_run_responses(stubber: Stubber, runs: list) -> None:
+    stubber.add_response("get_jobs", {"Jobs": [JOB]}, {"MaxResults": 100})
+    stubber.add_response(
+        "get_databases",
+        {"DatabaseList": []},
+        {"ResourceShareType": "ALL", "MaxResults": 100},
+    )
+    stubber.add_response(
+        "get_job_runs", {"JobRuns": runs}, {"JobName": "job", "MaxResults": 1000}
+    )
+
+
+def test_cursors_are_committed_after_the_list_is_sent(tmp_path):
+    glue = adapter(cache_dir=str(tmp_path), incremental_job_runs=True)
+    cache = glue._job_runs_cache
+    cache.set("deleted_job", "", NOW.isoformat().encode())
+    runs = [run("2", NOW, "RUNNING"), run("1", NOW - timedelta(hours=1))]
+
+    with Stubber(glue._glue_client) as stubber:
+        add_run_responses(stubber, runs)
+
+        data_entity_lists = glue.get_data_entity_list()
+        assert len(next(data_entity_lists).items) == 3
+        # Ingestion failed, the consumer stopped after the first list
+        data_entity_lists.close()
+
+        assert cache.get("job") is None
+        assert cache.get("deleted_job") is not None
+
+        add_run_responses(stubber, runs)
+        assert len(list(glue.get_data_entity_list())) == 1
+        stubber.assert_no_pending_responses()
+
+    assert cache.get("job") == NOW.isoformat().encode()
+    assert cache.get("deleted_job") is None
+
+
+def test_runs_before_cursor_are_not_fetched(tmp_path):
+    glue = adapter(cache_dir=str(tmp_path), incremental_job_runs=True)
+    glue._job_runs_cache.set("job", "", (NOW - timedelta(hours=1)).isoformat().encode())
+
+    with Stubber(glue._glue_client) as stubber:
+        stubber.add_response(
+            "get_job_runs",
+            {
+                "JobRuns": [
+                    run("3", NOW),
+                    run("2", NOW - timedelta(hours=1)),
+                    run("1", NOW - timedelta(hours=2)),
+                ],
+                "NextToken": "t",
+            },
+            {"JobName": "job", "MaxResults": 1000},
+        )
+
+        raw_job_runs = glue._Adapter__get_raw_job_runs("job")
+        stubber.assert_no_pending_responses()
+
+    assert [r["Id"] for r in raw_job_runs] == ["3", "2"]
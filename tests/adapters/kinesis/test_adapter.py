@@ -0,0 +1,43 @@
+from botocore.stub import Stubber
+
+from odd_collector_aws.adapters.kinesis.adapter import Adapter
+from odd_collector_aws.domain.plugin import KinesisPlugin
+
+
+def shard(shard_id: str) -> dict:
+    return {
+        "ShardId": shard_id,
+        "HashKeyRange": {"StartingHashKey": "0", "EndingHashKey": "1"},
+        "SequenceNumberRange": {"StartingSequenceNumber": "1"},
+    }
+
+
+def test_list_shards_sends_only_next_token_after_first_page():
+    adapter = Adapter(
+        KinesisPlugin(
+            type="kinesis",
+            name="kinesis_adapter",
+            aws_region="us-east-1",
+            aws_account_id="123456789012",
+            aws_access_key_id="key",
+            aws_secret_access_key="secret",
+            include_shards=True,
+        )
+    )
+    stubber = Stubber(adapter._kinesis_client)
+    stubber.add_response(
+        "list_shards",
+        {"Shards": [shard("shardId-000")], "NextToken": "token"},
+        {"StreamName": "stream", "MaxResults": 1000},
+    )
+    stubber.add_response(
+        "list_shards",
+        {"Shards": [shard("shardId-001")]},
+        {"NextToken": "token", "MaxResults": 1000},
+    )
+
+    with stubber:
+        shards = adapter._list_shards("stream")
+
+    stubber.assert_no_pending_responses()
+    assert [s["ShardId"] for s in shards] == ["shardId-000", "shardId-001"]
@@ -0,0 +1,40 @@
+from oddrn_generator import S3Generator
+
+from odd_collector_aws.adapters.s3.domain.models import Bucket, File, Folder
+from odd_collector_aws.adapters.s3.mapper.bucket import map_bucket
+
+
+def file(path: str) -> File:
+    return File.unknown(path=path, base_name=path.split("/")[-1], file_format="csv")
+
+
+def test_map_bucket_yields_folder_after_its_children():
+    bucket = Bucket(
+        "bucket",
+        [
+            file("bucket/a.csv"),
+            Folder(
+                "bucket/folder",
+                [file("bucket/folder/b.csv"), Folder("bucket/folder/nested", [])],
+            ),
+        ],
+    )
+
+    entities = list(map_bucket(bucket, S3Generator(buckets="bucket")))
+    names = [entity.name for entity in entities]
+
+    assert names == [
+        "a.csv",
+        "b.csv",
+        "bucket/folder/nested",
+        "bucket/folder",
+        "bucket",
+    ]
+    assert entities[3].data_entity_group.entities_list == [
+        entities[1].oddrn,
+        entities[2].oddrn,
+    ]
+    assert entities[4].data_entity_group.entities_list == [
+        entities[0].oddrn,
+        entities[3].oddrn,
+    ]
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import GeneratorType
+
+from pyarrow.fs import LocalFileSystem
+
+from odd_collector_aws.adapters.s3.domain.models import Folder
+from odd_collector_aws.adapters.s3.file_system import READ_AHEAD_PER_WORKER, FileSystem
+from odd_collector_aws.domain.plugin import S3Plugin
+
+
+def local_file_system() -> FileSystem:
+    fs = FileSystem(
+        S3Plugin(
+            type="s3",
+            name="s3_adapter",
+            aws_access_key_id="key",
+            aws_secret_access_key="secret",
+            dataset_config={"bucket": "bucket"},
+            max_concurrency=2,
+        )
+    )
+    fs.fs.fs = LocalFileSystem()
+    return fs
+
+
+def names(objects) -> list:
+    return [
+        (
+            (obj.path.split("/")[-1], names(obj.objects))
+            if isinstance(obj, Folder)
+            else obj.base_name
+        )
+        for obj in objects
+    ]
+
+
+def test_iter_objects_is_lazy_and_keeps_order(tmp_path):
+    for name in [f"{i:02d}.csv" for i in range(20)] + ["folder/b.csv"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("a,b\n1,2\n")
+
+    fs = local_file_system()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        objects = fs.iter_objects(str(tmp_path), executor)
+        assert isinstance(objects, GeneratorType)
+
+        listed = names(objects)
+
+    listing = [info.base_name for info in fs.fs.get_file_info(str(tmp_path))]
+    assert listed == [
+        ("folder", ["b.csv"]) if name == "folder" else name for name in listing
+    ]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_iter_objects_reads_bounded_number_of_files_ahead(tmp_path):
+    for i in range(50):
+        (tmp_path / f"{i:02d}.csv").write_text("a,b\n1,2\n")
+
+    fs = local_file_system()
+    with CountingExecutor(max_workers=2) as executor:
+        objects = fs.iter_objects(str(tmp_path), executor)
+        next(objects)
+        assert executor.submitted == 2 * READ_AHEAD_PER_WORKER + 1
+
+        assert len(list(objects)) == 49
@@ -0,0 +1,28 @@
+from odd_models.models import DataEntity, DataEntityType
+
+from odd_collector_aws.adapters.s3.inventory import Inventory
+from odd_collector_aws.cache.sqlite_cache import SqliteCache
+
+
+def entity(path: str) -> DataEntity:
+    return DataEntity(oddrn=f"//s3/{path}", name=path, type=DataEntityType.FILE)
+
+
+def test_inventory_diff(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    inventory = Inventory(SqliteCache(path, "inventory"))
+    inventory.start("bucket/folder")
+    for key in ("bucket/folder/a.csv", "bucket/folder/b.csv"):
+        assert inventory.lookup(key, "1:1") is None
+        inventory.save(key, "1:1", entity(key))
+    inventory.finish()
+
+    inventory = Inventory(SqliteCache(path, "inventory"))
+    inventory.start("bucket/folder")
+    unchanged = inventory.lookup("bucket/folder/a.csv", "1:1")
+    assert inventory.lookup("bucket/folder/c.csv", "1:1") is None
+    inventory.finish()
+
+    assert DataEntity.parse_raw(unchanged) == entity("bucket/folder/a.csv")
+    assert (inventory.new, inventory.changed, inventory.unchanged) == (1, 0, 1)
+    assert [key for key, _ in inventory.cache.fingerprints()] == ["bucket/folder/a.csv"]
@@ -0,0 +1,25 @@
+import pyarrow as pa
+from pyarrow._dataset import CsvFileFormat
+from pyarrow.csv import ParseOptions
+
+from odd_collector_aws.adapters.s3.domain.models import File
+from odd_collector_aws.adapters.s3.schema_cache import SchemaCache
+from odd_collector_aws.adapters.s3.utils import csv_delimiter, is_csv_format
+from odd_collector_aws.cache.sqlite_cache import SqliteCache
+
+
+def test_cached_tsv_file_keeps_its_format(tmp_path):
+    cache = SchemaCache(SqliteCache(tmp_path / "cache.sqlite", "s3"))
+    file = File.dataset(
+        path="bucket/data.tsv",
+        name="data.tsv",
+        schema=pa.schema([("id", pa.int64())]),
+        file_format=CsvFileFormat(ParseOptions(delimiter="\t")),
+    )
+
+    cache.set(file, "10:1")
+    cached = cache.get("bucket/data.tsv", "data.tsv", "10:1")
+
+    assert is_csv_format(cached.format)
+    assert csv_delimiter(cached.format) == "\t"
+    assert cached.schema == file.schema
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+import pyarrow as pa
+
+from odd_collector_aws.adapters.s3_delta.client import aggregate_add_actions
+
+
+def test_aggregate_add_actions():
+    actions = pa.RecordBatch.from_pydict(
+        {
+            "path": ["a.parquet", "b.parquet", "c.parquet"],
+            "size_bytes": [10, 20, 30],
+            "modification_time": pa.array(
+                [datetime(2023, 1, 2), datetime(2023, 1, 3), datetime(2023, 1, 1)],
+                pa.timestamp("ms"),
+            ),
+        }
+    )
+
+    assert aggregate_add_actions(actions) == {
+        "size_bytes": 60,
+        "num_records": None,
+        "modification_time": datetime(2023, 1, 3),
+    }
@@ -0,0 +1,93 @@
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from deltalake import DeltaTable, write_deltalake
+from pyarrow.fs import LocalFileSystem
+
+from odd_collector_aws.adapters.s3_delta.client import aggregate_add_actions
+from odd_collector_aws.adapters.s3_delta.delta_log import (
+    DeltaLogIncomplete,
+    DeltaLogReader,
+)
+
+
+def write(path: str, values: list[int], mode: str = "append") -> None:
+    data = pa.table({"value": values, "part": [str(v % 2) for v in values]})
+    write_deltalake(path, data, partition_by=["part"], mode=mode)
+
+
+def test_read_delta_log(tmp_path):
+    path = str(tmp_path / "table")
+    reader = DeltaLogReader(LocalFileSystem())
+
+    write(path, [1, 2, 3])
+    write(path, [4])
+    DeltaTable(path).create_checkpoint()
+    write(path, [5, 7], mode="overwrite")
+    write(path, [9])
+
+    delta_log = reader.read(path)
+    table = DeltaTable(path)
+
+    assert delta_log.version == table.version() == 3
+    assert delta_log.protocol["minReaderVersion"] == 1
+    assert delta_log.metadata["partitionColumns"] == ["part"]
+    assert delta_log.add_actions.num_rows == len(table.files())
+    assert aggregate_add_actions(delta_log.add_actions) == aggregate_add_actions(
+        table.get_add_actions(flatten=True)
+    )
+
+
+def test_read_latest_checkpoint_without_last_checkpoint(tmp_path):
+    path = str(tmp_path / "table")
+    reader = DeltaLogReader(LocalFileSystem())
+
+    write(path, [1, 2, 3])
+    write(path, [4])
+    DeltaTable(path).create_checkpoint()
+    write(path, [5])
+    # Log retention removed the commits covered by the checkpoint
+    os.remove(tmp_path / "table" / "_delta_log" / "_last_checkpoint")
+    os.remove(tmp_path / "table" / "_delta_log" / f"{0:020d}.json")
+
+    delta_log = reader.read(path)
+
+    assert delta_log.version == 2
+    assert delta_log.add_actions.num_rows == len(DeltaTable(path).files())
+
+
+def test_read_raises_if_commits_are_missing(tmp_path):
+    path = str(tmp_path / "table")
+    reader = DeltaLogReader(LocalFileSystem())
+
+    write(path, [1])
+    write(path, [2])
+    os.remove(tmp_path / "table" / "_delta_log" / f"{0:020d}.json")
+
+    with pytest.raises(DeltaLogIncomplete):
+        reader.read(path)
+
+
+def test_read_checkpoint_with_parsed_stats(tmp_path):
+    path = str(tmp_path / "table")
+    reader = DeltaLogReader(LocalFileSystem())
+
+    write_deltalake(
+        path,
+        pa.table({"value": [1, 2, 3]}),
+        configuration={"delta.checkpoint.writeStatsAsStruct": "true"},
+    )
+    write_deltalake(path, pa.table({"value": [4]}), mode="append")
+    DeltaTable(path).create_checkpoint()
+
+    checkpoint = pq.ParquetFile(f"{path}/_delta_log/{1:020d}.checkpoint.parquet")
+    assert (
+        checkpoint.schema_arrow.field("add").type.get_field_index("stats_parsed") >= 0
+    )
+
+    delta_log = reader.read(path)
+
+    assert delta_log.version == 1
+    assert sorted(delta_log.add_actions.column("num_records").to_pylist()) == [1, 3]
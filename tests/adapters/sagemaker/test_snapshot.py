@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+
+from odd_models.models import DataEntity, DataEntityType
+
+from odd_collector_aws.adapters.sagemaker.domain.experiment import Experiment
+from odd_collector_aws.adapters.sagemaker.snapshot import ExperimentSnapshot
+from odd_collector_aws.cache.sqlite_cache import SqliteCache
+
+MODIFIED = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def experiment(name: str) -> Experiment:
+    return Experiment.parse_obj(
+        {
+            "ExperimentArn": f"arn:aws:sagemaker:eu-west-1:1:experiment/{name}",
+            "ExperimentName": name,
+            "Source": {"SourceArn": "arn", "SourceType": "type"},
+            "CreationTime": MODIFIED,
+            "LastModifiedTime": MODIFIED,
+        }
+    )
+
+
+def entity(name: str) -> DataEntity:
+    return DataEntity(
+        oddrn=f"//sagemaker/experiments/{name}",
+        name=name,
+        type=DataEntityType.ML_EXPERIMENT,
+    )
+
+
+def test_snapshot(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    snapshot = ExperimentSnapshot(SqliteCache(path, "experiments"))
+    assert snapshot.watermark is None
+
+    snapshot.start(set())
+    for name in ("a", "b", "c"):
+        assert not snapshot.is_unchanged(
+            {"ExperimentName": name, "LastModifiedTime": MODIFIED}
+        )
+        snapshot.save(experiment(name), [entity(name)])
+    snapshot.finish()
+
+    snapshot = ExperimentSnapshot(SqliteCache(path, "experiments"))
+    assert snapshot.watermark < datetime.now(timezone.utc)
+
+    snapshot.start({"b"})
+    assert snapshot.is_unchanged({"ExperimentName": "a", "LastModifiedTime": MODIFIED})
+    assert not snapshot.is_unchanged(
+        {"ExperimentName": "b", "LastModifiedTime": MODIFIED}
+    )
+    snapshot.save(experiment("b"), [entity("b")])
+    snapshot.finish()
+
+    assert list(snapshot.get_unchanged()) == [entity("a")]
+    assert sorted(name for name, _ in snapshot.cache.fingerprints()) == [
+        "__watermark__",
+        "a",
+        "b",
+    ]
+
+
+def test_snapshot_skips_entities_emitted_by_crawled_experiments(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    artifact = entity("artifact")
+
+    snapshot = ExperimentSnapshot(SqliteCache(path, "experiments"))
+    snapshot.start(set())
+    snapshot.save(experiment("a"), [entity("a"), artifact])
+    snapshot.save(experiment("b"), [entity("b")])
+    snapshot.finish()
+
+    snapshot = ExperimentSnapshot(SqliteCache(path, "experiments"))
+    snapshot.start({"b"})
+    assert snapshot.is_unchanged({"ExperimentName": "a", "LastModifiedTime": MODIFIED})
+    assert not snapshot.is_unchanged({"ExperimentName": "c"})
+    fresh_artifact = artifact.copy(update={"description": "linked to b"})
+    snapshot.save(experiment("b"), [entity("b"), fresh_artifact])
+
+    assert list(snapshot.get_unchanged()) == [entity("a")]
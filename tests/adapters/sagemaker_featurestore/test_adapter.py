@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+
+from botocore.stub import Stubber
+
+from odd_collector_aws.adapters.sagemaker_featurestore.adapter import Adapter
+from odd_collector_aws.domain.plugin import SagemakerFeaturestorePlugin
+
+CREATED = datetime(2023, 1, 1, tzinfo=timezone.utc)
+MODIFIED = datetime(2023, 2, 1, tzinfo=timezone.utc)
+
+
+def search_result(name: str, modified: bool = True) -> dict:
+    feature_group = {"FeatureGroupName": name, "CreationTime": CREATED}
+    if modified:
+        feature_group["LastModifiedTime"] = MODIFIED
+    return {"FeatureGroup": feature_group}
+
+
+def described(name: str) -> dict:
+    return {
+        "FeatureGroupArn": (
+            f"arn:aws:sagemaker:eu-west-1:123456789012:feature-group/{name}"
+        ),
+        "FeatureGroupName": name,
+        "RecordIdentifierFeatureName": "id",
+        "EventTimeFeatureName": "event_time",
+        "FeatureDefinitions": [
+            {"FeatureName": "id", "FeatureType": "Integral"},
+            {"FeatureName": "event_time", "FeatureType": "String"},
+        ],
+        "CreationTime": CREATED,
+        "LastModifiedTime": MODIFIED,
+        "LastUpdateStatus": {"Status": "Successful"},
+        "NextToken": "",
+    }
+
+
+def add_responses(stubber: Stubber, results: list, described_names: list) -> None:
+    stubber.add_response(
+        "search",
+        {"Results": results},
+        {"Resource": "FeatureGroup", "MaxResults": 100},
+    )
+    for name in described_names:
+        stubber.add_response(
+            "describe_feature_group", described(name), {"FeatureGroupName": name}
+        )
+
+
+def test_unchanged_feature_groups_are_taken_from_cache(tmp_path):
+    adapter = Adapter(
+        SagemakerFeaturestorePlugin(
+            type="sagemaker_featurestore",
+            name="featurestore_adapter",
+            aws_region="eu-west-1",
+            aws_account_id="123456789012",
+            aws_access_key_id="key",
+            aws_secret_access_key="secret",
+            cache_dir=str(tmp_path),
+            skip_unchanged_feature_groups=True,
+        )
+    )
+    client = adapter._Adapter__sagemaker_client
+
+    with Stubber(client) as stubber:
+        add_responses(stubber, [search_result("a"), search_result("b")], ["a", "b"])
+        first = {e.name: e for e in adapter.get_data_entities()}
+
+        # b is deleted, c has no LastModifiedTime, so its CreationTime is the fingerprint
+        add_responses(stubber, [search_result("a"), search_result("c", False)], ["c"])
+        second = {e.name: e for e in adapter.get_data_entities()}
+        stubber.assert_no_pending_responses()
+
+        add_responses(stubber, [search_result("c", False)], [])
+        assert [e.name for e in adapter.get_data_entities()] == ["c"]
+        stubber.assert_no_pending_responses()
+
+    assert second["a"] == first["a"]
+    metadata = second["a"].metadata[0].metadata
+    assert metadata["last_modified_time"] == MODIFIED.isoformat()
+    assert second["c"].created_at == CREATED
+    cache = adapter._Adapter__cache
+    assert sorted(name for name, _ in cache.fingerprints()) == ["c"]
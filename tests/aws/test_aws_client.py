@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+import boto3
+from botocore.stub import Stubber
+
+from odd_collector_aws.aws.aws_client import ClientRegistry, RoleCredentialProvider
+from odd_collector_aws.domain.plugin import GluePlugin
+
+
+def plugin(**kwargs) -> GluePlugin:
+    params = {
+        "type": "glue",
+        "name": "glue_adapter",
+        "aws_access_key_id": "key",
+        "aws_secret_access_key": "secret",
+        "aws_region": "eu-central-1",
+        "aws_account_id": "123456789012",
+    }
+    return GluePlugin(**(params | kwargs))
+
+
+def test_clients_are_shared_by_credentials():
+    registry = ClientRegistry()
+
+    glue = registry.get_client(plugin(), "glue")
+
+    assert registry.get_client(plugin(name="other"), "glue") is glue
+    assert registry.get_client(plugin(aws_region="us-east-1"), "glue") is not glue
+    assert registry.get_session(plugin()) is registry.get_session(plugin(name="b"))
+
+
+def test_account_id_from_config_skips_sts():
+    registry = ClientRegistry()
+
+    assert registry.get_account_id(plugin()) == "123456789012"
+    assert not registry._clients
+
+
+def test_role_is_assumed_on_first_use():
+    sts = boto3.client(
+        "sts",
+        region_name="eu-central-1",
+        aws_access_key_id="key",
+        aws_secret_access_key="secret",
+    )
+    provider = RoleCredentialProvider(sts, "arn:aws:iam::123456789012:role/odd", "odd")
+
+    with Stubber(sts) as stubber:
+        credentials = provider.load()
+        stubber.add_response(
+            "assume_role",
+            {
+                "Credentials": {
+                    "AccessKeyId": "ASIAROLEACCESSKEY",
+                    "SecretAccessKey": "role-secret",
+                    "SessionToken": "token",
+                    "Expiration": datetime.now(timezone.utc) + timedelta(hours=1),
+                }
+            },
+            {"RoleArn": "arn:aws:iam::123456789012:role/odd", "RoleSessionName": "odd"},
+        )
+
+        assert credentials.access_key == "ASIAROLEACCESSKEY"
+        stubber.assert_no_pending_responses()
+
+
+def test_session_with_role_does_not_call_sts():
+    registry = ClientRegistry()
+
+    session = registry.get_session(plugin(aws_role_arn="arn:aws:iam::1:role/odd"))
+
+    assert session.get_credentials().method == RoleCredentialProvider.METHOD
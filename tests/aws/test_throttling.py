@@ -0,0 +1,33 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from odd_collector_aws.aws.throttling import AdaptiveThrottle
+
+
+def error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code}}, "GetColumnStatisticsForTable")
+
+
+def test_throttled_call_is_retried_with_delay():
+    throttle = AdaptiveThrottle("test", min_delay=0.001)
+    responses = [error("ThrottlingException"), error("ThrottlingException"), "ok"]
+
+    def call():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert throttle.call(call) == "ok"
+    assert throttle.throttled == 2
+
+
+def test_other_errors_are_raised():
+    throttle = AdaptiveThrottle("test", min_delay=0.001)
+
+    def call():
+        raise error("EntityNotFoundException")
+
+    with pytest.raises(ClientError):
+        throttle.call(call)
+    assert throttle.throttled == 0
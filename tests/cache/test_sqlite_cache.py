@@ -0,0 +1,29 @@
+from itertools import count
+
+from odd_collector_aws.cache.sqlite_cache import SqliteCache
+
+
+def test_value_is_returned_only_for_same_fingerprint(tmp_path):
+    cache = SqliteCache(tmp_path / "cache.sqlite", "test")
+    cache.set("bucket/file.csv", "10:1", b"schema")
+
+    assert cache.get("bucket/file.csv", "10:1") == b"schema"
+    assert cache.get("bucket/file.csv", "20:2") is None
+    assert cache.get("bucket/other.csv") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_flush_persists_and_evicts_least_recently_used(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    # Strictly increasing access times, system clock may return equal ones
+    cache = SqliteCache(path, "test", max_entries=2, clock=count().__next__)
+    for key in ("a", "b", "c"):
+        cache.set(key, "fp", key.encode())
+    cache.get("a")
+    cache.flush()
+
+    assert sorted(key for key, _ in SqliteCache(path, "test").fingerprints()) == [
+        "a",
+        "c",
+    ]
+    assert list(SqliteCache(path, "other").fingerprints()) == []
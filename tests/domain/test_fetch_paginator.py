@@ -0,0 +1,64 @@
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from odd_collector_aws.domain.fetch_paginator import fetch_paginator
+from odd_collector_aws.domain.paginator_config import PaginatorConfig
+
+
+@pytest.fixture
+def glue_client():
+    return boto3.client(
+        "glue",
+        region_name="eu-central-1",
+        aws_access_key_id="key",
+        aws_secret_access_key="secret",
+    )
+
+
+def config(**kwargs) -> PaginatorConfig:
+    return PaginatorConfig(
+        op_name="get_databases",
+        page_size=1000,
+        list_fetch_key="DatabaseList",
+        mapper=lambda database, _: database["Name"],
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_pages_are_fetched_once_with_limited_page_size(glue_client, prefetch):
+    with Stubber(glue_client) as stubber:
+        stubber.add_response(
+            "get_databases",
+            {"DatabaseList": [{"Name": "a"}, {"Name": "b"}], "NextToken": "t"},
+            {"ResourceShareType": "ALL", "MaxResults": 100},
+        )
+        stubber.add_response(
+            "get_databases",
+            {"DatabaseList": [{"Name": "c"}]},
+            {"ResourceShareType": "ALL", "MaxResults": 100, "NextToken": "t"},
+        )
+
+        conf = config(parameters={"ResourceShareType": "ALL"})
+        assert list(fetch_paginator(conf, glue_client, prefetch)) == ["a", "b", "c"]
+        stubber.assert_no_pending_responses()
+
+
+def test_prefetch_raises_page_errors(glue_client):
+    with Stubber(glue_client) as stubber:
+        stubber.add_client_error("get_databases", "AccessDeniedException")
+
+        with pytest.raises(glue_client.exceptions.ClientError):
+            list(fetch_paginator(config(), glue_client, prefetch=True))
+
+
+def test_page_size_is_skipped_without_paginator_model(glue_client, monkeypatch):
+    paginator = glue_client.get_paginator("get_databases")
+    monkeypatch.delattr(paginator, "_pagination_cfg")
+    monkeypatch.setattr(glue_client, "get_paginator", lambda operation_name: paginator)
+
+    with Stubber(glue_client) as stubber:
+        stubber.add_response("get_databases", {"DatabaseList": [{"Name": "a"}]}, {})
+
+        assert list(fetch_paginator(config(), glue_client)) == ["a"]
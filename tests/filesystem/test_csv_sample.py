@@ -0,0 +1,54 @@
+import bz2
+import gzip
+
+import pyarrow as pa
+import pytest
+
+from odd_collector_aws.filesystem.csv_sample import (
+    detect_compression,
+    infer_csv_schema,
+    read_head,
+)
+
+CSV = b"id,name,price\n" + b"".join(
+    f"{i},name_{i},{i}.5\n".encode() for i in range(10_000)
+)
+
+
+def test_detect_compression():
+    assert detect_compression("bucket/file.csv") is None
+    assert detect_compression("bucket/file.csv.gz") == "gzip"
+    assert detect_compression("bucket/file.tsv.bz2") == "bz2"
+
+
+@pytest.mark.parametrize(
+    "data, compression",
+    [(CSV, None), (gzip.compress(CSV), "gzip"), (bz2.compress(CSV), "bz2")],
+)
+def test_read_head(data, compression):
+    head, complete = read_head(pa.BufferReader(data), 1024, compression)
+
+    assert head == CSV[:1024]
+    assert not complete
+
+
+def test_read_head_of_small_file():
+    head, complete = read_head(pa.BufferReader(gzip.compress(CSV)), 1 << 20, "gzip")
+
+    assert head == CSV
+    assert complete
+
+
+def test_infer_csv_schema_drops_cut_line():
+    # the last line is cut in the middle of "price" value
+    schema = infer_csv_schema(b"id,name,price\n1,a,1.5\n2,b,", ",", 100, False)
+
+    assert schema == pa.schema(
+        [("id", pa.int64()), ("name", pa.string()), ("price", pa.float64())]
+    )
+
+
+def test_infer_csv_schema_uses_limited_rows():
+    schema = infer_csv_schema(b"id\tname\n1\ta\nb\tb\n", "\t", 1, True)
+
+    assert schema == pa.schema([("id", pa.int64()), ("name", pa.string())])
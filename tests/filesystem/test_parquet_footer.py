@@ -0,0 +1,35 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from odd_collector_aws.errors import InvalidFileFormatWarning
+from odd_collector_aws.filesystem import parquet_footer
+from odd_collector_aws.filesystem.parquet_footer import read_parquet_footer
+
+
+def parquet_bytes() -> bytes:
+    table = pa.table({"id": list(range(100)), "name": ["name"] * 100})
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, row_group_size=30)
+    return sink.getvalue().to_pybytes()
+
+
+def test_read_parquet_footer():
+    metadata = read_parquet_footer(pa.BufferReader(parquet_bytes()))
+
+    assert metadata.num_rows == 100
+    assert metadata.num_row_groups == 4
+    assert metadata.schema.to_arrow_schema().names == ["id", "name"]
+
+
+def test_read_parquet_footer_with_metadata_bigger_than_tail(monkeypatch):
+    monkeypatch.setattr(parquet_footer, "SPECULATIVE_TAIL_SIZE", 16)
+
+    metadata = read_parquet_footer(pa.BufferReader(parquet_bytes()))
+
+    assert metadata.num_rows == 100
+
+
+def test_read_parquet_footer_for_not_parquet_file():
+    with pytest.raises(InvalidFileFormatWarning):
+        read_parquet_footer(pa.BufferReader(b"id,name\n1,name\n"))
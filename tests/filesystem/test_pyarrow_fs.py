@@ -0,0 +1,59 @@
+import pytest
+
+from odd_collector_aws.adapters.s3_delta.client import DeltaClient
+from odd_collector_aws.domain.plugin import S3DeltaPlugin
+
+
+@pytest.fixture
+def aws_profile(tmp_path, monkeypatch):
+    credentials = tmp_path / "credentials"
+    credentials.write_text(
+        "[odd]\n"
+        "aws_access_key_id = AKIAPROFILEACCESS\n"
+        "aws_secret_access_key = profile-secret\n"
+    )
+    config = tmp_path / "config"
+    config.write_text("[profile odd]\nregion = eu-west-1\n")
+
+    monkeypatch.setenv("AWS_SHARED_CREDENTIALS_FILE", str(credentials))
+    monkeypatch.setenv("AWS_CONFIG_FILE", str(config))
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_PROFILE"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def plugin(**kwargs) -> S3DeltaPlugin:
+    return S3DeltaPlugin(
+        **(
+            {
+                "type": "s3_delta",
+                "name": "s3_delta_adapter",
+                "delta_tables": [{"bucket": "bucket", "prefix": "delta_data"}],
+            }
+            | kwargs
+        )
+    )
+
+
+def filesystem_params(config: S3DeltaPlugin) -> dict:
+    _, (params,) = DeltaClient(config).fs.fs.__reduce__()
+    return params
+
+
+def test_profile_credentials_and_region_are_used(aws_profile):
+    params = filesystem_params(plugin(profile_name="odd"))
+
+    assert params["access_key"] == "AKIAPROFILEACCESS"
+    assert params["secret_key"] == "profile-secret"
+    assert params["region"] == "eu-west-1"
+
+
+def test_config_region_overrides_profile_region(aws_profile):
+    params = filesystem_params(plugin(profile_name="odd", aws_region="eu-central-1"))
+
+    assert params["region"] == "eu-central-1"
+
+
+def test_default_region_is_used_without_profile():
+    config = plugin(aws_access_key_id="key", aws_secret_access_key="secret")
+
+    assert filesystem_params(config)["region"] == "us-east-1"
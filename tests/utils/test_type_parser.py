@@ -0,0 +1,45 @@
+import pytest
+from lark import LarkError
+
+from odd_collector_aws.adapters.athena.mappers.columns import parser as athena_parser
+from odd_collector_aws.adapters.glue.mappers.columns import parser
+from odd_collector_aws.adapters.s3.mapper.column import parser as s3_parser
+
+
+def test_parse_is_memoized_and_immutable():
+    parser.cache_clear()
+
+    first = parser.parse("map<string,array<decimal(10,2)>>")
+    second = parser.parse("map<string,array<decimal(10,2)>>")
+
+    assert first is second
+    assert parser.cache_info().hits == 1
+    assert first["value_type"]["children"][0] == {
+        "type": "decimal",
+        "logical_type": "decimal(10, 2)",
+    }
+    with pytest.raises(TypeError):
+        first["type"] = "struct"
+
+
+@pytest.mark.parametrize("type_parser", [parser, athena_parser, s3_parser])
+def test_fast_path_matches_grammar(type_parser):
+    field_types = [
+        *type_parser.primitives,
+        *(name.upper() for name in type_parser.primitives),
+        "varchar(255)",
+        "VARCHAR( 10 )",
+        "decimal(38,0)",
+        "decimal(10, 2)",
+        "timestamp[us]",
+        "timestamp[ns]",
+    ]
+
+    for field_type in field_types:
+        try:
+            expected = type_parser.parse_with_grammar(field_type)
+        except LarkError:
+            with pytest.raises(LarkError):
+                type_parser.parse(field_type)
+        else:
+            assert type_parser.parse(field_type) == expected, field_type